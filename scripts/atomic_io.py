@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Atomic Output Writes
+Writes build outputs through a temp file in the target's directory that is
+renamed over the target, so an interrupted run never leaves a truncated
+file behind.
+
+Before the rename the new content is compared with the existing file by
+hash; identical output is discarded and the target is left untouched.
+JSON outputs can ignore volatile lines such as the `generated_at`
+timestamp, which would otherwise make every run look like a change.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+VOLATILE_JSON_KEYS = ('generated_at',)
+BLOCK_SIZE = 1 << 16
+
+# mkstemp() creates files readable by the owner only; outputs should get
+# the same permissions as a plain open() would give them
+_umask = os.umask(0)
+os.umask(_umask)
+FILE_MODE = 0o666 & ~_umask
+
+
+def is_volatile_json_line(line):
+    stripped = line.lstrip()
+    return any(stripped.startswith(f'"{key}":'.encode('utf-8')) for key in VOLATILE_JSON_KEYS)
+
+
+def stream_digest(f, ignore_line=None):
+    digest = hashlib.sha256()
+    if ignore_line is None:
+        # Minified outputs are one long line, so read fixed-size blocks
+        for block in iter(lambda: f.read(BLOCK_SIZE), b''):
+            digest.update(block)
+    else:
+        for line in f:
+            if not ignore_line(line):
+                digest.update(line)
+    return digest.hexdigest()
+
+
+def file_digest(path, ignore_line=None):
+    with open(path, 'rb') as f:
+        return stream_digest(f, ignore_line)
+
+
+class AtomicWriter:
+    """Context manager yielding a temp file that replaces `path` on a clean
+    exit. `written` tells whether the target actually changed.
+
+        writer = AtomicWriter(path)
+        with writer as f:
+            f.write(content)
+    """
+
+    def __init__(self, path, binary=False, ignore_line=None):
+        self.path = path
+        self.binary = binary
+        self.ignore_line = ignore_line
+        self.written = False
+        self.temp_path = None
+        self.file = None
+
+    def __enter__(self):
+        directory, name = os.path.split(os.path.abspath(self.path))
+        fd, self.temp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix='.tmp')
+        if self.binary:
+            self.file = os.fdopen(fd, 'wb')
+        else:
+            self.file = os.fdopen(fd, 'w', encoding='utf-8')
+        return self.file
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.file.flush()
+                os.fsync(self.file.fileno())
+            self.file.close()
+
+            if exc_type is not None or self.unchanged():
+                os.remove(self.temp_path)
+                return False
+
+            os.chmod(self.temp_path, FILE_MODE)
+            os.replace(self.temp_path, self.path)
+            self.written = True
+        except BaseException:
+            if os.path.exists(self.temp_path):
+                os.remove(self.temp_path)
+            raise
+        return False
+
+    def unchanged(self):
+        if not os.path.exists(self.path):
+            return False
+        if self.ignore_line is None and os.path.getsize(self.path) != os.path.getsize(self.temp_path):
+            return False
+        return file_digest(self.path, self.ignore_line) == file_digest(self.temp_path, self.ignore_line)
+
+
+def write_atomic(path, content, ignore_line=None):
+    """Write str or bytes to `path`. Returns False when it was unchanged."""
+    writer = AtomicWriter(path, binary=isinstance(content, bytes), ignore_line=ignore_line)
+    with writer as f:
+        f.write(content)
+    return writer.written
+
+
+def write_stream(path, pieces, ignore_line=None):
+    """Like write_atomic() for an iterable of str pieces, which are written
+    as they are produced. Returns (written, size in bytes)."""
+    size = 0
+    writer = AtomicWriter(path, ignore_line=ignore_line)
+    with writer as f:
+        for piece in pieces:
+            f.write(piece)
+            size += len(piece.encode('utf-8'))
+    return writer.written, size
+
+
+def write_json_atomic(path, data, ignore_volatile=True, **dump_kwargs):
+    # json.dump() encodes incrementally and writes each chunk as it goes,
+    # so the document is never held as one string
+    dump_kwargs.setdefault('indent', 2)
+    writer = AtomicWriter(path, ignore_line=is_volatile_json_line if ignore_volatile else None)
+    with writer as f:
+        json.dump(data, f, **dump_kwargs)
+    return writer.written
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Build Output Helpers
+Minifies page sources and writes gzip-precompressed copies of artifacts.
+
+The minifiers are deliberately conservative (stdlib only): they drop
+comments, indentation and blank lines but never rewrite code, so the
+output stays byte-for-byte equivalent in behaviour to the sources in
+scripts/templates/.
+"""
+
+import gzip
+import json
+import os
+import re
+import shutil
+from atomic_io import BLOCK_SIZE, AtomicWriter, file_digest, stream_digest
+
+GZIP_SUFFIX = '.gz'
+
+CSS_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+CSS_SPACE_AROUND = re.compile(r'\s*([{};,])\s*')
+CSS_SPACE_AFTER_COLON = re.compile(r':\s+')
+HTML_COMMENT = re.compile(r'<!--.*?-->', re.S)
+HTML_RAW_BLOCK = re.compile(r'(<(script|style|pre|textarea)\b.*?</\2>)', re.S | re.I)
+HTML_INDENT = re.compile(r'\n\s+')
+
+COMPACT_JSON = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def minify_css(css):
+    css = CSS_COMMENT.sub('', css)
+    css = re.sub(r'\s+', ' ', css)
+    css = CSS_SPACE_AROUND.sub(r'\1', css)
+    css = CSS_SPACE_AFTER_COLON.sub(':', css)
+    return css.replace(';}', '}').strip()
+
+
+def minify_js(js):
+    lines = []
+    in_template = False
+    for line in js.splitlines():
+        if in_template:
+            # Whitespace inside a multi-line template literal is content
+            lines.append(line)
+        else:
+            stripped = line.strip()
+            if stripped and not stripped.startswith('//'):
+                lines.append(stripped)
+        if line.count('`') % 2:
+            in_template = not in_template
+    return '\n'.join(lines) + '\n'
+
+
+def minify_html(html):
+    parts = HTML_RAW_BLOCK.split(html)
+    output = []
+    # split() yields [text, block, tag, text, block, tag, ...]
+    for i in range(0, len(parts), 3):
+        text = HTML_COMMENT.sub('', parts[i])
+        output.append(HTML_INDENT.sub('\n', text))
+        if i + 1 < len(parts):
+            output.append(parts[i + 1])
+    return ''.join(output).strip() + '\n'
+
+
+def iter_json_array(items):
+    """Yield compact JSON for a list one item at a time; joined, the
+    pieces equal COMPACT_JSON.encode(items)."""
+    yield '['
+    for index, item in enumerate(items):
+        yield (',' if index else '') + COMPACT_JSON.encode(item)
+    yield ']'
+
+
+def iter_json_object(obj):
+    yield '{'
+    for index, (key, value) in enumerate(obj.items()):
+        yield (',' if index else '') + COMPACT_JSON.encode(key) + ':'
+        if isinstance(value, list):
+            yield from iter_json_array(value)
+        else:
+            yield COMPACT_JSON.encode(value)
+    yield '}'
+
+
+def iter_json_string(pieces):
+    """Yield one JSON string whose value is the concatenation of `pieces`."""
+    yield '"'
+    for piece in pieces:
+        yield COMPACT_JSON.encode(piece)[1:-1]
+    yield '"'
+
+
+def precompress(path):
+    """Write `path`.gz unless it already holds the current content.
+
+    Both the comparison and the compression stream the file in blocks.
+    Returns (written, compressed_size).
+    """
+    gz_path = path + GZIP_SUFFIX
+    if os.path.exists(gz_path):
+        try:
+            with gzip.open(gz_path, 'rb') as existing:
+                if stream_digest(existing) == file_digest(path):
+                    return False, os.path.getsize(gz_path)
+        except (OSError, EOFError):
+            pass
+
+    # mtime=0 and an empty name keep the archive reproducible across rebuilds
+    writer = AtomicWriter(gz_path, binary=True)
+    with writer as f, open(path, 'rb') as source, \
+            gzip.GzipFile(filename='', mode='wb', fileobj=f, compresslevel=9, mtime=0) as compressed:
+        shutil.copyfileobj(source, compressed, BLOCK_SIZE)
+    return writer.written, os.path.getsize(gz_path)
+
+
+def format_sizes(name, source_size, minified_size, gzip_size):
+    saved = 100 - round(gzip_size * 100 / source_size) if source_size else 0
+    return (f"   {name}: {source_size:,} → {minified_size:,} bytes (minified)"
+            f" → {gzip_size:,} bytes (gzip, -{saved}%)")
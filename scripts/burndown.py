@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Burn-down Analytics
+Tracks pace from the completion times merged from every device: how many
+tasks remain over time against the schedule, how many tasks each person
+finishes per hour they work, and when the plan will be done at the
+current pace.
+
+Completions are counted per person and hour in data/.burndown_state.json.
+Each build joins the plan's completions with the ones counted last time
+and only moves the changed ones between hours, so the curve and the rates
+are read off the hourly counts instead of being replayed from every
+event. The result is rendered into the page at build time.
+"""
+
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+from html import escape
+from atomic_io import write_atomic
+
+STATE_FILE = '.burndown_state.json'
+STATE_VERSION = 2
+HOUR_MS = 3600 * 1000
+CHART_WIDTH = 600
+CHART_HEIGHT = 180
+CHART_PADDING = 24
+
+
+def completion_events(tasks):
+    """{task id: [completion time in ms, assignee]} for completed tasks
+    whose completion time is known."""
+    return {
+        task['id']: [task['completed_at'], task['assignee']]
+        for task in tasks
+        if task.get('completed') and task.get('completed_at') is not None
+    }
+
+
+def day_bounds(day):
+    """Local start and end of a YYYY-MM-DD day, in ms."""
+    start = datetime.strptime(day, '%Y-%m-%d')
+    return int(start.timestamp() * 1000), int((start + timedelta(days=1)).timestamp() * 1000)
+
+
+def planned_curve(tasks):
+    """[[time, tasks left]]: everything at the start of the first day, then
+    what is left at the end of each scheduled day."""
+    per_day = {}
+    for task in tasks:
+        if task.get('day'):
+            per_day[task['day']] = per_day.get(task['day'], 0) + 1
+    if not per_day:
+        return []
+    days = sorted(per_day)
+    remaining = len(tasks)
+    curve = [[day_bounds(days[0])[0], remaining]]
+    for day in days:
+        remaining -= per_day[day]
+        curve.append([day_bounds(day)[1], remaining])
+    return curve
+
+
+class BurndownAnalytics:
+    def __init__(self, data_dir=None):
+        self.data_dir = data_dir or os.path.join(os.path.dirname(__file__), '..', 'data')
+        self.state_path = os.path.join(self.data_dir, STATE_FILE)
+
+    def load_state(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = None
+        if not isinstance(state, dict) or state.get('version') != STATE_VERSION:
+            # Start over: every completion counts as new
+            state = {'version': STATE_VERSION, 'events': {}, 'hours': {}}
+        return state
+
+    def save_state(self, state):
+        try:
+            write_atomic(self.state_path, json.dumps(state, separators=(',', ':')))
+        except OSError:
+            # Like the config snapshot: without it the next build recounts
+            pass
+
+    def count(self, hours, event, step):
+        timestamp, assignee = event
+        person = hours.setdefault(assignee, {})
+        # Logs may carry float times; hour keys must stay whole numbers
+        hour = str(int(timestamp) // HOUR_MS)
+        person[hour] = person.get(hour, 0) + step
+        if person[hour] == 0:
+            del person[hour]
+            if not person:
+                del hours[assignee]
+
+    def update(self, task_data):
+        """Bring the hourly counts up to date with the plan's completions
+        and return the analytics for the page."""
+        state = self.load_state()
+        events = completion_events(task_data['tasks'])
+        counted = state['events']
+        hours = state['hours']
+        changes = 0
+        for task_id, event in events.items():
+            previous = counted.get(task_id)
+            if previous == event:
+                continue
+            if previous is not None:
+                self.count(hours, previous, -1)
+            self.count(hours, event, 1)
+            changes += 1
+        for task_id in counted.keys() - events.keys():
+            self.count(hours, counted[task_id], -1)
+            changes += 1
+
+        analytics = self.summarize(task_data['tasks'], hours)
+        # Saved only once it summarizes, so a bad state is never kept
+        if changes or not os.path.exists(self.state_path):
+            state['events'] = events
+            self.save_state(state)
+        return analytics
+
+    def summarize(self, tasks, hours):
+        total = len(tasks)
+        completed = sum(1 for task in tasks if task.get('completed'))
+        team = {}
+        throughput = {}
+        for assignee, person in sorted(hours.items()):
+            done = sum(person.values())
+            throughput[assignee] = {
+                'completed': done,
+                'active_hours': len(person),
+                'per_hour': round(done / len(person), 2)
+            }
+            for hour, count in person.items():
+                team[int(hour)] = team.get(int(hour), 0) + count
+
+        timed = sum(team.values())
+        # Completions without a time (e.g. set in the plan itself) count
+        # as done before the first logged one
+        remaining = total - (completed - timed)
+        curve = [[min(team) * HOUR_MS, remaining]] if team else []
+        for hour in sorted(team):
+            remaining -= team[hour]
+            curve.append([(hour + 1) * HOUR_MS, remaining])
+
+        planned = planned_curve(tasks)
+        analytics = {
+            'total': total,
+            'completed': completed,
+            'remaining': total - completed,
+            'curve': curve,
+            'planned': planned,
+            'throughput': throughput,
+            'deadline': planned[-1][0] if planned else None,
+            'team_per_hour': None,
+            'projected_finish': None,
+            'on_pace': None
+        }
+        if curve:
+            first_hour, last_hour = min(team), max(team)
+            # Calendar pace, breaks and nights included
+            rate = timed / (last_hour - first_hour + 1)
+            analytics['team_per_hour'] = round(rate, 2)
+            finish = curve[-1][0] + round(analytics['remaining'] / rate * HOUR_MS)
+            analytics['projected_finish'] = finish
+            if analytics['deadline'] is not None:
+                analytics['on_pace'] = finish <= analytics['deadline']
+        return analytics
+
+
+def format_time(ms):
+    moment = datetime.fromtimestamp(ms / 1000)
+    return f"{moment:%a} {moment:%b} {moment.day}, {moment:%H:%M}"
+
+
+def render_chart(analytics):
+    points = analytics['planned'] + analytics['curve']
+    if analytics['projected_finish'] is not None:
+        points.append([analytics['projected_finish'], 0])
+    if not points:
+        return ''
+    start = min(point[0] for point in points)
+    end = max(point[0] for point in points)
+    span = max(end - start, HOUR_MS)
+    top = max(analytics['total'], 1)
+
+    def x(ms):
+        return CHART_PADDING + (ms - start) / span * (CHART_WIDTH - 2 * CHART_PADDING)
+
+    def y(count):
+        return CHART_PADDING + (1 - count / top) * (CHART_HEIGHT - 2 * CHART_PADDING)
+
+    def polyline(curve, css_class):
+        if len(curve) < 2:
+            return ''
+        coordinates = ' '.join(f"{x(ms):.1f},{y(count):.1f}" for ms, count in curve)
+        return f'<polyline class="{css_class}" points="{coordinates}"/>'
+
+    pieces = [
+        f'<line class="burndown-axis" x1="{CHART_PADDING}" y1="{y(0):.1f}"'
+        f' x2="{CHART_WIDTH - CHART_PADDING}" y2="{y(0):.1f}"/>',
+        polyline(analytics['planned'], 'burndown-planned')
+    ]
+    if analytics['deadline'] is not None:
+        pieces.append(f'<line class="burndown-deadline" x1="{x(analytics["deadline"]):.1f}" y1="{CHART_PADDING}"'
+                      f' x2="{x(analytics["deadline"]):.1f}" y2="{y(0):.1f}"/>')
+    pieces.append(polyline(analytics['curve'], 'burndown-actual'))
+    if analytics['projected_finish'] is not None:
+        pieces.append(polyline([analytics['curve'][-1], [analytics['projected_finish'], 0]], 'burndown-projected'))
+    return (
+        f'<svg class="burndown-chart" viewBox="0 0 {CHART_WIDTH} {CHART_HEIGHT}" role="img"'
+        f' aria-label="Tasks left over time against the schedule">{"".join(pieces)}</svg>'
+    )
+
+
+def render_burndown(analytics):
+    """The page's burn-down section."""
+    if analytics['projected_finish'] is None:
+        summary = ("No completion times yet. Export progress on each device and merge it"
+                   " (merge_progress.py) to track the pace.")
+    elif analytics['remaining'] == 0:
+        summary = f"All {analytics['total']} tasks done at {format_time(analytics['projected_finish'])}."
+    else:
+        summary = (f"{analytics['remaining']} tasks left at {analytics['team_per_hour']} per hour:"
+                   f" projected finish {format_time(analytics['projected_finish'])}")
+        if analytics['on_pace'] is not None:
+            deadline = format_time(analytics['deadline'] - 1)
+            summary += f" ({'on pace' if analytics['on_pace'] else 'behind'}, schedule ends {deadline})."
+
+    people = ''.join(
+        f"<li>{escape(assignee)}: {entry['completed']} done, {entry['per_hour']} per active hour</li>"
+        for assignee, entry in analytics['throughput'].items()
+    )
+    if people:
+        people = f'<ul class="burndown-people">{people}</ul>'
+    status = ''
+    if analytics['on_pace'] is not None:
+        status = ' burndown-on-pace' if analytics['on_pace'] else ' burndown-behind'
+    return (
+        '<div class="section burndown">'
+        '<h2>📉 Burn-down</h2>'
+        f'{render_chart(analytics)}'
+        f'<p class="burndown-summary{status}">{escape(summary)}</p>'
+        f'{people}'
+        '</div>'
+    )
+
+
+def main():
+    data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
+    try:
+        with open(os.path.join(data_dir, 'generated_tasks.json'), 'r') as f:
+            task_data = json.load(f)
+    except FileNotFoundError:
+        print("⚠️  No tasks found. Run rebuild_planner.py first!")
+        sys.exit(1)
+
+    analytics = BurndownAnalytics(data_dir).update(task_data)
+    print(f"\n📉 BURN-DOWN: {analytics['completed']} of {analytics['total']} tasks done")
+    for assignee, entry in analytics['throughput'].items():
+        print(f"   {assignee}: {entry['completed']} done over {entry['active_hours']} hours"
+              f" ({entry['per_hour']} per hour)")
+    if analytics['projected_finish'] is None:
+        print("   No completion times yet (merge progress logs with merge_progress.py)")
+        return
+    print(f"   Team pace: {analytics['team_per_hour']} tasks per hour")
+    print(f"   Projected finish: {format_time(analytics['projected_finish'])}")
+    if analytics['on_pace'] is not None:
+        print(f"   {'✅ On pace' if analytics['on_pace'] else '⚠️  Behind'}:"
+              f" schedule ends {format_time(analytics['deadline'] - 1)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,18 @@
 #!/usr/bin/env python3
-import json
 import math
 import os
+from config_compiler import load_config
 
 
 class MovingCalculator:
-    def __init__(self):
-        self.data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
+    def __init__(self, data_dir=None):
+        self.data_dir = data_dir or os.path.join(os.path.dirname(__file__), '..', 'data')
         self.load_configs()
 
     def load_configs(self):
-        with open(os.path.join(self.data_dir, 'rooms_config.json'), 'r') as f:
-            self.rooms = json.load(f)
-        with open(os.path.join(self.data_dir, 'calculation_formulas.json'), 'r') as f:
-            self.formulas = json.load(f)
+        config = load_config(self.data_dir)
+        self.rooms = config['rooms']
+        self.formulas = config['formulas']
 
     def calculate_boxes_for_category(self, volume, box_type):
         if volume <= 0:
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Config Compiler
+Validates rooms_config.json, calculation_formulas.json,
+task_templates.json and, when present, destination_config.json once and
+stores them as a single compiled snapshot.
+
+The snapshot (data/.config_snapshot.json) is keyed by the sha256 of each
+source file. Later runs load it in one read: a source whose size and
+mtime are unchanged is trusted without hashing, and any other source is
+re-hashed. Only a real content change triggers a full recompile.
+
+Task templates are checked against the placeholders their task type
+provides, so a typo fails here instead of as a KeyError mid-generation,
+and compile_templates() looks up each type's template and variants once
+per run.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from datetime import date
+from string import Formatter
+from atomic_io import write_atomic
+
+SNAPSHOT_FILE = '.config_snapshot.json'
+SNAPSHOT_VERSION = 2
+CONFIG_SOURCES = {
+    'rooms': 'rooms_config.json',
+    'formulas': 'calculation_formulas.json',
+    'templates': 'task_templates.json',
+    'destination': 'destination_config.json'
+}
+# Sources that may be missing; they load as None
+OPTIONAL_SOURCES = {'destination'}
+TASK_TYPES = ['collection', 'packing', 'staging', 'verification']
+UNPACKING_TASK_TYPES = ['unload', 'place', 'unpack']
+# Placeholders each task type's templates may use
+BASE_FIELDS = {'room', 'category', 'category_lower', 'floor'}
+BOX_FIELDS = BASE_FIELDS | {'box_count', 'box_type'}
+UNPACKING_FIELDS = BOX_FIELDS | {'destination', 'unload_area'}
+TEMPLATE_FIELDS = {
+    'collection': BASE_FIELDS,
+    'packing': BOX_FIELDS,
+    'staging': BOX_FIELDS | {'staging_area'},
+    'verification': BASE_FIELDS,
+    'unload': UNPACKING_FIELDS,
+    'place': UNPACKING_FIELDS,
+    'unpack': UNPACKING_FIELDS
+}
+# Optional per-type overrides of 'template' and 'icon'
+TEMPLATE_VARIANTS = ['laundry']
+
+
+class ConfigError(ValueError):
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__("Invalid configuration:\n" + "\n".join(f"  - {error}" for error in errors))
+
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def check_type(errors, path, value, expected, name):
+    if isinstance(value, bool) and expected is not bool:
+        ok = False
+    elif expected is float:
+        ok = is_number(value)
+    else:
+        ok = isinstance(value, expected)
+    if not ok:
+        errors.append(f"{path}: expected {name}, got {type(value).__name__}")
+    return ok
+
+
+def validate_formulas(formulas, errors):
+    path = CONFIG_SOURCES['formulas']
+    if not check_type(errors, path, formulas, dict, 'an object'):
+        return
+
+    box_sizes = formulas.get('box_sizes')
+    if not check_type(errors, f"{path} box_sizes", box_sizes, dict, 'an object'):
+        box_sizes = {}
+    else:
+        if not box_sizes:
+            errors.append(f"{path} box_sizes: at least one box type is required")
+        for box_type, size in box_sizes.items():
+            if check_type(errors, f"{path} box_sizes.{box_type}", size, float, 'a number') and size <= 0:
+                errors.append(f"{path} box_sizes.{box_type}: must be positive")
+
+    efficiency = formulas.get('packing_efficiency')
+    if check_type(errors, f"{path} packing_efficiency", efficiency, dict, 'an object'):
+        for box_type in box_sizes:
+            value = efficiency.get(box_type)
+            item = f"{path} packing_efficiency.{box_type}"
+            if value is None:
+                errors.append(f"{item}: missing")
+            elif check_type(errors, item, value, float, 'a number') and not 0 < value <= 1:
+                errors.append(f"{item}: must be in (0, 1]")
+
+    buffer = formulas.get('buffer_percentage')
+    if check_type(errors, f"{path} buffer_percentage", buffer, float, 'a number') and buffer < 0:
+        errors.append(f"{path} buffer_percentage: must not be negative")
+
+    rules = formulas.get('assignment_rules', {})
+    if check_type(errors, f"{path} assignment_rules", rules, dict, 'an object'):
+        for key, value in rules.items():
+            check_type(errors, f"{path} assignment_rules.{key}", value, str, 'a string')
+
+
+def validate_rooms(rooms, box_types, errors):
+    path = CONFIG_SOURCES['rooms']
+    if not check_type(errors, path, rooms, dict, 'an object'):
+        return
+    if not rooms:
+        errors.append(f"{path}: at least one room is required")
+
+    for room_name, room in rooms.items():
+        room_path = f"{path} {room_name}"
+        if not check_type(errors, room_path, room, dict, 'an object'):
+            continue
+        if 'floor' not in room:
+            errors.append(f"{room_path}: missing floor")
+        else:
+            check_type(errors, f"{room_path}.floor", room['floor'], int, 'an integer')
+        if 'priority' in room:
+            check_type(errors, f"{room_path}.priority", room['priority'], int, 'an integer')
+        for key in ('staging_only', 'staging_area'):
+            if key in room:
+                check_type(errors, f"{room_path}.{key}", room[key], bool, 'true or false')
+        if 'description' in room:
+            check_type(errors, f"{room_path}.description", room['description'], str, 'a string')
+
+        categories = room.get('categories', [])
+        if not check_type(errors, f"{room_path}.categories", categories, list, 'a list'):
+            continue
+        names = set()
+        for index, category in enumerate(categories):
+            category_path = f"{room_path}.categories[{index}]"
+            if not check_type(errors, category_path, category, dict, 'an object'):
+                continue
+            name = category.get('name')
+            if check_type(errors, f"{category_path}.name", name, str, 'a string'):
+                if name in names:
+                    errors.append(f"{category_path}.name: duplicate category '{name}'")
+                names.add(name)
+            box_type = category.get('box_type')
+            if check_type(errors, f"{category_path}.box_type", box_type, str, 'a string') \
+                    and box_types is not None and box_type not in box_types:
+                errors.append(f"{category_path}.box_type: unknown box type '{box_type}'")
+            for key in ('heavy', 'fragile'):
+                if key in category:
+                    check_type(errors, f"{category_path}.{key}", category[key], bool, 'true or false')
+            if 'typical_volume' in category:
+                volume = category['typical_volume']
+                if check_type(errors, f"{category_path}.typical_volume", volume, float, 'a number') \
+                        and volume < 0:
+                    errors.append(f"{category_path}.typical_volume: must not be negative")
+
+
+def validate_template_text(errors, path, text, fields):
+    if not check_type(errors, path, text, str, 'a string'):
+        return
+    try:
+        parsed = list(Formatter().parse(text))
+    except ValueError as e:
+        errors.append(f"{path}: {e}")
+        return
+    for _, field, format_spec, conversion in parsed:
+        if field is None:
+            continue
+        if field not in fields:
+            errors.append(f"{path}: unknown placeholder {{{field}}}")
+        elif format_spec or conversion:
+            # The page re-expands templates with plain substitution
+            errors.append(f"{path}: {{{field}}} cannot have a format spec or conversion")
+
+
+def validate_templates(templates, task_types, errors):
+    path = CONFIG_SOURCES['templates']
+    if not check_type(errors, path, templates, dict, 'an object'):
+        return
+
+    # Required types, then any other known type that has a template
+    known = [task_type for task_type in templates if task_type in TEMPLATE_FIELDS]
+    for task_type in dict.fromkeys(task_types + known):
+        template = templates.get(task_type)
+        template_path = f"{path} {task_type}"
+        if template is None:
+            errors.append(f"{template_path}: missing")
+            continue
+        if not check_type(errors, template_path, template, dict, 'an object'):
+            continue
+        check_type(errors, f"{template_path}.icon", template.get('icon'), str, 'a string')
+        validate_template_text(errors, f"{template_path}.template", template.get('template'),
+                               TEMPLATE_FIELDS[task_type])
+        for variant in TEMPLATE_VARIANTS:
+            if variant not in template:
+                continue
+            variant_path = f"{template_path}.{variant}"
+            override = template[variant]
+            if not check_type(errors, variant_path, override, dict, 'an object'):
+                continue
+            if 'icon' in override:
+                check_type(errors, f"{variant_path}.icon", override['icon'], str, 'a string')
+            if 'template' in override:
+                validate_template_text(errors, f"{variant_path}.template", override['template'],
+                                       TEMPLATE_FIELDS[task_type])
+
+
+def compile_templates(templates):
+    """{task type: {variant: (icon, formatter)}} for validated templates,
+    'default' plus every variant (falling back to the default). A formatter
+    is the template's bound format_map, which takes the field dict and
+    returns the text. str.format still parses the template on every call;
+    that is faster than joining pieces split once in Python."""
+    compiled = {}
+    for task_type, template in templates.items():
+        if task_type not in TEMPLATE_FIELDS:
+            continue
+        default = (template['icon'], template['template'].format_map)
+        compiled[task_type] = {'default': default}
+        for variant in TEMPLATE_VARIANTS:
+            override = template.get(variant, {})
+            compiled[task_type][variant] = (
+                override.get('icon', default[0]),
+                override['template'].format_map if 'template' in override else default[1]
+            )
+    return compiled
+
+
+def parse_date(errors, path, value):
+    if not check_type(errors, path, value, str, 'a date string'):
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        errors.append(f"{path}: '{value}' is not a YYYY-MM-DD date")
+        return None
+
+
+def validate_destination(destination, rooms, errors):
+    path = CONFIG_SOURCES['destination']
+    if not check_type(errors, path, destination, dict, 'an object'):
+        return
+
+    check_type(errors, f"{path} unload_area", destination.get('unload_area'), str, 'a string')
+    move_day = parse_date(errors, f"{path} move_day", destination.get('move_day'))
+    days = destination.get('unpacking_days')
+    if check_type(errors, f"{path} unpacking_days", days, list, 'a list'):
+        if not days:
+            errors.append(f"{path} unpacking_days: at least one day is required")
+        for index, value in enumerate(days):
+            day = parse_date(errors, f"{path} unpacking_days[{index}]", value)
+            if day and move_day and day <= move_day:
+                errors.append(f"{path} unpacking_days[{index}]: {value} is not after the move day")
+
+    mapping = destination.get('room_mapping')
+    if check_type(errors, f"{path} room_mapping", mapping, dict, 'an object'):
+        for room, new_room in mapping.items():
+            if isinstance(rooms, dict) and room not in rooms:
+                errors.append(f"{path} room_mapping: unknown room '{room}'")
+            check_type(errors, f"{path} room_mapping.{room}", new_room, str, 'a string')
+
+
+def validate_config(config):
+    errors = []
+    validate_formulas(config['formulas'], errors)
+    box_sizes = config['formulas'].get('box_sizes') if isinstance(config['formulas'], dict) else None
+    validate_rooms(config['rooms'], set(box_sizes) if isinstance(box_sizes, dict) else None, errors)
+    task_types = TASK_TYPES
+    if config['destination'] is not None:
+        validate_destination(config['destination'], config['rooms'], errors)
+        task_types = TASK_TYPES + UNPACKING_TASK_TYPES
+    validate_templates(config['templates'], task_types, errors)
+    if errors:
+        raise ConfigError(errors)
+
+
+def source_stat(path):
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def source_missing(key, path):
+    return key in OPTIONAL_SOURCES and not os.path.exists(path)
+
+
+def compile_config(data_dir):
+    """Parse, hash and validate every source. Returns the snapshot dict."""
+    sources = {}
+    config = {}
+    errors = []
+    for key, filename in CONFIG_SOURCES.items():
+        path = os.path.join(data_dir, filename)
+        if source_missing(key, path):
+            sources[key] = None
+            config[key] = None
+            continue
+        with open(path, 'rb') as f:
+            raw = f.read()
+        sources[key] = dict(source_stat(path), sha256=hashlib.sha256(raw).hexdigest())
+        try:
+            config[key] = json.loads(raw)
+        except json.JSONDecodeError as e:
+            errors.append(f"{filename}: invalid JSON ({e})")
+    if errors:
+        raise ConfigError(errors)
+
+    validate_config(config)
+    return {'version': SNAPSHOT_VERSION, 'sources': sources, 'config': config}
+
+
+def read_snapshot(snapshot_path):
+    try:
+        with open(snapshot_path, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get('version') != SNAPSHOT_VERSION:
+        return None
+    return snapshot
+
+
+def snapshot_is_current(snapshot, data_dir):
+    """Returns (current, stats_changed)."""
+    stats_changed = False
+    for key, filename in CONFIG_SOURCES.items():
+        if key not in snapshot['sources']:
+            return False, False
+        recorded = snapshot['sources'][key]
+        path = os.path.join(data_dir, filename)
+        missing = source_missing(key, path)
+        if missing or recorded is None:
+            if missing and recorded is None:
+                continue
+            # An optional source appeared or went away
+            return False, False
+        stat = source_stat(path)
+        if stat['size'] == recorded['size'] and stat['mtime_ns'] == recorded['mtime_ns']:
+            continue
+        # Touched but maybe not changed (checkout, copy): compare content
+        with open(path, 'rb') as f:
+            if hashlib.sha256(f.read()).hexdigest() != recorded['sha256']:
+                return False, False
+        recorded.update(stat)
+        stats_changed = True
+    return True, stats_changed
+
+
+def load_config(data_dir):
+    """Returns {'rooms': ..., 'formulas': ..., 'templates': ...,
+    'destination': ... or None}, compiling and validating the sources only
+    when they changed. Raises ConfigError."""
+    snapshot_path = os.path.join(data_dir, SNAPSHOT_FILE)
+    snapshot = read_snapshot(snapshot_path)
+    if snapshot is not None:
+        current, stats_changed = snapshot_is_current(snapshot, data_dir)
+        if current:
+            if stats_changed:
+                try:
+                    write_atomic(snapshot_path, json.dumps(snapshot, separators=(',', ':')))
+                except OSError:
+                    # As below: a read-only checkout just re-checks the stats next run
+                    pass
+            return snapshot['config']
+
+    snapshot = compile_config(data_dir)
+    try:
+        write_atomic(snapshot_path, json.dumps(snapshot, separators=(',', ':')))
+    except OSError:
+        # A read-only checkout still works, it just recompiles every run
+        pass
+    return snapshot['config']
+
+
+def main():
+    data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
+    print("🔧 Compiling configuration...")
+    try:
+        snapshot = compile_config(data_dir)
+    except ConfigError as e:
+        for error in e.errors:
+            print(f"❌ {error}")
+        sys.exit(1)
+
+    snapshot_path = os.path.join(data_dir, SNAPSHOT_FILE)
+    write_atomic(snapshot_path, json.dumps(snapshot, separators=(',', ':')))
+    config = snapshot['config']
+    print(f"✅ {len(config['rooms'])} rooms, {len(config['formulas']['box_sizes'])} box types"
+          f" and {len(config['templates'])} task templates are valid")
+    print(f"✅ Snapshot written: {snapshot_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Columnar Plan Export
+Writes a plan as three flat tables for analytics tools: tasks, room totals
+and category details, as CSV or TSV.
+
+Each file starts with a few `# key: value` metadata lines (table, row
+count, format version, when the plan was generated), followed by a header
+whose columns carry their type as `name:type`, one of string, int, float,
+bool or date. Booleans are written as true/false and missing values as
+empty fields, so the files load with e.g. pandas.read_csv(comment='#').
+
+Rows are produced one at a time from the in-memory plan and streamed to
+disk, so no JSON document is ever built for the export.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from atomic_io import AtomicWriter
+from calculator import MovingCalculator
+from rebuild_planner import load_user_inputs
+from task_generator import TaskGenerator
+
+EXPORT_VERSION = 1
+FORMATS = {
+    'csv': ',',
+    'tsv': '\t'
+}
+BOX_TYPES = ['small', 'medium', 'large', 'wardrobe']
+TASK_COLUMNS = [
+    ('id', 'string'),
+    ('day', 'date'),
+    ('day_label', 'string'),
+    ('room', 'string'),
+    ('category', 'string'),
+    ('type', 'string'),
+    ('order', 'int'),
+    ('assignee', 'string'),
+    ('completed', 'bool'),
+    ('completed_at', 'int'),
+    ('box_count', 'int'),
+    ('box_type', 'string'),
+    ('box_prefix', 'string'),
+    ('destination', 'string'),
+    ('staging_area', 'string'),
+    ('heavy', 'bool'),
+    ('fragile', 'bool'),
+    ('is_laundry', 'bool'),
+    ('description', 'string')
+]
+ROOM_COLUMNS = [('room', 'string')] + [(box_type, 'int') for box_type in BOX_TYPES] + [
+    ('total_boxes', 'int'),
+    ('category_count', 'int')
+]
+CATEGORY_COLUMNS = [
+    ('room', 'string'),
+    ('category', 'string'),
+    ('volume', 'float'),
+    ('box_type', 'string'),
+    ('boxes', 'int'),
+    ('heavy', 'bool'),
+    ('fragile', 'bool')
+]
+
+
+def format_value(value, kind=None):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if kind == 'int' and isinstance(value, float):
+        # e.g. completion times merged from logs that wrote them as floats
+        return int(value)
+    return value
+
+
+def iter_task_rows(tasks):
+    for task in tasks:
+        yield [format_value(task.get(name), kind) for name, kind in TASK_COLUMNS]
+
+
+def iter_room_rows(room_totals):
+    for room, totals in room_totals.items():
+        counts = [totals.get(box_type, 0) for box_type in BOX_TYPES]
+        yield [room] + counts + [sum(counts), len(totals.get('categories', {}))]
+
+
+def iter_category_rows(room_totals):
+    for room, totals in room_totals.items():
+        for category, details in totals.get('categories', {}).items():
+            yield [room, category] + [format_value(details.get(name), kind) for name, kind in CATEGORY_COLUMNS[2:]]
+
+
+def is_volatile_line(line):
+    # Re-exporting an unchanged plan should not count as a change
+    return line.startswith(b'# generated_at:')
+
+
+class PlanExporter:
+    def __init__(self, output_dir=None, fmt='tsv'):
+        self.data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
+        self.output_dir = output_dir or os.path.join(self.data_dir, 'export')
+        self.format = fmt
+
+    def write_table(self, name, columns, rows, row_count, generated_at):
+        path = os.path.join(self.output_dir, f"{name}.{self.format}")
+        writer = AtomicWriter(path, ignore_line=is_volatile_line)
+        with writer as f:
+            f.write(f"# table: {name}\n")
+            f.write(f"# rows: {row_count}\n")
+            f.write(f"# format_version: {EXPORT_VERSION}\n")
+            if generated_at:
+                f.write(f"# generated_at: {generated_at}\n")
+            table = csv.writer(f, delimiter=FORMATS[self.format], lineterminator='\n')
+            table.writerow([f"{column}:{kind}" for column, kind in columns])
+            table.writerows(rows)
+        return path, writer.written
+
+    def export(self, task_data):
+        """Write tasks, rooms and categories tables. Returns
+        [(path, rows, written), ...]."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        tasks = task_data['tasks']
+        room_totals = task_data['room_totals']
+        generated_at = task_data.get('generated_at')
+        category_count = sum(len(totals.get('categories', {})) for totals in room_totals.values())
+
+        tables = [
+            ('tasks', TASK_COLUMNS, iter_task_rows(tasks), len(tasks)),
+            ('rooms', ROOM_COLUMNS, iter_room_rows(room_totals), len(room_totals)),
+            ('categories', CATEGORY_COLUMNS, iter_category_rows(room_totals), category_count)
+        ]
+        results = []
+        for name, columns, rows, row_count in tables:
+            path, written = self.write_table(name, columns, rows, row_count, generated_at)
+            results.append((path, row_count, written))
+        return results
+
+
+def build_plan_from_inputs():
+    """Calculate the plan straight from user_inputs.json without reading
+    or writing generated_tasks.json."""
+    inputs = load_user_inputs()
+    results = MovingCalculator().calculate_all(inputs)
+    return TaskGenerator().generate_all_tasks(results)
+
+
+def load_generated_plan(data_dir):
+    task_file = os.path.join(data_dir, 'generated_tasks.json')
+    try:
+        with open(task_file, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        print("❌ No generated_tasks.json found. Run rebuild_planner.py first!")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the plan as columnar CSV/TSV tables.")
+    parser.add_argument('--format', choices=sorted(FORMATS), default='tsv')
+    parser.add_argument('--output', help="output directory (default: data/export)")
+    parser.add_argument('--from-inputs', action='store_true',
+                        help="calculate the plan from user_inputs.json instead of reading generated_tasks.json")
+    args = parser.parse_args()
+
+    exporter = PlanExporter(args.output, args.format)
+    print("📂 Loading plan...")
+    if args.from_inputs:
+        task_data = build_plan_from_inputs()
+    else:
+        task_data = load_generated_plan(exporter.data_dir)
+
+    print(f"💾 Exporting {args.format.upper()} tables...")
+    for path, rows, written in exporter.export(task_data):
+        status = "written" if written else "unchanged"
+        print(f"✅ {os.path.basename(path)}: {rows} rows ({status})")
+    print(f"📄 Export directory: {exporter.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,643 +1,484 @@
 #!/usr/bin/env python3
+import hashlib
 import json
 import os
-from datetime import datetime
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from string import Template
+from atomic_io import write_atomic, write_stream
+from burndown import BurndownAnalytics, render_burndown
+from build_output import (format_sizes, iter_json_array, iter_json_object, iter_json_string,
+                          minify_css, minify_html, minify_js, precompress)
+from config_compiler import ConfigError, load_config
+from page_markup import (group_by_day, iter_day_content, iter_day_shell, percentage, pick_lead_day,
+                         render_plan_nav)
+from plan_payload import UNSCHEDULED_LABEL, encode_plan
+from search_index import build_search_index
+
+SCRIPT_DIR = os.path.dirname(__file__)
+TEMPLATE_DIR = os.path.join(SCRIPT_DIR, 'templates')
+ASSET_SOURCES = {
+    'css': 'planner.css',
+    'js': 'planner.js'
+}
+ASSET_STEMS = {os.path.splitext(source)[0] for source in ASSET_SOURCES.values()}
+ASSET_HASH_LENGTH = 10
+CHUNK_PREFIX = 'tasks-'
+MANIFEST_PREFIX = 'precache-manifest.'
+SEARCH_PREFIX = 'search.'
+SERVICE_WORKER = 'sw.js'
+VARIANT_PREFIX = 'plan-'
+PAGE_TITLE = 'Moving Planner | SF → San Rafael'
+# Everything a page variant's markup depends on besides its slice of the plan
+RENDER_SOURCES = ['generate_static.py', 'page_markup.py', 'plan_payload.py', 'build_output.py', 'search_index.py',
+                  'burndown.py']
+SLICE_META = re.compile(r'<meta name="plan-slice" content="([0-9a-f]*)">')
+MINIFIERS = {
+    '.css': minify_css,
+    '.js': minify_js,
+    '.html': minify_html
+}
+
+
+@lru_cache(maxsize=None)
+def read_template(name):
+    with open(os.path.join(TEMPLATE_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+@lru_cache(maxsize=None)
+def compiled_template(name):
+    return Template(read_template(name))
+
+
+@lru_cache(maxsize=None)
+def page_parts(name):
+    """Minify a page template and split it at its placeholders, so the page
+    can be streamed. Returns ([(literal, placeholder or None), ...], bytes
+    saved by minifying)."""
+    source = read_template(name)
+    minified = MINIFIERS[os.path.splitext(name)[1]](source)
+
+    parts = []
+    literal = []
+    position = 0
+    for match in Template.pattern.finditer(minified):
+        literal.append(minified[position:match.start()])
+        position = match.end()
+        if match.group('escaped') is not None:
+            literal.append('$')
+        elif match.group('invalid') is not None:
+            raise ValueError(f"Invalid placeholder in {name} at offset {match.start()}")
+        else:
+            parts.append((''.join(literal), match.group('named') or match.group('braced')))
+            literal = []
+    literal.append(minified[position:])
+    parts.append((''.join(literal), None))
+
+    saved = len(source.encode('utf-8')) - len(minified.encode('utf-8'))
+    return parts, saved
+
+
+def iter_chunk(rows, tasks):
+    # Same bytes as json.dumps({'tasks': rows, 'html': markup}) in compact form
+    yield '{"tasks":'
+    yield from iter_json_array(rows)
+    yield ',"html":'
+    yield from iter_json_string(iter_day_content(tasks))
+    yield '}'
+
+
+def slugify(value):
+    return re.sub(r'[^a-z0-9]+', '-', value.lower()).strip('-')
+
+
+# Page variants render in worker processes. Each worker receives the plan
+# once through the pool initializer, and each job names only its slice.
+_worker_state = {}
+
+
+def init_variant_worker(output_dir, task_data, assets, links):
+    _worker_state.update(output_dir=output_dir, task_data=task_data, assets=assets, links=links)
+
+
+def render_variant(variant):
+    """Render one page variant unless its slice is unchanged.
+
+    Returns (status, size, gzip_size) with status 'written', 'unchanged'
+    (rendered, identical bytes) or 'skipped' (slice hash matched).
+    """
+    generator = StaticHTMLGenerator()
+    generator.output_dir = _worker_state['output_dir']
+    task_data = _worker_state['task_data']
+    slice_data = dict(task_data, tasks=[
+        task for task in task_data['tasks'] if task.get(variant['field']) == variant['value']
+    ])
+    page = {
+        'title': variant['title'],
+        'nav': render_plan_nav(_worker_state['links'], variant['filename']),
+        'slice': generator.slice_hash(slice_data, _worker_state['assets'], variant['title'],
+                                      _worker_state['links'])
+    }
+
+    path = os.path.join(generator.output_dir, variant['filename'])
+    if read_slice_hash(path) == page['slice'] and os.path.exists(path + '.gz'):
+        return 'skipped', os.path.getsize(path), os.path.getsize(path + '.gz')
+
+    payload = generator.build_payload(slice_data)
+    days = generator.build_day_chunks(payload, slice_data, inline=True)
+    written, size = write_stream(path, generator.generate_html(payload, _worker_state['assets'], days, page))
+    _, gzip_size = precompress(path)
+    return ('written' if written else 'unchanged'), size, gzip_size
+
+
+def read_slice_hash(path):
+    if not os.path.exists(path):
+        return None
+    # The meta tag sits at the top of <head>
+    with open(path, 'r', encoding='utf-8') as f:
+        match = SLICE_META.search(f.read(2048))
+    return match.group(1) if match else None
+
 
 class StaticHTMLGenerator:
     def __init__(self):
         self.data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
         self.output_dir = os.path.join(os.path.dirname(__file__), '..', 'docs')
+        self.assets_dir = os.path.join(self.output_dir, 'assets')
+        self.build_sizes = {}
 
     def load_task_data(self):
         task_file = os.path.join(self.data_dir, 'generated_tasks.json')
         with open(task_file, 'r') as f:
             return json.load(f)
 
-    def generate_html(self, task_data):
-        tasks_json = json.dumps(task_data, indent=2)
-
-        html = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Moving Planner | SF → San Rafael</title>
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-
-        :root {{
-            --bg-primary: #0f172a;
-            --bg-secondary: #1e293b;
-            --bg-tertiary: #334155;
-            --surface: #1e293b;
-            --surface-hover: #334155;
-            --text-primary: #f1f5f9;
-            --text-secondary: #94a3b8;
-            --text-muted: #64748b;
-            --border: #334155;
-            --border-light: #475569;
-            --primary: #3b82f6;
-            --primary-dark: #2563eb;
-            --success: #22c55e;
-            --warning: #f59e0b;
-            --danger: #ef4444;
-            --info: #06b6d4;
-            --shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.3);
-            --shadow-lg: 0 20px 25px -5px rgba(0, 0, 0, 0.4);
-        }}
-
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif;
-            background: var(--bg-primary);
-            color: var(--text-primary);
-            line-height: 1.6;
-            padding: 20px;
-        }}
-
-        .container {{ max-width: 1400px; margin: 0 auto; }}
-
-        header {{
-            background: linear-gradient(135deg, #1e3a8a 0%, #3b82f6 100%);
-            color: white;
-            padding: 30px;
-            border-radius: 16px;
-            margin-bottom: 30px;
-            box-shadow: var(--shadow-lg);
-        }}
-
-        header h1 {{ font-size: 2rem; margin-bottom: 10px; }}
-
-        .stats {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(160px, 1fr));
-            gap: 15px;
-            margin-top: 20px;
-        }}
-
-        .stat-card {{
-            background: rgba(255,255,255,0.15);
-            padding: 15px;
-            border-radius: 12px;
-            backdrop-filter: blur(10px);
-        }}
-
-        .stat-card .label {{ font-size: 0.85rem; opacity: 0.9; margin-bottom: 5px; }}
-        .stat-card .value {{ font-size: 1.5rem; font-weight: 700; }}
-
-        .section {{
-            background: var(--surface);
-            padding: 25px;
-            border-radius: 12px;
-            margin-bottom: 25px;
-            box-shadow: var(--shadow);
-            border: 1px solid var(--border);
-        }}
-
-        .section h2 {{
-            color: var(--primary);
-            margin-bottom: 20px;
-            font-size: 1.5rem;
-            display: flex;
-            align-items: center;
-            gap: 10px;
-        }}
-
-        .progress-bar {{
-            background: var(--bg-tertiary);
-            height: 10px;
-            border-radius: 5px;
-            overflow: hidden;
-            margin-bottom: 15px;
-        }}
-
-        .progress-fill {{
-            height: 100%;
-            background: linear-gradient(90deg, var(--success), #22c55e);
-            transition: width 0.3s ease;
-        }}
-
-        .day-tasks {{ margin-bottom: 30px; }}
-
-        .day-header-bar {{
-            background: var(--bg-tertiary);
-            padding: 15px 20px;
-            border-radius: 8px 8px 0 0;
-            border: 1px solid var(--border);
-            font-weight: 600;
-            font-size: 1.1rem;
-        }}
-
-        .day-content {{
-            background: var(--bg-secondary);
-            border: 1px solid var(--border);
-            border-top: none;
-            border-radius: 0 0 8px 8px;
-            padding: 10px;
-        }}
-
-        .room-section {{
-            background: var(--bg-primary);
-            margin-bottom: 15px;
-            border-radius: 8px;
-            border: 1px solid var(--border);
-            overflow: hidden;
-        }}
-
-        .room-header {{
-            background: var(--bg-tertiary);
-            padding: 12px 20px;
-            cursor: pointer;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            transition: all 0.2s;
-        }}
-
-        .room-header:hover {{
-            background: var(--surface-hover);
-        }}
-
-        .room-header.active {{
-            background: var(--primary);
-        }}
-
-        .room-title {{
-            font-weight: 600;
-            font-size: 1.05rem;
-        }}
-
-        .room-progress {{
-            font-size: 0.85rem;
-            opacity: 0.8;
-            margin-left: 10px;
-        }}
-
-        .room-icon {{
-            font-size: 1rem;
-            transition: transform 0.3s;
-        }}
-
-        .room-header.active .room-icon {{
-            transform: rotate(180deg);
-        }}
-
-        .room-content {{
-            max-height: 0;
-            overflow: hidden;
-            transition: max-height 0.3s ease;
-        }}
-
-        .room-content.active {{
-            max-height: 5000px;
-        }}
-
-        .room-columns {{
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 15px;
-            padding: 15px;
-        }}
-
-        .person-column {{
-            background: var(--bg-secondary);
-            padding: 12px;
-            border-radius: 6px;
-        }}
-
-        .person-column-header {{
-            font-weight: 600;
-            font-size: 0.95rem;
-            margin-bottom: 12px;
-            padding: 8px;
-            background: var(--bg-tertiary);
-            border-radius: 6px;
-            text-align: center;
-        }}
-
-        .category-group {{
-            margin-bottom: 20px;
-            padding-left: 8px;
-            border-left: 3px solid var(--primary);
-        }}
-
-        .category-header {{
-            font-size: 0.9rem;
-            font-weight: 600;
-            color: var(--text-secondary);
-            margin-bottom: 8px;
-            padding: 4px 8px;
-            background: rgba(59, 130, 246, 0.1);
-            border-radius: 4px;
-        }}
-
-        .task-item {{
-            display: flex;
-            align-items: center;
-            gap: 10px;
-            padding: 10px;
-            background: var(--bg-primary);
-            border-radius: 6px;
-            margin-bottom: 6px;
-            border: 1px solid var(--border);
-            transition: all 0.2s;
-        }}
-
-        .task-item:hover {{
-            background: var(--bg-tertiary);
-            border-color: var(--primary);
-        }}
-
-        .task-item.completed {{ opacity: 0.5; }}
-        .task-item.completed .task-text {{ text-decoration: line-through; }}
-
-        .task-item input[type="checkbox"] {{
-            width: 18px;
-            height: 18px;
-            cursor: pointer;
-        }}
-
-        .task-text {{
-            flex: 1;
-            font-size: 0.95rem;
-            cursor: pointer;
-        }}
-
-        .task-assignee-select {{
-            padding: 5px 8px;
-            background: var(--bg-tertiary);
-            border: 1px solid var(--border);
-            border-radius: 6px;
-            color: var(--text-primary);
-            cursor: pointer;
-            font-size: 0.8rem;
-        }}
-
-        .badge {{
-            display: inline-block;
-            padding: 4px 10px;
-            border-radius: 12px;
-            font-size: 0.75rem;
-            font-weight: 600;
-        }}
-
-        .badge-primary {{
-            background: rgba(59, 130, 246, 0.2);
-            color: var(--primary);
-            border: 1px solid var(--primary);
-        }}
-
-        .badge-success {{
-            background: rgba(34, 197, 94, 0.2);
-            color: var(--success);
-            border: 1px solid var(--success);
-        }}
-
-        .badge-warning {{
-            background: rgba(245, 158, 11, 0.2);
-            color: var(--warning);
-            border: 1px solid var(--warning);
-        }}
-
-        @media (max-width: 768px) {{
-            .room-columns {{ grid-template-columns: 1fr; }}
-            .stats {{ grid-template-columns: repeat(2, 1fr); }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <header>
-            <h1>🏠 Moving Planner</h1>
-            <p>Brad & Andie • Archie, Indie & Ozzy • SF → San Rafael</p>
-            <div class="stats">
-                <div class="stat-card">
-                    <div class="label">Days Until Movers</div>
-                    <div class="value" id="daysUntilMove">-</div>
-                </div>
-                <div class="stat-card">
-                    <div class="label">Total Boxes Needed</div>
-                    <div class="value" id="totalBoxes">0</div>
-                </div>
-                <div class="stat-card">
-                    <div class="label">Total Tasks</div>
-                    <div class="value" id="totalTasks">0</div>
-                </div>
-                <div class="stat-card">
-                    <div class="label">Rooms to Pack</div>
-                    <div class="value" id="totalRooms">0</div>
-                </div>
-            </div>
-        </header>
-
-        <div class="section">
-            <h2>✅ Moving Tasks (Room-by-Room)</h2>
-            <div class="progress-bar">
-                <div class="progress-fill" id="taskProgress" style="width: 0%"></div>
-            </div>
-            <p style="margin-bottom: 20px; color: var(--text-secondary);">
-                <span id="taskStats">Loading tasks...</span>
-            </p>
-            <div id="tasksContainer"></div>
-        </div>
-    </div>
-
-    <script>
-        const taskData = {tasks_json};
-
-        function init() {{
-            loadTaskCompletions();
-            loadTaskReassignments();
-            displayTasks();
-            updateStats();
-        }}
-
-        function displayTasks() {{
-            const container = document.getElementById('tasksContainer');
-            if (!taskData.tasks || taskData.tasks.length === 0) {{
-                container.innerHTML = '<p style="color: var(--text-secondary);">No tasks available.</p>';
-                return;
-            }}
-
-            const tasksByDay = {{}};
-            taskData.tasks.forEach(task => {{
-                const day = task.day_label || 'Unscheduled';
-                if (!tasksByDay[day]) tasksByDay[day] = {{}};
-                const room = task.room;
-                if (!tasksByDay[day][room]) tasksByDay[day][room] = [];
-                tasksByDay[day][room].push(task);
-            }});
-
-            container.innerHTML = '';
-
-            Object.entries(tasksByDay).forEach(([day, rooms]) => {{
-                const dayDiv = document.createElement('div');
-                dayDiv.className = 'day-tasks';
-
-                const dayHeader = document.createElement('div');
-                dayHeader.className = 'day-header-bar';
-                dayHeader.textContent = day;
-
-                const dayContent = document.createElement('div');
-                dayContent.className = 'day-content';
-
-                Object.entries(rooms).forEach(([room, tasks]) => {{
-                    const roomSection = createRoomSection(room, tasks, day);
-                    dayContent.appendChild(roomSection);
-                }});
-
-                dayDiv.appendChild(dayHeader);
-                dayDiv.appendChild(dayContent);
-                container.appendChild(dayDiv);
-            }});
-
-            updateTaskStats();
-        }}
-
-        function createRoomSection(room, tasks, day) {{
-            const section = document.createElement('div');
-            section.className = 'room-section';
-
-            const completed = tasks.filter(t => t.completed).length;
-            const total = tasks.length;
-            const progress = total > 0 ? Math.round((completed / total) * 100) : 0;
-
-            const header = document.createElement('div');
-            header.className = 'room-header';
-            header.onclick = () => toggleRoom(header);
-
-            const titleDiv = document.createElement('div');
-            titleDiv.style.display = 'flex';
-            titleDiv.style.alignItems = 'center';
-
-            const title = document.createElement('span');
-            title.className = 'room-title';
-            title.textContent = room;
-
-            const progressText = document.createElement('span');
-            progressText.className = 'room-progress';
-            progressText.textContent = `(${{completed}}/${{total}} - ${{progress}}%)`;
-
-            titleDiv.appendChild(title);
-            titleDiv.appendChild(progressText);
-
-            const icon = document.createElement('div');
-            icon.className = 'room-icon';
-            icon.textContent = '▼';
-
-            header.appendChild(titleDiv);
-            header.appendChild(icon);
-
-            const content = document.createElement('div');
-            content.className = 'room-content';
-
-            const columns = document.createElement('div');
-            columns.className = 'room-columns';
-
-            const andieCol = document.createElement('div');
-            andieCol.className = 'person-column';
-            const andieHeader = document.createElement('div');
-            andieHeader.className = 'person-column-header';
-            andieHeader.innerHTML = '<span class="badge badge-success">Andie</span>';
-            andieCol.appendChild(andieHeader);
-
-            const bradCol = document.createElement('div');
-            bradCol.className = 'person-column';
-            const bradHeader = document.createElement('div');
-            bradHeader.className = 'person-column-header';
-            bradHeader.innerHTML = '<span class="badge badge-primary">Brad</span>';
-            bradCol.appendChild(bradHeader);
-
-            const tasksByCategory = {{}};
-            tasks.forEach(task => {{
-                const category = task.category;
-                if (!tasksByCategory[category]) tasksByCategory[category] = [];
-                tasksByCategory[category].push(task);
-            }});
-
-            Object.entries(tasksByCategory).forEach(([category, catTasks]) => {{
-                const andieTasks = catTasks.filter(t => t.assignee === 'Andie');
-                const bradTasks = catTasks.filter(t => t.assignee === 'Brad');
-
-                if (andieTasks.length > 0) {{
-                    const categoryGroup = createCategoryGroup(category, andieTasks);
-                    andieCol.appendChild(categoryGroup);
-                }}
-
-                if (bradTasks.length > 0) {{
-                    const categoryGroup = createCategoryGroup(category, bradTasks);
-                    bradCol.appendChild(categoryGroup);
-                }}
-            }});
-
-            columns.appendChild(andieCol);
-            columns.appendChild(bradCol);
-            content.appendChild(columns);
-
-            section.appendChild(header);
-            section.appendChild(content);
-
-            return section;
-        }}
-
-        function createCategoryGroup(category, tasks) {{
-            const group = document.createElement('div');
-            group.className = 'category-group';
-
-            const header = document.createElement('div');
-            header.className = 'category-header';
-            header.textContent = category;
-
-            group.appendChild(header);
-
-            tasks.sort((a, b) => (a.order || 0) - (b.order || 0));
-
-            tasks.forEach(task => {{
-                group.appendChild(createTaskElement(task));
-            }});
-
-            return group;
-        }}
-
-        function createTaskElement(task) {{
-            const taskDiv = document.createElement('div');
-            taskDiv.className = 'task-item';
-            if (task.completed) taskDiv.classList.add('completed');
-
-            const checkbox = document.createElement('input');
-            checkbox.type = 'checkbox';
-            checkbox.checked = task.completed;
-            checkbox.onchange = () => toggleTask(task.id);
-
-            const text = document.createElement('div');
-            text.className = 'task-text';
-            text.textContent = `${{task.icon}} ${{task.description}}`;
-            text.onclick = () => checkbox.click();
-
-            const select = document.createElement('select');
-            select.className = 'task-assignee-select';
-            select.innerHTML = `
-                <option value="Andie" ${{task.assignee === 'Andie' ? 'selected' : ''}}>Andie</option>
-                <option value="Brad" ${{task.assignee === 'Brad' ? 'selected' : ''}}>Brad</option>
-            `;
-            select.onchange = () => reassignTask(task.id, select.value);
-
-            taskDiv.appendChild(checkbox);
-            taskDiv.appendChild(text);
-            taskDiv.appendChild(select);
-
-            return taskDiv;
-        }}
-
-        function toggleRoom(header) {{
-            header.classList.toggle('active');
-            const content = header.nextElementSibling;
-            content.classList.toggle('active');
-        }}
-
-        function toggleTask(taskId) {{
-            const task = taskData.tasks.find(t => t.id === taskId);
-            if (task) {{
-                task.completed = !task.completed;
-                saveTaskCompletions();
-                displayTasks();
-            }}
-        }}
-
-        function reassignTask(taskId, newAssignee) {{
-            const task = taskData.tasks.find(t => t.id === taskId);
-            if (task) {{
-                task.assignee = newAssignee;
-                saveTaskReassignments();
-                displayTasks();
-            }}
-        }}
-
-        function saveTaskCompletions() {{
-            const completions = taskData.tasks.reduce((acc, t) => {{
-                acc[t.id] = t.completed || false;
-                return acc;
-            }}, {{}});
-            localStorage.setItem('taskCompletions', JSON.stringify(completions));
-        }}
-
-        function loadTaskCompletions() {{
-            const saved = localStorage.getItem('taskCompletions');
-            if (saved) {{
-                const completions = JSON.parse(saved);
-                taskData.tasks.forEach(task => {{
-                    if (completions[task.id] !== undefined) {{
-                        task.completed = completions[task.id];
-                    }}
-                }});
-            }}
-        }}
-
-        function saveTaskReassignments() {{
-            const assignments = taskData.tasks.reduce((acc, t) => {{
-                acc[t.id] = t.assignee;
-                return acc;
-            }}, {{}});
-            localStorage.setItem('taskAssignments', JSON.stringify(assignments));
-        }}
-
-        function loadTaskReassignments() {{
-            const saved = localStorage.getItem('taskAssignments');
-            if (saved) {{
-                const assignments = JSON.parse(saved);
-                taskData.tasks.forEach(task => {{
-                    if (assignments[task.id]) {{
-                        task.assignee = assignments[task.id];
-                    }}
-                }});
-            }}
-        }}
-
-        function updateTaskStats() {{
-            const completed = taskData.tasks.filter(t => t.completed).length;
-            const total = taskData.tasks.length;
-            const percentage = total > 0 ? Math.round((completed / total) * 100) : 0;
-
-            document.getElementById('taskStats').textContent =
-                `${{completed}} of ${{total}} tasks completed (${{percentage}}%)`;
-            document.getElementById('taskProgress').style.width = `${{percentage}}%`;
-        }}
-
-        function updateStats() {{
-            const moveDate = new Date('2025-10-26');
-            const today = new Date();
-            const daysUntil = Math.ceil((moveDate - today) / (1000 * 60 * 60 * 24));
-            document.getElementById('daysUntilMove').textContent = daysUntil > 0 ? daysUntil : '0';
-
-            if (taskData.task_counts) {{
-                document.getElementById('totalTasks').textContent = taskData.task_counts.total;
-            }}
-
-            if (taskData.room_totals) {{
-                document.getElementById('totalRooms').textContent = Object.keys(taskData.room_totals).length;
-            }}
-
-            if (taskData.totals && taskData.totals.with_buffer) {{
-                const totals = taskData.totals.with_buffer;
-                const totalBoxes = totals.small + totals.medium + totals.large + totals.wardrobe;
-                document.getElementById('totalBoxes').textContent = totalBoxes;
-            }}
-        }}
-
-        document.addEventListener('DOMContentLoaded', init);
-    </script>
-</body>
-</html>'''
-
-        return html
-
-    def save_html(self, html):
+    def load_templates(self):
+        return load_config(self.data_dir)['templates']
+
+    def build_assets(self):
+        assets = {}
+        for kind, source in ASSET_SOURCES.items():
+            content = self.minify(source, read_template(source))
+            digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:ASSET_HASH_LENGTH]
+            stem, ext = os.path.splitext(source)
+            assets[kind] = {
+                'filename': f"{stem}.{digest}{ext}",
+                'content': content
+            }
+        return assets
+
+    def minify(self, name, source):
+        minified = MINIFIERS[os.path.splitext(name)[1]](source)
+        self.build_sizes[name] = [len(source.encode('utf-8')), len(minified.encode('utf-8')), None]
+        return minified
+
+    def precompress(self, name, path):
+        written, gzip_size = precompress(path)
+        if name in self.build_sizes:
+            sizes = self.build_sizes[name]
+            sizes[2] = (sizes[2] or 0) + gzip_size
+        if written:
+            print(f"🗜️  Precompressed: {path}.gz")
+
+    def print_size_report(self):
+        print("📏 Build sizes:")
+        for name, (source_size, minified_size, gzip_size) in self.build_sizes.items():
+            print(format_sizes(name, source_size, minified_size, gzip_size))
+
+    def build_payload(self, task_data):
+        return encode_plan(task_data, self.load_templates())
+
+    def plan_variants(self, task_data):
+        """One page per assignee and one per day, each showing only that
+        slice of the plan."""
+        variants = []
+        for assignee in sorted({task['assignee'] for task in task_data['tasks']}):
+            variants.append({
+                'filename': f"{VARIANT_PREFIX}{slugify(assignee)}.html",
+                'label': assignee,
+                'title': f"Moving Planner | {assignee}'s tasks",
+                'field': 'assignee',
+                'value': assignee
+            })
+        for day, tasks in group_by_day(task_data['tasks']).items():
+            label = tasks[0].get('day_label', day) if day else UNSCHEDULED_LABEL
+            variants.append({
+                'filename': f"{VARIANT_PREFIX}{day or 'unscheduled'}.html",
+                'label': label,
+                'title': f"Moving Planner | {label}",
+                'field': 'day',
+                'value': day
+            })
+        return variants
+
+    def plan_links(self, variants):
+        return [('./', 'Everything')] + [(variant['filename'], variant['label']) for variant in variants]
+
+    def slice_hash(self, task_data, assets, title, links):
+        """Fingerprint of everything a page is rendered from, stored in the
+        page so an unchanged slice can be skipped on the next build."""
+        digest = hashlib.sha256()
+        inputs = {
+            'tasks': task_data['tasks'],
+            'totals': task_data.get('totals', {}),
+            'rooms': len(task_data.get('room_totals', {})),
+            'synced': task_data.get('synced', {}),
+            'boxes': task_data.get('boxes', {}),
+            'templates': self.load_templates(),
+            'assets': [asset['filename'] for asset in assets.values()],
+            'title': title,
+            'links': links
+        }
+        for piece in json.JSONEncoder(sort_keys=True).iterencode(inputs):
+            digest.update(piece.encode('utf-8'))
+        digest.update(read_template('index.html').encode('utf-8'))
+        for name in RENDER_SOURCES:
+            with open(os.path.join(SCRIPT_DIR, name), 'rb') as f:
+                digest.update(f.read())
+        return digest.hexdigest()[:ASSET_HASH_LENGTH]
+
+    def build_day_chunks(self, payload, task_data, inline=False):
+        """Fingerprint each day's task rows and pre-rendered markup as its
+        own chunk.
+
+        The day entries left in the payload keep the label, chunk file name,
+        task count and completed count, which is all the page needs before a
+        day is opened. The lead day also keeps its rows inline, since its
+        markup is rendered straight into index.html.
+
+        Chunk content is streamed through the hash rather than kept, and is
+        produced again by save_day_chunks() only for chunks not yet on disk.
+        With `inline`, every day keeps its rows and is pre-rendered, and no
+        chunks are produced.
+        """
+        tasks_by_day = group_by_day(task_data['tasks'])
+        lead_day = pick_lead_day(list(tasks_by_day))
+
+        chunks = []
+        for entry in payload['days']:
+            day, label, rows = entry
+            tasks = tasks_by_day[day]
+            filename = None
+            size = 0
+            if not inline:
+                digest = hashlib.sha256()
+                for piece in iter_chunk(rows, tasks):
+                    data = piece.encode('utf-8')
+                    digest.update(data)
+                    size += len(data)
+                filename = f"{CHUNK_PREFIX}{day or 'unscheduled'}.{digest.hexdigest()[:ASSET_HASH_LENGTH]}.json"
+
+            lead = inline or day == lead_day
+            completed = sum(1 for task in tasks if task.get('completed'))
+            entry[2:] = [filename, len(rows), completed]
+            if lead:
+                entry.append(rows)
+            chunks.append({
+                'filename': filename,
+                'rows': rows,
+                'tasks': tasks,
+                'size': size,
+                'label': label,
+                'task_count': len(rows),
+                'lead': lead,
+                'completed': completed
+            })
+        return chunks
+
+    def build_search(self, payload, chunks):
+        """Fingerprint the search index over all days and point the payload
+        at it; the page fetches it when search is first used."""
+        index = build_search_index([(chunk['rows'], chunk['tasks']) for chunk in chunks])
+        content = json.dumps(index, ensure_ascii=False, separators=(',', ':'))
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:ASSET_HASH_LENGTH]
+        search = {
+            'filename': f"{SEARCH_PREFIX}{digest}.json",
+            'content': content,
+            'report_name': f"{SEARCH_PREFIX}*.json ({len(index['tokens'])} tokens)"
+        }
+        payload['search'] = search['filename']
+        size = len(content.encode('utf-8'))
+        self.build_sizes[search['report_name']] = [size, size, None]
+        return search
+
+    def build_service_worker(self, assets, chunks, variants, search):
+        """List every content-hashed artifact in a fingerprinted precache
+        manifest and point the service worker at it.
+
+        The worker only changes when the manifest does, which is what makes
+        browsers install it again and fetch the new build.
+        """
+        files = [f"assets/{asset['filename']}" for asset in assets.values()]
+        files += [chunk['filename'] for chunk in chunks]
+        files.append(search['filename'])
+        pages = [variant['filename'] for variant in variants]
+        content = json.dumps({'files': files, 'pages': pages}, separators=(',', ':'))
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:ASSET_HASH_LENGTH]
+        manifest = {
+            'filename': f"{MANIFEST_PREFIX}{digest}.json",
+            'content': content
+        }
+        worker = compiled_template(SERVICE_WORKER).substitute(
+            manifest_url=manifest['filename'],
+            cache_version=digest
+        )
+        return manifest, self.minify(SERVICE_WORKER, worker)
+
+    def generate_html(self, payload, assets, chunks, page=None):
+        """Yield the page in pieces for save_html() to stream to disk.
+
+        `page` holds the title, navigation markup, slice hash and the
+        burn-down section (full plan only); the full plan's defaults are
+        used without it.
+        """
+        page = page or {}
+        completed = sum(chunk['completed'] for chunk in chunks)
+        total = sum(chunk['task_count'] for chunk in chunks)
+        progress = percentage(completed, total)
+
+        values = {
+            'page_title': page.get('title', PAGE_TITLE),
+            'plan_nav': page.get('nav', ''),
+            'slice_hash': page.get('slice', ''),
+            'burndown': page.get('burndown', ''),
+            'css_href': f"assets/{assets['css']['filename']}",
+            'js_src': f"assets/{assets['js']['filename']}",
+            'task_data': (piece.replace('</', '<\\/') for piece in iter_json_object(payload)),
+            'task_markup': self.iter_task_markup(chunks),
+            'total_boxes': sum(payload['totals'].values()),
+            'total_tasks': total,
+            'total_rooms': payload['room_count'],
+            'task_stats': f"{completed} of {total} tasks completed ({progress}%)",
+            'progress': progress
+        }
+
+        parts, _ = page_parts('index.html')
+        for literal, name in parts:
+            yield literal
+            if name is None:
+                continue
+            value = values[name]
+            if isinstance(value, (str, int)):
+                yield str(value)
+            else:
+                yield from value
+
+    def iter_task_markup(self, chunks):
+        if not chunks:
+            yield '<p style="color: var(--text-secondary);">No tasks available.</p>'
+        for index, chunk in enumerate(chunks):
+            content = iter_day_content(chunk['tasks']) if chunk['lead'] else None
+            yield from iter_day_shell(index, chunk['label'], chunk['task_count'], content)
+
+    def save_assets(self, assets):
+        os.makedirs(self.assets_dir, exist_ok=True)
+        current = set()
+
+        for kind, asset in assets.items():
+            asset_file = os.path.join(self.assets_dir, asset['filename'])
+            current.update([asset['filename'], asset['filename'] + '.gz'])
+            # Fingerprinted names only change with their content
+            if not os.path.exists(asset_file):
+                write_atomic(asset_file, asset['content'])
+                print(f"✅ Asset written: {asset_file}")
+            self.precompress(ASSET_SOURCES[kind], asset_file)
+
+        self.remove_stale(self.assets_dir, current,
+                          lambda filename: filename.split('.', 1)[0] in ASSET_STEMS)
+
+    def save_day_chunks(self, chunks):
+        os.makedirs(self.output_dir, exist_ok=True)
+        current = set()
+        # Chunks are already compact JSON, so they are reported as one line
+        report_name = f"{CHUNK_PREFIX}*.json ({len(chunks)} days)"
+        sizes = self.build_sizes.setdefault(report_name, [0, 0, None])
+
+        for chunk in chunks:
+            chunk_file = os.path.join(self.output_dir, chunk['filename'])
+            current.update([chunk['filename'], chunk['filename'] + '.gz'])
+            sizes[0] += chunk['size']
+            sizes[1] += chunk['size']
+            if not os.path.exists(chunk_file):
+                write_stream(chunk_file, iter_chunk(chunk['rows'], chunk['tasks']))
+                print(f"✅ Day chunk written: {chunk_file}")
+            self.precompress(report_name, chunk_file)
+
+        self.remove_stale(self.output_dir, current,
+                          lambda filename: filename.startswith(CHUNK_PREFIX))
+
+    def save_variants(self, variants, task_data, assets, links):
+        os.makedirs(self.output_dir, exist_ok=True)
+        report_name = f"{VARIANT_PREFIX}*.html ({len(variants)} pages)"
+        sizes = self.build_sizes.setdefault(report_name, [0, 0, 0])
+        _, saved = page_parts('index.html')
+        current = set()
+        skipped = 0
+
+        if variants:
+            asset_names = {kind: {'filename': asset['filename']} for kind, asset in assets.items()}
+            workers = min(len(variants), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_variant_worker,
+                                     initargs=(self.output_dir, task_data, asset_names, links)) as pool:
+                for variant, (status, size, gzip_size) in zip(variants, pool.map(render_variant, variants)):
+                    current.update([variant['filename'], variant['filename'] + '.gz'])
+                    sizes[0] += size + saved
+                    sizes[1] += size
+                    sizes[2] += gzip_size
+                    if status == 'written':
+                        print(f"✅ Page variant written: {os.path.join(self.output_dir, variant['filename'])}")
+                    elif status == 'skipped':
+                        skipped += 1
+        if skipped:
+            print(f"✅ {skipped} page variants unchanged (same plan slice)")
+
+        self.remove_stale(self.output_dir, current,
+                          lambda filename: filename.startswith(VARIANT_PREFIX))
+
+    def save_search(self, search):
+        os.makedirs(self.output_dir, exist_ok=True)
+        search_file = os.path.join(self.output_dir, search['filename'])
+        if not os.path.exists(search_file):
+            write_atomic(search_file, search['content'])
+            print(f"✅ Search index written: {search_file}")
+        self.precompress(search['report_name'], search_file)
+        self.remove_stale(self.output_dir, {search['filename'], search['filename'] + '.gz'},
+                          lambda filename: filename.startswith(SEARCH_PREFIX))
+
+    def save_service_worker(self, manifest, worker):
+        os.makedirs(self.output_dir, exist_ok=True)
+        manifest_file = os.path.join(self.output_dir, manifest['filename'])
+        if not os.path.exists(manifest_file):
+            write_atomic(manifest_file, manifest['content'])
+            print(f"✅ Precache manifest written: {manifest_file}")
+        self.precompress(manifest['filename'], manifest_file)
+        self.remove_stale(self.output_dir, {manifest['filename'], manifest['filename'] + '.gz'},
+                          lambda filename: filename.startswith(MANIFEST_PREFIX))
+
+        worker_file = os.path.join(self.output_dir, SERVICE_WORKER)
+        if write_atomic(worker_file, worker):
+            print(f"✅ Service worker written: {worker_file}")
+        self.precompress(SERVICE_WORKER, worker_file)
+
+    def remove_stale(self, directory, current, is_build_artifact):
+        for filename in os.listdir(directory):
+            if filename not in current and is_build_artifact(filename):
+                os.remove(os.path.join(directory, filename))
+                print(f"🧹 Removed stale file: {filename}")
+
+    def save_html(self, pieces):
         os.makedirs(self.output_dir, exist_ok=True)
         output_file = os.path.join(self.output_dir, 'index.html')
 
-        with open(output_file, 'w') as f:
-            f.write(html)
-
-        print(f"✅ Static HTML generated: {output_file}")
+        written, size = write_stream(output_file, pieces)
+        _, saved = page_parts('index.html')
+        self.build_sizes['index.html'] = [size + saved, size, None]
+        if written:
+            print(f"✅ Static HTML generated: {output_file}")
+        else:
+            print(f"✅ Static HTML unchanged: {output_file}")
+        self.precompress('index.html', output_file)
         return output_file
 
 
@@ -659,11 +500,41 @@ def main():
     print(f"✅ Loaded {len(task_data['tasks'])} tasks")
     print()
 
+    try:
+        generator.load_templates()
+    except ConfigError as e:
+        print("❌ Invalid configuration:")
+        for error in e.errors:
+            print(f"   - {error}")
+        sys.exit(1)
+
     print("🎨 Generating HTML...")
-    html = generator.generate_html(task_data)
+    assets = generator.build_assets()
+    payload = generator.build_payload(task_data)
+    chunks = generator.build_day_chunks(payload, task_data)
+    search = generator.build_search(payload, chunks)
+    variants = generator.plan_variants(task_data)
+    links = generator.plan_links(variants)
+    analytics = BurndownAnalytics(generator.data_dir).update(task_data)
+    page = {
+        'title': PAGE_TITLE,
+        'nav': render_plan_nav(links, './'),
+        'slice': generator.slice_hash(task_data, assets, PAGE_TITLE, links),
+        'burndown': render_burndown(analytics)
+    }
+    html = generator.generate_html(payload, assets, chunks, page)
+    manifest, worker = generator.build_service_worker(assets, chunks, variants, search)
 
     print("💾 Saving to /docs...")
+    generator.save_assets(assets)
+    generator.save_day_chunks(chunks)
+    generator.save_search(search)
+    generator.save_service_worker(manifest, worker)
     output_path = generator.save_html(html)
+    print("🧩 Rendering per-assignee and per-day pages...")
+    generator.save_variants(variants, task_data, assets, links)
+    print()
+    generator.print_size_report()
 
     print()
     print("=" * 60)
@@ -673,7 +544,7 @@ def main():
     print(f"📄 Static HTML created at: {output_path}")
     print()
     print("Next steps:")
-    print("  1. Open docs/index.html in your browser to test")
+    print("  1. Serve docs/ locally to test: python3 -m http.server --directory docs")
     print("  2. Commit and push to GitHub")
     print("  3. GitHub Pages will auto-update")
     print()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Box Label Sheets
+Renders a printable label for every box in the plan's box index: the box
+ID as text and as a Code 39 barcode, room and category, size, handling
+markers and the destination room.
+
+Labels are laid out ten to a US Letter sheet (2 x 5 labels of 4" x 2",
+the common shipping label size) as one HTML file with an inline SVG per
+label, or as one SVG file per sheet. Boxes are generated one at a time and
+each sheet is written before the next is rendered, so the number of boxes
+does not change how much is held in memory.
+"""
+
+import argparse
+import json
+import os
+import sys
+from html import escape
+from itertools import chain, islice
+from atomic_io import write_stream
+
+LABEL_COLUMNS = 2
+LABEL_ROWS = 5
+LABELS_PER_SHEET = LABEL_COLUMNS * LABEL_ROWS
+# Label and sheet geometry in points (1/72 in)
+LABEL_WIDTH = 288
+LABEL_HEIGHT = 144
+SHEET_WIDTH = 612
+SHEET_HEIGHT = 792
+SHEET_MARGIN_X = (SHEET_WIDTH - LABEL_COLUMNS * LABEL_WIDTH) / 2
+SHEET_MARGIN_Y = (SHEET_HEIGHT - LABEL_ROWS * LABEL_HEIGHT) / 2
+
+# Code 39: five bars and four spaces per character, alternating from a bar;
+# 'w' marks a wide element. '*' is the start/stop character.
+CODE39 = {
+    '0': 'nnnwwnwnn', '1': 'wnnwnnnnw', '2': 'nnwwnnnnw', '3': 'wnwwnnnnn',
+    '4': 'nnnwwnnnw', '5': 'wnnwwnnnn', '6': 'nnwwwnnnn', '7': 'nnnwnnwnw',
+    '8': 'wnnwnnwnn', '9': 'nnwwnnwnn', 'A': 'wnnnnwnnw', 'B': 'nnwnnwnnw',
+    'C': 'wnwnnwnnn', 'D': 'nnnnwwnnw', 'E': 'wnnnwwnnn', 'F': 'nnwnwwnnn',
+    'G': 'nnnnnwwnw', 'H': 'wnnnnwwnn', 'I': 'nnwnnwwnn', 'J': 'nnnnwwwnn',
+    'K': 'wnnnnnnww', 'L': 'nnwnnnnww', 'M': 'wnwnnnnwn', 'N': 'nnnnwnnww',
+    'O': 'wnnnwnnwn', 'P': 'nnwnwnnwn', 'Q': 'nnnnnnwww', 'R': 'wnnnnnwwn',
+    'S': 'nnwnnnwwn', 'T': 'nnnnwnwwn', 'U': 'wwnnnnnnw', 'V': 'nwwnnnnnw',
+    'W': 'wwwnnnnnn', 'X': 'nwnnwnnnw', 'Y': 'wwnnwnnnn', 'Z': 'nwwnwnnnn',
+    '-': 'nwnnnnwnw', '.': 'wwnnnnwnn', ' ': 'nwwnnnwnn', '*': 'nwnnwnwnn'
+}
+NARROW = 1
+WIDE = 2.5
+QUIET_ZONE = 10
+
+HTML_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<title>Box labels</title>
+<style>
+@page { size: letter; margin: 0; }
+body { margin: 0; }
+.sheet { width: 8.5in; height: 11in; page-break-after: always; }
+.sheet svg { display: block; width: 8.5in; height: 11in; }
+</style>
+</head>
+<body>
+"""
+HTML_TAIL = "</body>\n</html>\n"
+
+
+def code39_bars(text):
+    """Returns (bars, width): bars as (x, width) in narrow-bar units,
+    including the start/stop characters and quiet zones."""
+    bars = []
+    x = QUIET_ZONE
+    for char in f"*{text}*":
+        for index, element in enumerate(CODE39[char]):
+            width = WIDE if element == 'w' else NARROW
+            if index % 2 == 0:
+                bars.append((x, width))
+            x += width
+        x += NARROW  # gap between characters
+    return bars, x - NARROW + QUIET_ZONE
+
+
+def box_id(prefix, number):
+    return f"{prefix}-{number:03d}"
+
+
+def iter_boxes(boxes, only=None):
+    """Yield (box ID, number, box entry) for every box of the index."""
+    for prefix, box in boxes.items():
+        if only and not prefix.startswith(only):
+            continue
+        for number in range(1, box['count'] + 1):
+            yield box_id(prefix, number), number, box
+
+
+def render_barcode(text, x, y, width, height):
+    bars, units = code39_bars(text)
+    scale = width / units
+    rects = ''.join(
+        f'<rect x="{x + bar_x * scale:.2f}" y="{y}" width="{bar_width * scale:.2f}" height="{height}"/>'
+        for bar_x, bar_width in bars
+    )
+    return f'<g fill="#000">{rects}</g>'
+
+
+def render_label(label_id, number, box, x, y):
+    markers = [marker for marker, flag in (('FRAGILE', box['fragile']), ('HEAVY', box['heavy'])) if flag]
+    text = [
+        f'<text x="12" y="26" font-size="20" font-weight="bold">{escape(label_id)}</text>',
+        f'<text x="{LABEL_WIDTH - 12}" y="26" font-size="11" text-anchor="end">'
+        f'{number} of {box["count"]} · {escape(box["box_type"])}</text>',
+        f'<text x="12" y="46" font-size="12">{escape(box["room"])} › {escape(box["category"])}</text>',
+        f'<text x="12" y="64" font-size="12">To: <tspan font-weight="bold">'
+        f'{escape(box["destination"])}</tspan></text>'
+    ]
+    if markers:
+        text.append(f'<text x="{LABEL_WIDTH - 12}" y="64" font-size="12" font-weight="bold"'
+                    f' text-anchor="end" fill="#b91c1c">{" · ".join(markers)}</text>')
+    return (
+        f'<g transform="translate({x:.2f} {y:.2f})" font-family="Helvetica, Arial, sans-serif">'
+        f'<rect width="{LABEL_WIDTH}" height="{LABEL_HEIGHT}" fill="none" stroke="#ccc" stroke-width="0.5"/>'
+        f'{"".join(text)}'
+        f'{render_barcode(label_id, 12, 76, LABEL_WIDTH - 24, 56)}'
+        '</g>'
+    )
+
+
+def render_sheet(labels):
+    """One sheet's SVG for up to LABELS_PER_SHEET (box ID, number, box)."""
+    pieces = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {SHEET_WIDTH} {SHEET_HEIGHT}"'
+        f' width="{SHEET_WIDTH}pt" height="{SHEET_HEIGHT}pt">'
+    ]
+    for index, (label_id, number, box) in enumerate(labels):
+        row, column = divmod(index, LABEL_COLUMNS)
+        x = SHEET_MARGIN_X + column * LABEL_WIDTH
+        y = SHEET_MARGIN_Y + row * LABEL_HEIGHT
+        pieces.append(render_label(label_id, number, box, x, y))
+    pieces.append('</svg>')
+    return ''.join(pieces)
+
+
+def iter_sheets(boxes):
+    """Yield one rendered sheet at a time."""
+    while True:
+        labels = list(islice(boxes, LABELS_PER_SHEET))
+        if not labels:
+            return
+        yield render_sheet(labels)
+
+
+class LabelSheetGenerator:
+    def __init__(self, output_dir=None):
+        self.data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
+        self.output_dir = output_dir or os.path.join(self.data_dir, 'labels')
+
+    def load_boxes(self):
+        task_file = os.path.join(self.data_dir, 'generated_tasks.json')
+        with open(task_file, 'r') as f:
+            return json.load(f).get('boxes', {})
+
+    def iter_html(self, sheets, counter):
+        yield HTML_HEAD
+        for sheet in sheets:
+            counter[0] += 1
+            yield f'<section class="sheet">{sheet}</section>\n'
+        yield HTML_TAIL
+
+    def save_html(self, boxes):
+        """Returns (path, sheet count)."""
+        path = os.path.join(self.output_dir, 'labels.html')
+        counter = [0]
+        write_stream(path, self.iter_html(iter_sheets(boxes), counter))
+        return path, counter[0]
+
+    def save_svg(self, boxes):
+        """One labels-NNN.svg per sheet. Returns (first path, sheet count)."""
+        first = None
+        count = 0
+        for count, sheet in enumerate(iter_sheets(boxes), 1):
+            path = os.path.join(self.output_dir, f"labels-{count:03d}.svg")
+            write_stream(path, [sheet])
+            first = first or path
+        self.remove_stale_sheets(count)
+        return first, count
+
+    def remove_stale_sheets(self, count):
+        for name in os.listdir(self.output_dir):
+            stem, ext = os.path.splitext(name)
+            if ext == '.svg' and stem.startswith('labels-') and stem[7:].isdigit() and int(stem[7:]) > count:
+                os.remove(os.path.join(self.output_dir, name))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render printable box label sheets.")
+    parser.add_argument('--format', choices=['html', 'svg'], default='html')
+    parser.add_argument('--output', help="output directory (default: data/labels)")
+    parser.add_argument('--only', metavar='PREFIX', help="only boxes whose ID starts with PREFIX, e.g. KIT")
+    args = parser.parse_args()
+
+    generator = LabelSheetGenerator(args.output)
+    print("📂 Loading box index...")
+    boxes = generator.load_boxes()
+    if not boxes:
+        print("⚠️  No boxes found. Run rebuild_planner.py first!")
+        sys.exit(1)
+
+    only = args.only.upper() if args.only else None
+    labels = iter_boxes(boxes, only)
+    first = next(labels, None)
+    if first is None:
+        # Leave the sheets from the last run as they are
+        print(f"⚠️  No box IDs start with {only}." if only else "⚠️  No boxes to label.")
+        sys.exit(1)
+
+    os.makedirs(generator.output_dir, exist_ok=True)
+    print(f"🏷️  Rendering {args.format.upper()} label sheets...")
+    save = generator.save_html if args.format == 'html' else generator.save_svg
+    path, sheets = save(chain([first], labels))
+    print(f"✅ {sheets} sheets written: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Progress Merge
+Combines the progress logs exported from each device's planner page into
+data/progress.json, which the task generator applies on the next rebuild.
+
+A log lists operations as [task id, field, value, timestamp], field being
+'c' (completed) or 'a' (assignee). A field set back to the plan is exported
+with the value the device showed; only logs from older pages carry a null
+value for it, which the rebuild skips. For every task and field the latest
+timestamp wins; equal timestamps are settled by the value itself, so the
+result does not depend on the order the logs are given in. Merging is a
+single pass over all operations, and the merged file is itself a log, so it
+can be merged again with newer exports.
+"""
+
+import argparse
+import json
+import os
+import sys
+from atomic_io import write_json_atomic
+
+LOG_FORMAT = 'moving-planner-progress'
+LOG_VERSION = 1
+PROGRESS_FILE = 'progress.json'
+FIELD_TYPES = {
+    'c': bool,
+    'a': str
+}
+
+
+class ProgressLogError(ValueError):
+    pass
+
+
+def read_log(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            log = json.load(f)
+    except json.JSONDecodeError as e:
+        raise ProgressLogError(f"{path}: invalid JSON ({e})")
+    if not isinstance(log, dict) or log.get('format') != LOG_FORMAT:
+        raise ProgressLogError(f"{path}: not a planner progress log")
+    if log.get('version') != LOG_VERSION:
+        raise ProgressLogError(f"{path}: unsupported log version {log.get('version')}")
+    return log
+
+
+def check_op(op, path):
+    if not isinstance(op, list) or len(op) != 4:
+        raise ProgressLogError(f"{path}: malformed operation {op!r}")
+    task_id, field, value, timestamp = op
+    if not isinstance(task_id, str) or field not in FIELD_TYPES:
+        raise ProgressLogError(f"{path}: malformed operation {op!r}")
+    if value is not None and not isinstance(value, FIELD_TYPES[field]):
+        raise ProgressLogError(f"{path}: wrong value type in {op!r}")
+    if not isinstance(timestamp, (int, float)) or isinstance(timestamp, bool):
+        raise ProgressLogError(f"{path}: wrong timestamp in {op!r}")
+
+
+def merge_logs(logs):
+    """`logs` is a list of (path, log). Returns the merged log."""
+    winners = {}
+    devices = {}
+    for path, log in logs:
+        for op in log.get('ops', []):
+            check_op(op, path)
+            task_id, field, value, timestamp = op
+            rank = (timestamp, json.dumps(value))
+            current = winners.get((task_id, field))
+            if current is None or rank > current[0]:
+                winners[(task_id, field)] = (rank, op)
+
+        # The merged file carries the devices of every log it includes
+        exported = log.get('devices') or {log.get('device'): log.get('exported_at')}
+        for device, exported_at in exported.items():
+            if device and exported_at and exported_at > devices.get(device, 0):
+                devices[device] = exported_at
+
+    return {
+        'format': LOG_FORMAT,
+        'version': LOG_VERSION,
+        'devices': dict(sorted(devices.items())),
+        # Sorted so the file only changes when the merged state does
+        'ops': [op for _, (_, op) in sorted(winners.items())]
+    }
+
+
+def load_progress(data_dir):
+    """The merged progress in data/, or None when nothing was merged yet."""
+    path = os.path.join(data_dir, PROGRESS_FILE)
+    if not os.path.exists(path):
+        return None
+    return read_log(path)
+
+
+def plan_has_unpacking(data_dir):
+    """Whether generated_tasks.json was built with --unpacking, so a
+    rebuild keeps those tasks (and the progress merged on them)."""
+    try:
+        with open(os.path.join(data_dir, 'generated_tasks.json'), 'r') as f:
+            return 'unpack' in json.load(f).get('task_counts', {})
+    except (OSError, ValueError):
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge progress logs exported from the planner page.")
+    parser.add_argument('logs', nargs='+', help="progress-*.json files exported from each device")
+    parser.add_argument('--fresh', action='store_true',
+                        help="ignore the previously merged data/progress.json")
+    parser.add_argument('--rebuild', action='store_true',
+                        help="regenerate the tasks and the static site afterwards")
+    parser.add_argument('--unpacking', action='store_true',
+                        help="rebuild with the unpacking tasks (default: as the current plan was built)")
+    args = parser.parse_args()
+
+    data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
+    progress_path = os.path.join(data_dir, PROGRESS_FILE)
+
+    print(f"📂 Reading {len(args.logs)} progress logs...")
+    try:
+        logs = [(path, read_log(path)) for path in args.logs]
+        if not args.fresh:
+            previous = load_progress(data_dir)
+            if previous is not None:
+                logs.insert(0, (progress_path, previous))
+        merged = merge_logs(logs)
+    except (OSError, ProgressLogError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    op_count = sum(len(log.get('ops', [])) for _, log in logs)
+    if write_json_atomic(progress_path, merged, ignore_volatile=False, indent=None, separators=(',', ':')):
+        print(f"✅ Merged {op_count} operations into {len(merged['ops'])}: {progress_path}")
+    else:
+        print(f"✅ Progress unchanged: {progress_path}")
+
+    if args.rebuild:
+        import generate_static
+        import rebuild_planner
+        unpacking = args.unpacking or plan_has_unpacking(data_dir)
+        if unpacking and not args.unpacking:
+            print("📦 The current plan includes unpacking; rebuilding with --unpacking")
+        rebuild_planner.main(['--unpacking'] if unpacking else [])
+        generate_static.main()
+    else:
+        print("💡 Run rebuild_planner.py and generate_static.py to apply it to the plan")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Page Markup
+Pre-renders the day, room, category and task markup of the static page.
+
+The structure (class names and data attributes) is what planner.js
+hydrates, so any change here must be mirrored in hydrateDay(),
+createCategoryGroup() and createTaskRow().
+
+Rooms with many tasks, and every room once a day's pre-rendered rows
+exceed a budget, are emitted as empty "virtual" rooms: the page renders
+only the rows scrolled into view. Room headers always carry their task
+and completion counts, so the page never has to count rows itself.
+"""
+
+from html import escape
+
+PEOPLE = [('Andie', 'badge-success'), ('Brad', 'badge-primary')]
+VIRTUAL_ROOM_THRESHOLD = 60
+DAY_PRERENDER_LIMIT = 400
+
+
+def group_by_day(tasks):
+    days = {}
+    for task in tasks:
+        days.setdefault(task.get('day'), []).append(task)
+    return days
+
+
+def pick_lead_day(day_keys):
+    """The day pre-rendered into the page: the first scheduled day, so the
+    page only changes with the plan. pickCurrentDay() in planner.js picks
+    the day to show on load and loads its chunk when it is another one."""
+    scheduled = [day for day in day_keys if day]
+    if scheduled:
+        return scheduled[0]
+    return day_keys[0] if day_keys else None
+
+
+def percentage(completed, total):
+    # Rounds half up like Math.round(), so hydration never changes the text
+    return int(completed * 100 / total + 0.5) if total else 0
+
+
+def format_progress(completed, total):
+    return f"({completed}/{total} - {percentage(completed, total)}%)"
+
+
+def render_task(task):
+    completed = task.get('completed', False)
+    options = ''.join(
+        f'<option value="{person}"{" selected" if task["assignee"] == person else ""}>{person}</option>'
+        for person, _ in PEOPLE
+    )
+    return (
+        f'<div class="task-item{" completed" if completed else ""}" data-task-id="{escape(task["id"])}">'
+        f'<input type="checkbox" autocomplete="off"{" checked" if completed else ""}>'
+        f'<div class="task-text">{escape(task["icon"])} {escape(task["description"])}</div>'
+        f'<select class="task-assignee-select" autocomplete="off">{options}</select>'
+        '</div>'
+    )
+
+
+def render_category_group(category, tasks):
+    rows = ''.join(render_task(task) for task in sorted(tasks, key=lambda t: t.get('order', 0)))
+    return (
+        f'<div class="category-group" data-category="{escape(category)}">'
+        f'<div class="category-header">{escape(category)}</div>{rows}</div>'
+    )
+
+
+def render_room(room, tasks, virtual=False):
+    categories = {}
+    for task in tasks:
+        categories.setdefault(task['category'], []).append(task)
+
+    columns = []
+    for person, badge in PEOPLE:
+        groups = []
+        if virtual:
+            groups.append('<div class="virtual-viewport"><div class="virtual-spacer"></div></div>')
+        else:
+            for category, cat_tasks in categories.items():
+                person_tasks = [t for t in cat_tasks if t['assignee'] == person]
+                if person_tasks:
+                    groups.append(render_category_group(category, person_tasks))
+        columns.append(
+            f'<div class="person-column" data-assignee="{person}">'
+            f'<div class="person-column-header"><span class="badge {badge}">{person}</span></div>'
+            f'{"".join(groups)}</div>'
+        )
+
+    completed = sum(1 for task in tasks if task.get('completed'))
+    return (
+        f'<div class="room-section{" virtual" if virtual else ""}" data-room="{escape(room)}"'
+        f' data-total="{len(tasks)}" data-completed="{completed}">'
+        '<div class="room-header"><div class="room-title-row">'
+        f'<span class="room-title">{escape(room)}</span>'
+        f'<span class="room-progress">{format_progress(completed, len(tasks))}</span>'
+        '</div><div class="room-icon">▼</div></div>'
+        f'<div class="room-content"><div class="room-columns">{"".join(columns)}</div></div>'
+        '</div>'
+    )
+
+
+def render_plan_nav(links, current):
+    """Links between the full plan and its per-assignee and per-day pages.
+    `links` is a list of (href, label)."""
+    items = []
+    for href, label in links:
+        attributes = ' aria-current="page"' if href == current else ''
+        items.append(f'<a href="{escape(href)}"{attributes}>{escape(label)}</a>')
+    return ''.join(items)
+
+
+def iter_day_content(tasks):
+    """Yield a day's room sections one at a time, so callers can stream
+    them to a file instead of joining the whole day."""
+    rooms = {}
+    for task in tasks:
+        rooms.setdefault(task['room'], []).append(task)
+
+    prerendered = 0
+    for room, room_tasks in rooms.items():
+        virtual = (len(room_tasks) > VIRTUAL_ROOM_THRESHOLD
+                   or prerendered + len(room_tasks) > DAY_PRERENDER_LIMIT)
+        if not virtual:
+            prerendered += len(room_tasks)
+        yield render_room(room, room_tasks, virtual)
+
+
+def iter_day_shell(index, label, task_count, content=None):
+    """Yield the day wrapper around `content` (an iterable of markup), or
+    a collapsed, empty shell when there is none."""
+    collapsed = '' if content is not None else ' collapsed'
+    yield (
+        f'<div class="day-tasks{collapsed}" data-day="{index}">'
+        f'<div class="day-header-bar"><span>{escape(label)}</span>'
+        f'<span class="day-count">{task_count} tasks</span></div>'
+        '<div class="day-content">'
+    )
+    if content is not None:
+        yield from content
+    yield '</div></div>'
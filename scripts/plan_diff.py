@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Plan Diff
+Shows what changed between two plans: added and removed tasks, and
+changed ones (box counts, days, assignees, ...), grouped by day and room.
+
+Plans are joined on task id: the old plan is indexed by id once, the new
+plan is walked once against that index, and whatever was not matched was
+removed. Grouping is a dict append per task, so the diff stays linear in
+the number of tasks however large the plans get.
+
+A plan is a JSON file, a revision of the plan history (`12` or `r12`) or
+`current` (data/generated_tasks.json). By default the two latest history
+revisions are compared.
+"""
+
+import argparse
+import json
+import os
+import sys
+from plan_history import PlanHistory
+
+UNSCHEDULED_LABEL = 'Unscheduled'
+# Shown through another field: the task line itself, or the day
+DERIVED_FIELDS = {'description', 'day_label'}
+
+
+def compare_plans(old_plan, new_plan):
+    """Returns {'added': [task], 'removed': [task], 'changed': [(old task,
+    new task, [changed fields])]}, in plan order."""
+    old_tasks = {task['id']: task for task in old_plan.get('tasks', [])}
+    added = []
+    changed = []
+    seen = set()
+    for task in new_plan.get('tasks', []):
+        old = old_tasks.get(task['id'])
+        if old is None:
+            added.append(task)
+            continue
+        seen.add(task['id'])
+        if old == task:
+            continue
+        fields = [field for field in task.keys() | old.keys() if old.get(field) != task.get(field)]
+        changed.append((old, task, sorted(fields)))
+    removed = [task for task_id, task in old_tasks.items() if task_id not in seen]
+    return {'added': added, 'removed': removed, 'changed': changed}
+
+
+def day_key(task):
+    return task.get('day') or '', task.get('day_label') or UNSCHEDULED_LABEL
+
+
+def group_changes(diff):
+    """{(day, day label): {room: [(mark, task, fields)]}}, changed tasks
+    under their new day."""
+    groups = {}
+    entries = [('+', task, None) for task in diff['added']]
+    entries += [('-', task, None) for task in diff['removed']]
+    entries += [('~', task, fields) for _, task, fields in diff['changed']]
+    for mark, task, fields in entries:
+        groups.setdefault(day_key(task), {}).setdefault(task['room'], []).append((mark, task, fields))
+    return groups
+
+
+def summarize_changes(diff):
+    """Counts of the kinds of change reviewers usually look for."""
+    counts = {'added': len(diff['added']), 'removed': len(diff['removed']), 'changed': len(diff['changed'])}
+    for label, field in [('moved', 'day'), ('reassigned', 'assignee'), ('resized', 'box_count')]:
+        counts[label] = sum(1 for _, _, fields in diff['changed'] if field in fields)
+    return counts
+
+
+def format_value(task, field):
+    if field == 'day':
+        return task.get('day_label') or UNSCHEDULED_LABEL
+    return task.get(field)
+
+
+def describe_change(old, new, fields):
+    shown = [field for field in fields if field not in DERIVED_FIELDS] or fields
+    return ', '.join(f"{field} {format_value(old, field)} → {format_value(new, field)}"
+                     if field != 'description' else 'description' for field in shown)
+
+
+def load_plan(spec, history):
+    """A plan from a file path, `current`, or a history revision."""
+    name = spec
+    if spec == 'current':
+        spec = os.path.join(history.data_dir, 'generated_tasks.json')
+    elif not os.path.exists(spec) and spec.lstrip('r').isdigit():
+        revision = int(spec.lstrip('r'))
+        return f"r{revision}", history.load(revision)
+    with open(spec, 'r', encoding='utf-8') as f:
+        return name, json.load(f)
+
+
+def print_diff(old_name, new_name, old_plan, new_plan, diff, summary_only=False):
+    counts = summarize_changes(diff)
+    print(f"\n📊 PLAN DIFF: {old_name} → {new_name}")
+    print(f"   {len(old_plan.get('tasks', []))} → {len(new_plan.get('tasks', []))} tasks:"
+          f" +{counts['added']} added, -{counts['removed']} removed, ~{counts['changed']} changed"
+          f" ({counts['moved']} moved, {counts['reassigned']} reassigned, {counts['resized']} resized)")
+
+    old_totals = old_plan.get('totals', {}).get('with_buffer', {})
+    new_totals = new_plan.get('totals', {}).get('with_buffer', {})
+    for box_type in dict.fromkeys(list(old_totals) + list(new_totals)):
+        if old_totals.get(box_type, 0) != new_totals.get(box_type, 0):
+            print(f"   {box_type.capitalize()} boxes: {old_totals.get(box_type, 0)} → {new_totals.get(box_type, 0)}")
+    if summary_only:
+        return
+
+    old_tasks = {old['id']: old for old, _, _ in diff['changed']}
+    for (_, label), rooms in sorted(group_changes(diff).items(), key=lambda item: (item[0][0] == '', item[0])):
+        print(f"\n{label}")
+        print("─" * 60)
+        for room, entries in rooms.items():
+            print(f"  {room}")
+            for mark, task, fields in entries:
+                line = f"    {mark} {task['icon']} {task['description']}"
+                if fields:
+                    line += f"  [{describe_change(old_tasks[task['id']], task, fields)}]"
+                print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show what changed between two plans.")
+    parser.add_argument('old', nargs='?', help="plan file, history revision (e.g. r12) or 'current'")
+    parser.add_argument('new', nargs='?', default='current', help="as OLD (default: current)")
+    parser.add_argument('--summary', action='store_true', help="only print the counts")
+    args = parser.parse_args()
+
+    history = PlanHistory()
+    old_spec, new_spec = args.old, args.new
+    if old_spec is None:
+        latest = history.latest_revision()
+        if latest < 2:
+            print("⚠️  Fewer than two plan revisions in the history. Give two plans to compare.")
+            sys.exit(1)
+        old_spec, new_spec = f"r{latest - 1}", f"r{latest}"
+
+    try:
+        old_name, old_plan = load_plan(old_spec, history)
+        new_name, new_plan = load_plan(new_spec, history)
+    except (OSError, ValueError) as e:
+        # HistoryError and JSON errors are ValueErrors
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    diff = compare_plans(old_plan, new_plan)
+    if not any(diff.values()):
+        print(f"✅ No task changes between {old_name} and {new_name}")
+        return
+    print_diff(old_name, new_name, old_plan, new_plan, diff, args.summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Plan History
+Keeps every generated plan in data/history/ so any earlier revision can be
+rebuilt, e.g. to compare it with the current one.
+
+Revisions are stored in segments of CHECKPOINT_INTERVAL, one JSON line per
+revision. A segment starts with a checkpoint (the full plan); every later
+line is a delta against the revision before it, keyed by task id: the
+tasks that are new or changed shape in full, single changed fields for the
+rest, the task order as runs of the previous order, and the other top-level
+keys that changed. Rebuilding a revision reads one segment and applies at
+most CHECKPOINT_INTERVAL - 1 deltas. A rebuild that changes nothing but
+the timestamp is not recorded.
+"""
+
+import argparse
+import json
+import os
+import sys
+from atomic_io import write_atomic, write_json_atomic
+
+HISTORY_DIR = 'history'
+CHECKPOINT_INTERVAL = 50
+SEGMENT_PREFIX = 'plans-'
+SEGMENT_SUFFIX = '.jsonl'
+VOLATILE_KEYS = ('generated_at',)
+
+
+class HistoryError(ValueError):
+    pass
+
+
+def segment_name(index):
+    return f"{SEGMENT_PREFIX}{index:04d}{SEGMENT_SUFFIX}"
+
+
+def summarize(plan):
+    tasks = plan.get('tasks', [])
+    return {
+        'generated_at': plan.get('generated_at'),
+        'tasks': len(tasks),
+        'completed': sum(1 for task in tasks if task.get('completed')),
+        'boxes': sum(plan.get('totals', {}).get('with_buffer', {}).values())
+    }
+
+
+def encode_order(previous_ids, ids):
+    """The order of `ids` as runs [start, length] of `previous_ids`, with
+    ids that are not in it as plain strings."""
+    position = {task_id: index for index, task_id in enumerate(previous_ids)}
+    runs = []
+    for task_id in ids:
+        index = position.get(task_id)
+        if index is None:
+            runs.append(task_id)
+        elif runs and isinstance(runs[-1], list) and sum(runs[-1]) == index:
+            runs[-1][1] += 1
+        else:
+            runs.append([index, 1])
+    return runs
+
+
+def decode_order(previous_ids, runs):
+    ids = []
+    for run in runs:
+        if isinstance(run, str):
+            ids.append(run)
+        else:
+            ids.extend(previous_ids[run[0]:run[0] + run[1]])
+    return ids
+
+
+def diff_plans(previous, plan):
+    """Delta turning `previous` into `plan`, or None when only volatile
+    keys differ."""
+    delta = {}
+    if list(plan.keys()) != list(previous.keys()):
+        delta['keys'] = list(plan.keys())
+    changed = {key: value for key, value in plan.items()
+               if key != 'tasks' and (key not in previous or previous[key] != value)}
+    if changed:
+        delta['set'] = changed
+
+    previous_tasks = {task['id']: task for task in previous.get('tasks', [])}
+    put = []
+    change = {}
+    for task in plan.get('tasks', []):
+        old = previous_tasks.get(task['id'])
+        if old == task:
+            continue
+        if old is None or list(old.keys()) != list(task.keys()):
+            # New, or fields added/removed: store it whole to keep key order
+            put.append(task)
+        else:
+            change[task['id']] = {field: value for field, value in task.items() if old[field] != value}
+
+    tasks = {}
+    if put:
+        tasks['put'] = put
+    if change:
+        tasks['change'] = change
+    previous_ids = list(previous_tasks)
+    ids = [task['id'] for task in plan.get('tasks', [])]
+    if ids != previous_ids:
+        tasks['order'] = encode_order(previous_ids, ids)
+    if tasks:
+        delta['tasks'] = tasks
+
+    if not tasks and 'keys' not in delta and set(changed) <= set(VOLATILE_KEYS):
+        return None
+    return delta
+
+
+def apply_delta(previous, delta):
+    """The plan after `delta`. Unchanged tasks are shared with `previous`."""
+    tasks = {task['id']: task for task in previous.get('tasks', [])}
+    task_delta = delta.get('tasks', {})
+    for task_id, fields in task_delta.get('change', {}).items():
+        tasks[task_id] = dict(tasks[task_id], **fields)
+    for task in task_delta.get('put', []):
+        tasks[task['id']] = task
+
+    ids = list(tasks) if 'order' not in task_delta else decode_order(
+        [task['id'] for task in previous.get('tasks', [])], task_delta['order'])
+    changed = delta.get('set', {})
+    plan = {}
+    for key in delta.get('keys', previous.keys()):
+        if key == 'tasks':
+            plan[key] = [tasks[task_id] for task_id in ids]
+        else:
+            plan[key] = changed[key] if key in changed else previous[key]
+    return plan
+
+
+def replay(lines):
+    """The plan of the last of `lines`, which start at a checkpoint."""
+    plan = lines[0]['plan']
+    for line in lines[1:]:
+        plan = apply_delta(plan, line['delta'])
+    return plan
+
+
+class PlanHistory:
+    def __init__(self, data_dir=None):
+        self.data_dir = data_dir or os.path.join(os.path.dirname(__file__), '..', 'data')
+        self.history_dir = os.path.join(self.data_dir, HISTORY_DIR)
+
+    def segments(self):
+        if not os.path.isdir(self.history_dir):
+            return []
+        indexes = []
+        for name in os.listdir(self.history_dir):
+            stem = name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX) and stem.isdigit():
+                indexes.append(int(stem))
+        return sorted(indexes)
+
+    def read_segment(self, index):
+        path = os.path.join(self.history_dir, segment_name(index))
+        with open(path, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def revisions(self):
+        """Yield (revision, summary) from oldest to newest."""
+        for index in self.segments():
+            for line in self.read_segment(index):
+                yield line['rev'], line['summary']
+
+    def latest_revision(self):
+        segments = self.segments()
+        if not segments:
+            return 0
+        return segments[-1] * CHECKPOINT_INTERVAL + len(self.read_segment(segments[-1]))
+
+    def load(self, revision=None):
+        """The plan as of `revision` (1-based, the latest by default)."""
+        latest = self.latest_revision()
+        revision = revision or latest
+        if not 1 <= revision <= latest:
+            raise HistoryError(f"No revision {revision} (history has {latest})")
+        index, offset = divmod(revision - 1, CHECKPOINT_INTERVAL)
+        return replay(self.read_segment(index)[:offset + 1])
+
+    def record(self, plan):
+        """Append `plan` as a new revision. Returns its number, or None when
+        it matches the latest revision."""
+        # Compare and store the plan as it reads back from JSON
+        plan = json.loads(json.dumps(plan))
+        segments = self.segments()
+        index = segments[-1] if segments else 0
+        lines = self.read_segment(index) if segments else []
+        revision = index * CHECKPOINT_INTERVAL + len(lines) + 1
+
+        line = {'rev': revision, 'summary': summarize(plan)}
+        if lines:
+            delta = diff_plans(replay(lines), plan)
+            if delta is None:
+                return None
+            if len(lines) < CHECKPOINT_INTERVAL:
+                line['delta'] = delta
+            else:
+                index += 1
+                lines = []
+        if not lines:
+            line['plan'] = plan
+        lines.append(line)
+
+        os.makedirs(self.history_dir, exist_ok=True)
+        content = ''.join(json.dumps(entry, separators=(',', ':')) + '\n' for entry in lines)
+        write_atomic(os.path.join(self.history_dir, segment_name(index)), content)
+        return revision
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List or rebuild earlier revisions of the plan.")
+    parser.add_argument('revision', nargs='?', type=int, help="revision to rebuild (lists revisions when omitted)")
+    parser.add_argument('--output', help="write the rebuilt plan here instead of printing it")
+    parser.add_argument('--restore', action='store_true',
+                        help="make the revision the current plan (data/generated_tasks.json)")
+    args = parser.parse_args()
+
+    history = PlanHistory()
+    if args.revision is None:
+        revisions = list(history.revisions())
+        if not revisions:
+            print("⚠️  No plan history yet. Run rebuild_planner.py first!")
+            return
+        print(f"📜 {len(revisions)} plan revisions:")
+        for revision, summary in revisions:
+            print(f"   r{revision:<4d} {summary['generated_at']}  {summary['tasks']:3d} tasks,"
+                  f" {summary['boxes']:3d} boxes, {summary['completed']:3d} done")
+        return
+
+    try:
+        plan = history.load(args.revision)
+    except HistoryError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if args.restore:
+        path = os.path.join(history.data_dir, 'generated_tasks.json')
+        write_json_atomic(path, plan)
+        print(f"✅ Restored revision {args.revision}: {path}")
+        print("💡 Run generate_static.py to publish it")
+    elif args.output:
+        write_json_atomic(args.output, plan)
+        print(f"✅ Revision {args.revision} written: {args.output}")
+    else:
+        print(json.dumps(plan, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Compact Plan Payload
+Dictionary-encodes generated tasks for the static page.
+
+Repeated strings (rooms, categories, icons, days, ...) are stored once in
+lookup tables and every task becomes a short array of integer indexes.
+Descriptions are not shipped when the page can rebuild them from
+task_templates.json (the laundry variant for laundry tasks); only tasks
+whose text differs from their template carry an index into the `texts`
+table. Rows are grouped per day so the
+generator can ship each day as its own chunk.
+"""
+
+import re
+
+PAYLOAD_VERSION = 4
+
+# Column order of an encoded task row. Trailing optional columns that hold
+# their default value are trimmed, so rarely used columns go last.
+TASK_FIELDS = ['room', 'category', 'type', 'assignee',
+               'icon', 'box_count', 'box_type', 'flags', 'text']
+REQUIRED_FIELDS = 4
+OPTIONAL_DEFAULTS = [-1, -1, -1, 0, -1]
+UNSCHEDULED_LABEL = 'Unscheduled'
+
+FLAG_HEAVY = 1
+FLAG_FRAGILE = 2
+FLAG_LAUNDRY = 4
+FLAG_COMPLETED = 8
+
+# Template fields that depend on the task's room alone, shipped once per room
+ROOM_FIELDS = ['floor', 'staging_area', 'destination']
+
+# Same substitution rule as expandTemplate() in planner.js, so a task only
+# drops its description when the page is guaranteed to rebuild it exactly.
+PLACEHOLDER = re.compile(r'\{(\w+)\}', re.ASCII)
+
+
+def expand_template(template, fields):
+    return PLACEHOLDER.sub(lambda m: str(fields.get(m.group(1), m.group(0))), template)
+
+
+def template_fields(task, room_fields=None, unload_area=None):
+    """Fields the page can fill in for `task`: its own, the ROOM_FIELDS
+    known for its room and the plan's unload area."""
+    fields = {
+        'room': task['room'],
+        'category': task['category'],
+        'category_lower': task['category'].lower()
+    }
+    if task.get('box_count') is not None:
+        fields['box_count'] = task['box_count']
+    if task.get('box_type'):
+        fields['box_type'] = task['box_type']
+    for name, value in zip(ROOM_FIELDS, room_fields or []):
+        if value is not None:
+            fields[name] = value
+    if unload_area is not None:
+        fields['unload_area'] = unload_area
+    return fields
+
+
+def template_variant(template, laundry):
+    """(icon, template) of the task type, laundry tasks using the laundry
+    variant where the type has one."""
+    variant = template.get('laundry', {}) if laundry else {}
+    return variant.get('icon', template['icon']), variant.get('template', template['template'])
+
+
+def encode_variant(template):
+    if 'laundry' not in template:
+        return None
+    return list(template_variant(template, True))
+
+
+class StringTable:
+    def __init__(self):
+        self.values = []
+        self.index = {}
+
+    def add(self, value):
+        if value not in self.index:
+            self.index[value] = len(self.values)
+            self.values.append(value)
+        return self.index[value]
+
+
+def encode_plan(task_data, templates):
+    rooms = StringTable()
+    categories = StringTable()
+    icons = StringTable()
+    assignees = StringTable()
+    box_types = StringTable()
+    texts = StringTable()
+    days = {}
+
+    type_names = list(templates.keys())
+    type_index = {name: i for i, name in enumerate(type_names)}
+    type_orders = {}
+    encoded_ids = set()
+    # Room index -> ROOM_FIELDS values (None until a task of the room has
+    # one) and the unload area, each taken from the first task that has it;
+    # tasks that disagree with them keep their own text
+    room_fields = {}
+    unload_area = None
+
+    for task in task_data['tasks']:
+        task_type = task['type']
+        if task_type not in type_index:
+            raise ValueError(f"Task {task['id']} has no template for type '{task_type}'")
+        if task['id'] != f"{task['room']}_{task['category']}_{task_type}":
+            raise ValueError(f"Task id {task['id']} cannot be derived from room, category and type")
+        order = task.get('order', 0)
+        if type_orders.setdefault(task_type, order) != order:
+            raise ValueError(f"Task {task['id']} breaks the shared order of '{task_type}' tasks")
+
+        room = rooms.add(task['room'])
+        known = room_fields.setdefault(room, [None] * len(ROOM_FIELDS))
+        for i, name in enumerate(ROOM_FIELDS):
+            if known[i] is None and task.get(name) is not None:
+                known[i] = task[name]
+        if unload_area is None:
+            unload_area = task.get('unload_area')
+
+        type_icon, template = template_variant(templates[task_type], task.get('is_laundry'))
+        icon = -1
+        if task['icon'] != type_icon:
+            icon = icons.add(task['icon'])
+
+        flags = 0
+        if task.get('heavy'):
+            flags |= FLAG_HEAVY
+        if task.get('fragile'):
+            flags |= FLAG_FRAGILE
+        if task.get('is_laundry'):
+            flags |= FLAG_LAUNDRY
+        if task.get('completed'):
+            flags |= FLAG_COMPLETED
+
+        text = -1
+        if expand_template(template, template_fields(task, known, unload_area)) != task['description']:
+            text = texts.add(task['description'])
+
+        row = [
+            room,
+            categories.add(task['category']),
+            type_index[task_type],
+            assignees.add(task['assignee']),
+            icon,
+            task['box_count'] if task.get('box_count') is not None else -1,
+            box_types.add(task['box_type']) if task.get('box_type') else -1,
+            flags,
+            text
+        ]
+        while len(row) > REQUIRED_FIELDS and row[-1] == OPTIONAL_DEFAULTS[len(row) - 1 - REQUIRED_FIELDS]:
+            row.pop()
+
+        encoded_ids.add(task['id'])
+        day = task.get('day')
+        label = task.get('day_label', day) if day else UNSCHEDULED_LABEL
+        days.setdefault(day, {'label': label, 'tasks': []})['tasks'].append(row)
+
+    # Box ID prefix -> [room, category, box type, flags, destination room,
+    # box count, index of the packing task's day or -1 when not on the page]
+    day_positions = {day: i for i, day in enumerate(days)}
+    boxes = {}
+    for prefix, box in task_data.get('boxes', {}).items():
+        flags = (FLAG_HEAVY if box['heavy'] else 0) | (FLAG_FRAGILE if box['fragile'] else 0)
+        packing_id = f"{box['room']}_{box['category']}_packing"
+        boxes[prefix] = [
+            rooms.add(box['room']),
+            categories.add(box['category']),
+            box_types.add(box['box_type']),
+            flags,
+            rooms.add(box['destination']),
+            box['count'],
+            day_positions[box['day']] if packing_id in encoded_ids else -1
+        ]
+
+    # Room index -> [floor, staging area, destination room index], with
+    # null for what none of the room's tasks has
+    encoded_room_fields = {}
+    for room, (floor, staging_area, destination) in room_fields.items():
+        if destination is not None:
+            destination = rooms.add(destination)
+        if (floor, staging_area, destination) != (None, None, None):
+            encoded_room_fields[room] = [floor, staging_area, destination]
+    unload_area = rooms.add(unload_area) if unload_area is not None else -1
+
+    return {
+        'v': PAYLOAD_VERSION,
+        'fields': TASK_FIELDS,
+        'rooms': rooms.values,
+        'categories': categories.values,
+        'icons': icons.values,
+        'assignees': assignees.values,
+        'box_types': box_types.values,
+        'days': [[day, entry['label'], entry['tasks']] for day, entry in days.items()],
+        # [name, icon, order, template, [laundry icon, laundry template] or None]
+        'types': [
+            [name, templates[name]['icon'], type_orders.get(name, 0), templates[name]['template'],
+             encode_variant(templates[name])]
+            for name in type_names
+        ],
+        'room_fields': encoded_room_fields,
+        'unload_area': unload_area,
+        'texts': texts.values,
+        'boxes': boxes,
+        'totals': task_data.get('totals', {}).get('with_buffer', {}),
+        'room_count': len(task_data.get('room_totals', {})),
+        # Devices whose exported progress the plan includes (merge_progress.py)
+        'synced': task_data.get('synced', {})
+    }
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Box Purchasing
+Finds the cheapest way to buy at least the buffered box totals from the
+bundles listed in data/box_catalog.json.
+
+Box types are bought independently, so each type is a covering problem
+over its bundle sizes: cost[n] = min over bundles of cost[n - size] + price.
+Prices are kept in cents so totals add up exactly.
+
+Large counts do not go through that table. Everything an order buys beyond
+its other bundles comes in the bundle with the lowest price per box, so an
+order is its other bundles plus enough of those. What the other bundles
+cost over the same boxes at the best price only depends on their box count
+modulo the best bundle's size, so a shortest-path search over those
+remainders finds the cheapest mix whatever the count; the table is the
+fallback when that mix alone would already exceed the count. Solutions are
+cached per box type and count, and whole plans per requirement vector.
+"""
+
+import argparse
+import heapq
+import json
+import math
+import os
+import sys
+from functools import lru_cache
+from config_compiler import ConfigError
+
+CATALOG_FILE = 'box_catalog.json'
+
+
+def load_catalog(data_dir):
+    """Returns {box type: ((vendor, bundle, price in cents), ...)}. Raises
+    ConfigError when the catalog is malformed."""
+    path = os.path.join(data_dir, CATALOG_FILE)
+    with open(path, 'r', encoding='utf-8') as f:
+        catalog = json.load(f)
+
+    errors = []
+    offers = {}
+    for index, offer in enumerate(catalog.get('offers', [])):
+        item = f"{CATALOG_FILE} offers[{index}]"
+        if not isinstance(offer, dict):
+            errors.append(f"{item}: expected an object")
+            continue
+        bundle = offer.get('bundle')
+        price = offer.get('price')
+        if not isinstance(offer.get('vendor'), str) or not isinstance(offer.get('box_type'), str):
+            errors.append(f"{item}: vendor and box_type must be strings")
+        elif not isinstance(bundle, int) or isinstance(bundle, bool) or bundle < 1:
+            errors.append(f"{item}.bundle: must be a positive integer")
+        elif not isinstance(price, (int, float)) or isinstance(price, bool) or price < 0:
+            errors.append(f"{item}.price: must be a non-negative number")
+        else:
+            offers.setdefault(offer['box_type'], []).append((offer['vendor'], bundle, round(price * 100)))
+    if errors:
+        raise ConfigError(errors)
+    return {box_type: prune_offers(type_offers) for box_type, type_offers in offers.items()}
+
+
+def prune_offers(offers):
+    """Drop offers another one beats outright (at least as many boxes for
+    at most the price). Sorted, so equal catalogs give equal cache keys."""
+    kept = []
+    for offer in sorted(offers, key=lambda o: (o[2], -o[1], o[0])):
+        if not any(other[1] >= offer[1] and other[2] <= offer[2] for other in kept):
+            kept.append(offer)
+    return tuple(sorted(kept, key=lambda o: (o[1], o[2], o[0])))
+
+
+def cover_table(offers, limit):
+    """cost[n] and the offer chosen last for every n up to `limit`."""
+    cost = [0] + [math.inf] * limit
+    choice = [None] * (limit + 1)
+    for n in range(1, limit + 1):
+        for offer in offers:
+            candidate = cost[max(0, n - offer[1])] + offer[2]
+            if candidate < cost[n]:
+                cost[n] = candidate
+                choice[n] = offer
+    return cost, choice
+
+
+def best_offer(offers):
+    return min(offers, key=lambda o: (o[2] / o[1], -o[1]))
+
+
+@lru_cache(maxsize=None)
+def remainder_paths(offers):
+    """Dijkstra over box counts modulo the best bundle's size. An edge adds
+    one other bundle and costs what it pays over the best per-box price
+    (scaled by the best size to stay in integers, never negative). Returns
+    (extra cost per remainder, (previous remainder, offer) per remainder)."""
+    best = best_offer(offers)
+    size, price = best[1], best[2]
+    extra = [math.inf] * size
+    previous = [None] * size
+    extra[0] = 0
+    queue = [(0, 0)]
+    while queue:
+        cost, remainder = heapq.heappop(queue)
+        if cost > extra[remainder]:
+            continue
+        for offer in offers:
+            if offer is best:
+                continue
+            next_cost = cost + offer[2] * size - offer[1] * price
+            next_remainder = (remainder + offer[1]) % size
+            if next_cost < extra[next_remainder]:
+                extra[next_remainder] = next_cost
+                previous[next_remainder] = (remainder, offer)
+                heapq.heappush(queue, (next_cost, next_remainder))
+    return extra, previous
+
+
+def cheapest_by_remainder(offers, count):
+    """Quantities of the cheapest order, or None when its other bundles
+    alone hold more than `count` boxes (the formula undercounts those)."""
+    best = best_offer(offers)
+    size, price = best[1], best[2]
+    extra, previous = remainder_paths(offers)
+    # Topping r other boxes up to `count` takes (count - r) / size best
+    # bundles, rounded up; the rounding wastes (r - count) % size boxes
+    remainder = min(range(size), key=lambda r: (extra[r] + (r - count) % size * price, r))
+
+    quantities = {}
+    boxes = 0
+    while remainder != 0:
+        remainder, offer = previous[remainder]
+        quantities[offer] = quantities.get(offer, 0) + 1
+        boxes += offer[1]
+    if boxes > count:
+        return None
+    if count > boxes:
+        quantities[best] = -(-(count - boxes) // size)
+    return quantities
+
+
+def cheapest_by_table(offers, count):
+    _, choice = cover_table(offers, count)
+    quantities = {}
+    while count > 0:
+        offer = choice[count]
+        quantities[offer] = quantities.get(offer, 0) + 1
+        count -= offer[1]
+    return quantities
+
+
+@lru_cache(maxsize=None)
+def cheapest_for_type(offers, count):
+    """Cheapest bundles covering `count` boxes from `offers`. Returns
+    (cost in cents, ((offer, quantity), ...))."""
+    if count <= 0:
+        return 0, ()
+
+    quantities = cheapest_by_remainder(offers, count)
+    if quantities is None:
+        quantities = cheapest_by_table(offers, count)
+    total = sum(offer[2] * quantity for offer, quantity in quantities.items())
+    return total, tuple(sorted(quantities.items(), key=lambda item: (item[0][1], item[0][0])))
+
+
+@lru_cache(maxsize=None)
+def cheapest_plan(catalog_key, requirements):
+    """`catalog_key` is a tuple of (box type, offers), `requirements` a
+    tuple of (box type, count). Returns (cost in cents, {box type:
+    (cost, ((offer, quantity), ...))})."""
+    catalog = dict(catalog_key)
+    missing = [box_type for box_type, count in requirements if count > 0 and box_type not in catalog]
+    if missing:
+        raise ConfigError([f"{CATALOG_FILE}: no offers for {box_type} boxes" for box_type in missing])
+
+    plan = {}
+    for box_type, count in requirements:
+        if count > 0:
+            plan[box_type] = cheapest_for_type(catalog[box_type], count)
+    return sum(cost for cost, _ in plan.values()), plan
+
+
+def plan_purchase(catalog, totals):
+    """Cheapest purchase covering `totals` ({box type: count}, e.g. the
+    plan's totals['with_buffer'])."""
+    catalog_key = tuple(sorted(catalog.items()))
+    requirements = tuple(sorted(totals.items()))
+    return cheapest_plan(catalog_key, requirements)
+
+
+def format_cents(cents):
+    return f"${cents / 100:,.2f}"
+
+
+def print_purchase(totals, total_cost, plan):
+    print("\n🛒 CHEAPEST BOX ORDER:")
+    for box_type, (cost, items) in plan.items():
+        bought = sum(offer[1] * quantity for offer, quantity in items)
+        print(f"   {box_type.capitalize()} ({totals[box_type]} needed, {bought} bought): {format_cents(cost)}")
+        for (vendor, bundle, price), quantity in items:
+            print(f"      {quantity} x {vendor} pack of {bundle} @ {format_cents(price)}")
+    print(f"   {'─'*30}")
+    print(f"   TOTAL: {format_cents(total_cost)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find the cheapest box order for the plan.")
+    parser.add_argument('--base', action='store_true', help="cover the totals without the buffer")
+    args = parser.parse_args()
+
+    data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
+    try:
+        catalog = load_catalog(data_dir)
+    except FileNotFoundError:
+        print(f"❌ No {CATALOG_FILE} found in data/.")
+        sys.exit(1)
+    except ConfigError as e:
+        print("❌ Invalid box catalog:")
+        for error in e.errors:
+            print(f"   - {error}")
+        sys.exit(1)
+
+    with open(os.path.join(data_dir, 'generated_tasks.json'), 'r') as f:
+        totals = json.load(f)['totals']['base' if args.base else 'with_buffer']
+
+    try:
+        total_cost, plan = plan_purchase(catalog, totals)
+    except ConfigError as e:
+        for error in e.errors:
+            print(f"❌ {error}")
+        sys.exit(1)
+    print_purchase(totals, total_cost, plan)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
+import argparse
 import json
 import os
 import sys
 from calculator import MovingCalculator
+from config_compiler import ConfigError, load_config
+from plan_diff import compare_plans, summarize_changes
+from plan_history import PlanHistory
 from task_generator import TaskGenerator
 
 
@@ -57,6 +61,10 @@ def print_summary(task_data):
     print(f"   Packing tasks:       {counts['packing']:3d}")
     print(f"   Staging tasks:       {counts['staging']:3d}")
     print(f"   Verification tasks:  {counts['verification']:3d}")
+    if 'unpack' in counts:
+        print(f"   Unload tasks:        {counts['unload']:3d}")
+        print(f"   Place tasks:         {counts['place']:3d}")
+        print(f"   Unpack tasks:        {counts['unpack']:3d}")
     print(f"   {'─'*30}")
     print(f"   TOTAL TASKS:         {counts['total']:3d}")
 
@@ -91,7 +99,8 @@ def print_day_schedule(task_data):
             tasks_by_day[day] = []
         tasks_by_day[day].append(task)
 
-    for day in sorted(tasks_by_day.keys()):
+    # In date order, so unpacking days follow the packing days
+    for day in sorted(tasks_by_day.keys(), key=lambda label: tasks_by_day[label][0].get('day') or ''):
         if day == 'Unscheduled':
             continue
 
@@ -117,7 +126,12 @@ def print_day_schedule(task_data):
     print("\n" + "="*60)
 
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recalculate boxes and regenerate the task plan.")
+    parser.add_argument('--unpacking', action='store_true',
+                        help="also plan unloading and unpacking at the destination (destination_config.json)")
+    args = parser.parse_args(argv)
+
     print("\n🔄 REBUILDING MOVING PLANNER...")
     print("="*60)
 
@@ -129,6 +143,17 @@ def main():
 
     print(f"   ✓ Loaded {len(inputs)} input values")
 
+    try:
+        config = load_config(os.path.join(os.path.dirname(__file__), '..', 'data'))
+    except ConfigError as e:
+        print("❌ Invalid configuration:")
+        for error in e.errors:
+            print(f"   - {error}")
+        sys.exit(1)
+    if args.unpacking and config['destination'] is None:
+        print("❌ Unpacking needs data/destination_config.json (run setup_rooms.py to create one).")
+        sys.exit(1)
+
     print("\n2. Calculating box requirements...")
     calculator = MovingCalculator()
     calc_results = calculator.calculate_all(inputs)
@@ -136,11 +161,20 @@ def main():
 
     print("\n3. Generating tasks...")
     generator = TaskGenerator()
-    task_data = generator.generate_all_tasks(calc_results)
+    task_data = generator.generate_all_tasks(calc_results, unpacking=args.unpacking)
     print(f"   ✓ Generated {task_data['task_counts']['total']} tasks")
 
     print("\n4. Saving to file...")
     generator.save_tasks(task_data)
+    history = PlanHistory()
+    revision = history.record(task_data)
+    if revision:
+        print(f"📜 Recorded plan revision {revision}")
+    if revision and revision > 1:
+        counts = summarize_changes(compare_plans(history.load(revision - 1), history.load(revision)))
+        print(f"📊 Since r{revision - 1}: +{counts['added']} added, -{counts['removed']} removed,"
+              f" ~{counts['changed']} changed ({counts['moved']} moved, {counts['reassigned']} reassigned,"
+              f" {counts['resized']} resized); details: plan_diff.py")
     print_summary(task_data)
     print_day_schedule(task_data)
 
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Reference Engine
+Frozen copies of MovingCalculator.calculate_all() and
+TaskGenerator.generate_all_tasks() as they were when verify_engine.py was
+added. verify_engine.py checks every candidate, the live classes included,
+against these, so a change to the live engines cannot move the reference
+along with it.
+
+Do not change this module to follow the live engines; a deliberate change
+of behaviour needs a new reference.
+"""
+
+import json
+import math
+import os
+from datetime import datetime
+
+
+def load_json(data_dir, filename):
+    with open(os.path.join(data_dir, filename), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class ReferenceCalculator:
+    def __init__(self, data_dir=None):
+        self.data_dir = data_dir or os.path.join(os.path.dirname(__file__), '..', 'data')
+        self.rooms = load_json(self.data_dir, 'rooms_config.json')
+        self.formulas = load_json(self.data_dir, 'calculation_formulas.json')
+
+    def calculate_boxes_for_category(self, volume, box_type):
+        if volume <= 0:
+            return 0
+        box_size = self.formulas['box_sizes'][box_type]
+        efficiency = self.formulas['packing_efficiency'][box_type]
+        return math.ceil(volume / (box_size * efficiency))
+
+    def calculate_room_totals(self, user_inputs):
+        room_totals = {}
+        for room_name, room_data in self.rooms.items():
+            if room_data.get('staging_only'):
+                continue
+
+            room_total = {'small': 0, 'medium': 0, 'large': 0, 'wardrobe': 0, 'categories': {}}
+            for category in room_data['categories']:
+                cat_name = category['name']
+                input_key = f"{room_name}_{cat_name}"
+                if input_key in user_inputs and user_inputs[input_key] > 0:
+                    volume = user_inputs[input_key]
+                    box_type = category['box_type']
+                    boxes = self.calculate_boxes_for_category(volume, box_type)
+                    room_total[box_type] += boxes
+                    room_total['categories'][cat_name] = {
+                        'volume': volume,
+                        'box_type': box_type,
+                        'boxes': boxes,
+                        'heavy': category.get('heavy', False),
+                        'fragile': category.get('fragile', False)
+                    }
+
+            if sum([room_total['small'], room_total['medium'],
+                    room_total['large'], room_total['wardrobe']]) > 0:
+                room_totals[room_name] = room_total
+        return room_totals
+
+    def calculate_grand_totals(self, room_totals):
+        grand_totals = {'small': 0, 'medium': 0, 'large': 0, 'wardrobe': 0}
+        for room_data in room_totals.values():
+            for box_type in grand_totals.keys():
+                grand_totals[box_type] += room_data[box_type]
+
+        buffer = self.formulas['buffer_percentage']
+        buffered_totals = {box_type: math.ceil(count * (1 + buffer))
+                           for box_type, count in grand_totals.items()}
+        return {
+            'base': grand_totals,
+            'with_buffer': buffered_totals,
+            'buffer_percentage': buffer * 100
+        }
+
+    def get_room_priority_order(self):
+        priority_list = []
+        for room_name, room_data in self.rooms.items():
+            if room_data.get('staging_only'):
+                continue
+            priority_list.append((room_name, room_data.get('priority', 5), room_data.get('floor', 0)))
+        priority_list.sort(key=lambda x: (x[1], -x[2]))
+        return priority_list
+
+    def calculate_all(self, user_inputs):
+        room_totals = self.calculate_room_totals(user_inputs)
+        return {
+            'room_totals': room_totals,
+            'grand_totals': self.calculate_grand_totals(room_totals),
+            'priority_order': [(room, pri, floor) for room, pri, floor in self.get_room_priority_order()
+                               if room in room_totals],
+            'timestamp': datetime.now().isoformat()
+        }
+
+
+class ReferenceTaskGenerator:
+    def __init__(self, data_dir=None):
+        self.data_dir = data_dir or os.path.join(os.path.dirname(__file__), '..', 'data')
+        self.rooms = load_json(self.data_dir, 'rooms_config.json')
+        self.templates = load_json(self.data_dir, 'task_templates.json')
+
+    def determine_staging_area(self, floor):
+        return "Lounge" if floor >= 2 else "Grow Room"
+
+    def is_laundry_category(self, category_name, room_name):
+        laundry_keywords = ['clothes', 'linens', 'bedding']
+        laundry_rooms = ['Bedroom', 'In-Law Bedroom', 'Garage']
+        category_lower = category_name.lower()
+        return room_name in laundry_rooms and any(kw in category_lower for kw in laundry_keywords)
+
+    def generate_tasks_for_category(self, room_name, category_name, category_data):
+        box_count = category_data['boxes']
+        box_type = category_data['box_type']
+        is_heavy = category_data.get('heavy', False)
+        is_fragile = category_data.get('fragile', False)
+        room_floor = self.rooms[room_name]['floor']
+        staging_area = self.determine_staging_area(room_floor)
+        is_laundry = self.is_laundry_category(category_name, room_name)
+
+        if is_laundry:
+            collection_desc = (f"🧺 WASH FIRST: Do all laundry for {category_name}. Once clean and dry,"
+                               f" gather in {room_name}. Keep ONLY this week's outfits unpacked.")
+            collection_icon = "🧺"
+        else:
+            collection_desc = self.templates['collection']['template'].format(
+                category=category_name, category_lower=category_name.lower(), room=room_name)
+            collection_icon = self.templates['collection']['icon']
+
+        packing_desc = self.templates['packing']['template'].format(
+            box_count=box_count, box_type=box_type, room=room_name, category=category_name)
+        if is_laundry:
+            packing_desc += " (clean laundry only, this week's outfits stay out)"
+
+        verification_desc = self.templates['verification']['template'].format(
+            room=room_name, category=category_name, category_lower=category_name.lower())
+        if is_laundry:
+            verification_desc = (f"Final sweep: {room_name} - verify only this week's"
+                                 f" {category_name.lower()} remain, all else packed")
+
+        return [
+            {
+                'id': f"{room_name}_{category_name}_collection",
+                'type': 'collection',
+                'icon': collection_icon,
+                'room': room_name,
+                'category': category_name,
+                'description': collection_desc,
+                'assignee': 'Brad' if not is_heavy else 'Andie',
+                'completed': False,
+                'day': None,
+                'order': 1,
+                'is_laundry': is_laundry
+            },
+            {
+                'id': f"{room_name}_{category_name}_packing",
+                'type': 'packing',
+                'icon': self.templates['packing']['icon'],
+                'room': room_name,
+                'category': category_name,
+                'box_count': box_count,
+                'box_type': box_type,
+                'description': packing_desc,
+                'assignee': 'Andie',
+                'completed': False,
+                'day': None,
+                'order': 2,
+                'heavy': is_heavy,
+                'fragile': is_fragile,
+                'is_laundry': is_laundry
+            },
+            {
+                'id': f"{room_name}_{category_name}_staging",
+                'type': 'staging',
+                'icon': self.templates['staging']['icon'],
+                'room': room_name,
+                'category': category_name,
+                'box_count': box_count,
+                'staging_area': staging_area,
+                'description': (f"Move {box_count} {box_type} boxes to {staging_area} staging area"
+                                f" (Floor {room_floor}) - {room_name}: {category_name}"),
+                'assignee': 'Andie',
+                'completed': False,
+                'day': None,
+                'order': 3
+            },
+            {
+                'id': f"{room_name}_{category_name}_verification",
+                'type': 'verification',
+                'icon': self.templates['verification']['icon'],
+                'room': room_name,
+                'category': category_name,
+                'description': verification_desc,
+                'assignee': 'Brad',
+                'completed': False,
+                'day': None,
+                'order': 4,
+                'is_laundry': is_laundry
+            }
+        ]
+
+    def assign_tasks_to_days(self, tasks, priority_order):
+        packing_days = ['2025-10-22', '2025-10-23', '2025-10-24']
+        day_labels = {
+            '2025-10-22': 'Tuesday, October 22',
+            '2025-10-23': 'Wednesday, October 23',
+            '2025-10-24': 'Thursday, October 24'
+        }
+
+        rooms_per_day = max(1, len(priority_order) // len(packing_days))
+        day_index = 0
+        room_count = 0
+        for room_name, priority, floor in priority_order:
+            for task in tasks:
+                if task['room'] == room_name:
+                    task['day'] = packing_days[day_index]
+                    task['day_label'] = day_labels[packing_days[day_index]]
+            room_count += 1
+            if room_count >= rooms_per_day and day_index < len(packing_days) - 1:
+                day_index += 1
+                room_count = 0
+        return tasks
+
+    def generate_all_tasks(self, calculation_results):
+        all_tasks = []
+        for room_name, room_data in calculation_results['room_totals'].items():
+            for category_name, category_data in room_data['categories'].items():
+                all_tasks.extend(self.generate_tasks_for_category(room_name, category_name, category_data))
+
+        all_tasks = self.assign_tasks_to_days(all_tasks, calculation_results['priority_order'])
+        all_tasks.sort(key=lambda x: (x['day'] or '9999', x['room'], x['order']))
+
+        return {
+            'tasks': all_tasks,
+            'totals': calculation_results['grand_totals'],
+            'room_totals': calculation_results['room_totals'],
+            'task_counts': {
+                'collection': len([t for t in all_tasks if t['type'] == 'collection']),
+                'packing': len([t for t in all_tasks if t['type'] == 'packing']),
+                'staging': len([t for t in all_tasks if t['type'] == 'staging']),
+                'verification': len([t for t in all_tasks if t['type'] == 'verification']),
+                'total': len(all_tasks)
+            },
+            'assignee_counts': {
+                'Andie': len([t for t in all_tasks if t['assignee'] == 'Andie']),
+                'Brad': len([t for t in all_tasks if t['assignee'] == 'Brad'])
+            },
+            'generated_at': datetime.now().isoformat()
+        }
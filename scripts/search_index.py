@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Task Search Index
+Builds the inverted index the page answers search queries from.
+
+Every task is a document, numbered in plan order (day by day, as in the
+payload), and stored as [day, room, category, type, assignee] indexes
+into the payload's tables, which is enough for the page to derive its id
+and plan assignee without loading its day. Words
+from the description, room, category and assignee become lower-cased
+tokens. Tokens are sorted, so the page finds every token starting with
+what was typed by binary search, and each token's list of documents is
+delta-encoded.
+"""
+
+import re
+
+# Mirrors tokenize() in planner.js
+TOKEN = re.compile(r'\w+')
+
+
+def tokenize(text):
+    return TOKEN.findall(text.lower())
+
+
+def delta_encode(numbers):
+    previous = 0
+    encoded = []
+    for number in numbers:
+        encoded.append(number - previous)
+        previous = number
+    return encoded
+
+
+def build_search_index(days):
+    """`days` lists (rows, tasks) per payload day, rows being the encoded
+    task rows and tasks the matching task dicts."""
+    postings = {}
+    docs = []
+    for day_index, (rows, tasks) in enumerate(days):
+        for row, task in zip(rows, tasks):
+            doc = len(docs)
+            docs.append([day_index] + row[:4])
+            text = ' '.join([task['description'], task['room'], task['category'], task['assignee']])
+            for token in set(tokenize(text)):
+                postings.setdefault(token, []).append(doc)
+
+    tokens = sorted(postings)
+    return {
+        'tokens': tokens,
+        'postings': [delta_encode(postings[token]) for token in tokens],
+        'docs': docs
+    }
@@ -4,8 +4,8 @@ Setup Rooms Configuration
 Generates intelligent room and category mappings for the moving planner.
 """
 
-import json
 import os
+from atomic_io import write_json_atomic
 
 def create_rooms_config():
     """Create comprehensive room configuration with intelligent category mapping."""
@@ -468,27 +468,55 @@ def create_task_templates():
 
     templates = {
         "collection": {
-            "template": "Gather all {category} in {room}",
+            "template": "Gather all {category_lower} in {room}",
             "type": "collection",
             "icon": "🔍",
-            "default_assignee": "either"
+            "default_assignee": "either",
+            "laundry": {
+                "template": "🧺 WASH FIRST: Do all laundry for {category}. Once clean and dry, gather in {room}. Keep ONLY this week's outfits unpacked.",
+                "icon": "🧺"
+            }
         },
         "packing": {
             "template": "Pack {box_count} {box_type} boxes: {room} - {category}",
             "type": "packing",
             "icon": "📦",
-            "default_assignee": "Andie"
+            "default_assignee": "Andie",
+            "laundry": {
+                "template": "Pack {box_count} {box_type} boxes: {room} - {category} (clean laundry only, this week's outfits stay out)"
+            }
         },
         "staging": {
-            "template": "Move {box_count} packed boxes to Grow Room staging area",
+            "template": "Move {box_count} {box_type} boxes to {staging_area} staging area (Floor {floor}) - {room}: {category}",
             "type": "staging",
             "icon": "🚚",
             "default_assignee": "Andie"
         },
         "verification": {
-            "template": "Final sweep: {room} - verify {category} section empty",
+            "template": "Final sweep: {room} - verify {category_lower} section empty",
             "type": "verification",
             "icon": "✅",
+            "default_assignee": "Brad",
+            "laundry": {
+                "template": "Final sweep: {room} - verify only this week's {category_lower} remain, all else packed"
+            }
+        },
+        "unload": {
+            "template": "Unload {box_count} {box_type} boxes to {unload_area}: {room} - {category}",
+            "type": "unload",
+            "icon": "🚛",
+            "default_assignee": "Andie"
+        },
+        "place": {
+            "template": "Carry {box_count} boxes from {unload_area} to {destination}: {category}",
+            "type": "place",
+            "icon": "📍",
+            "default_assignee": "Andie"
+        },
+        "unpack": {
+            "template": "Unpack {category_lower} in {destination} ({box_count} {box_type} boxes from {room})",
+            "type": "unpack",
+            "icon": "📭",
             "default_assignee": "Brad"
         }
     }
@@ -496,6 +524,22 @@ def create_task_templates():
     return templates
 
 
+def create_destination_config(rooms):
+    """Define the unpacking schedule and where each room's boxes go."""
+
+    destination = {
+        "move_day": "2025-10-26",
+        "unload_area": "Garage",
+        "unpacking_days": ["2025-10-27", "2025-10-28", "2025-10-29"],
+        # Same room names at the new place until the layout is mapped
+        "room_mapping": {
+            name: name for name, room in rooms.items() if not room.get('staging_only')
+        }
+    }
+
+    return destination
+
+
 def main():
     """Main setup function."""
 
@@ -507,22 +551,21 @@ def main():
     rooms = create_rooms_config()
     formulas = create_calculation_formulas()
     templates = create_task_templates()
+    destination = create_destination_config(rooms)
 
     # Write configuration files (always safe to regenerate)
-    with open(os.path.join(data_dir, 'rooms_config.json'), 'w') as f:
-        json.dump(rooms, f, indent=2)
+    write_json_atomic(os.path.join(data_dir, 'rooms_config.json'), rooms)
+
+    write_json_atomic(os.path.join(data_dir, 'calculation_formulas.json'), formulas)
 
-    with open(os.path.join(data_dir, 'calculation_formulas.json'), 'w') as f:
-        json.dump(formulas, f, indent=2)
+    write_json_atomic(os.path.join(data_dir, 'task_templates.json'), templates)
 
-    with open(os.path.join(data_dir, 'task_templates.json'), 'w') as f:
-        json.dump(templates, f, indent=2)
+    write_json_atomic(os.path.join(data_dir, 'destination_config.json'), destination)
 
     # Create user_inputs.json only if it doesn't exist (preserve user data)
     user_inputs_path = os.path.join(data_dir, 'user_inputs.json')
     if not os.path.exists(user_inputs_path):
-        with open(user_inputs_path, 'w') as f:
-            json.dump({}, f, indent=2)
+        write_json_atomic(user_inputs_path, {})
         print("   - Created empty user_inputs.json")
     else:
         print("   - Preserved existing user_inputs.json")
@@ -530,8 +573,7 @@ def main():
     # Create generated_tasks.json only if it doesn't exist (preserve generated tasks)
     tasks_path = os.path.join(data_dir, 'generated_tasks.json')
     if not os.path.exists(tasks_path):
-        with open(tasks_path, 'w') as f:
-            json.dump({"tasks": [], "totals": {}}, f, indent=2)
+        write_json_atomic(tasks_path, {"tasks": [], "totals": {}})
         print("   - Created empty generated_tasks.json")
     else:
         print("   - Preserved existing generated_tasks.json")
@@ -1,21 +1,87 @@
 #!/usr/bin/env python3
-import json
 import os
+import re
 from datetime import datetime, timedelta
+from atomic_io import write_json_atomic
+from config_compiler import TASK_TYPES, UNPACKING_TASK_TYPES, compile_templates, load_config
+from merge_progress import load_progress
+
+ROOM_CODE_LENGTH = 3
+CATEGORY_CODE_LENGTH = 4
+PACKING_DAYS = [
+    ('2025-10-22', 'Tuesday, October 22'),
+    ('2025-10-23', 'Wednesday, October 23'),
+    ('2025-10-24', 'Thursday, October 24')
+]
+
+
+def short_code(name, length, taken):
+    """Upper-case abbreviation of `name` that is not in `taken`, e.g.
+    'Kitchen' -> 'KIT'. A clash gets a number: 'CLOT', then 'CLOT2'."""
+    code = ''.join(re.findall(r'[A-Z0-9]+', name.upper()))[:length] or 'X'
+    candidate = code
+    number = 2
+    while candidate in taken:
+        candidate = f"{code}{number}"
+        number += 1
+    taken.add(candidate)
+    return candidate
 
 
 class TaskGenerator:
-    def __init__(self):
-        self.data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
+    def __init__(self, data_dir=None):
+        self.data_dir = data_dir or os.path.join(os.path.dirname(__file__), '..', 'data')
         self.load_configs()
 
     def load_configs(self):
-        with open(os.path.join(self.data_dir, 'rooms_config.json'), 'r') as f:
-            self.rooms = json.load(f)
-        with open(os.path.join(self.data_dir, 'task_templates.json'), 'r') as f:
-            self.templates = json.load(f)
-        with open(os.path.join(self.data_dir, 'calculation_formulas.json'), 'r') as f:
-            self.formulas = json.load(f)
+        config = load_config(self.data_dir)
+        self.rooms = config['rooms']
+        self.templates = config['templates']
+        self.formatters = compile_templates(self.templates)
+        self.formulas = config['formulas']
+        self.destination = config['destination']
+        self.box_prefixes = self.build_box_prefixes()
+
+    def build_box_prefixes(self):
+        """Box ID prefix for every room and category, e.g. 'KIT-DISH'.
+        Codes come from the config alone, in config order, so a box keeps
+        its ID across rebuilds whatever volumes are entered."""
+        prefixes = {}
+        room_codes = set()
+        for room_name, room_data in self.rooms.items():
+            room_code = short_code(room_name, ROOM_CODE_LENGTH, room_codes)
+            category_codes = set()
+            for category in room_data.get('categories', []):
+                category_code = short_code(category['name'], CATEGORY_CODE_LENGTH, category_codes)
+                prefixes[(room_name, category['name'])] = f"{room_code}-{category_code}"
+        return prefixes
+
+    def destination_room(self, room_name):
+        if self.destination is None:
+            return room_name
+        return self.destination['room_mapping'].get(room_name, room_name)
+
+    def unpacking_days(self):
+        days = []
+        for day in self.destination['unpacking_days']:
+            parsed = datetime.strptime(day, '%Y-%m-%d')
+            days.append((day, f"{parsed:%A}, {parsed:%B} {parsed.day}"))
+        return days
+
+    def describe(self, task_type, fields, laundry=False):
+        """(icon, description) from the task type's compiled template, or
+        its laundry variant."""
+        icon, formatter = self.formatters[task_type]['laundry' if laundry else 'default']
+        return icon, formatter(fields)
+
+    def task_base(self, task_type, room_name, category_name, icon):
+        return {
+            'id': f"{room_name}_{category_name}_{task_type}",
+            'type': task_type,
+            'icon': icon,
+            'room': room_name,
+            'category': category_name
+        }
 
     def determine_staging_area(self, floor):
         return "Lounge" if floor >= 2 else "Grow Room"
@@ -36,24 +102,20 @@ class TaskGenerator:
         room_floor = self.rooms[room_name]['floor']
         staging_area = self.determine_staging_area(room_floor)
         is_laundry = self.is_laundry_category(category_name, room_name)
-
-        if is_laundry:
-            collection_desc = f"🧺 WASH FIRST: Do all laundry for {category_name}. Once clean and dry, gather in {room_name}. Keep ONLY this week's outfits unpacked."
-            collection_icon = "🧺"
-        else:
-            collection_desc = self.templates['collection']['template'].format(
-                category=category_name.lower(),
-                room=room_name
-            )
-            collection_icon = self.templates['collection']['icon']
-
-        collection_task = {
-            'id': f"{room_name}_{category_name}_collection",
-            'type': 'collection',
-            'icon': collection_icon,
+        fields = {
             'room': room_name,
             'category': category_name,
-            'description': collection_desc,
+            'category_lower': category_name.lower(),
+            'floor': room_floor,
+            'box_count': box_count,
+            'box_type': box_type,
+            'staging_area': staging_area
+        }
+
+        icon, description = self.describe('collection', fields, is_laundry)
+        collection_task = {
+            **self.task_base('collection', room_name, category_name, icon),
+            'description': description,
             'assignee': 'Brad' if not is_heavy else 'Andie',
             'completed': False,
             'day': None,
@@ -61,62 +123,43 @@ class TaskGenerator:
             'is_laundry': is_laundry
         }
         tasks.append(collection_task)
-        packing_desc = self.templates['packing']['template'].format(
-            box_count=box_count,
-            box_type=box_type,
-            room=room_name,
-            category=category_name
-        )
-        if is_laundry:
-            packing_desc += " (clean laundry only, this week's outfits stay out)"
 
+        icon, description = self.describe('packing', fields, is_laundry)
         packing_task = {
-            'id': f"{room_name}_{category_name}_packing",
-            'type': 'packing',
-            'icon': self.templates['packing']['icon'],
-            'room': room_name,
-            'category': category_name,
+            **self.task_base('packing', room_name, category_name, icon),
             'box_count': box_count,
             'box_type': box_type,
-            'description': packing_desc,
+            'description': description,
             'assignee': 'Andie',
             'completed': False,
             'day': None,
             'order': 2,
+            'box_prefix': self.box_prefixes[(room_name, category_name)],
             'heavy': is_heavy,
             'fragile': is_fragile,
             'is_laundry': is_laundry
         }
         tasks.append(packing_task)
+
+        icon, description = self.describe('staging', fields, is_laundry)
         staging_task = {
-            'id': f"{room_name}_{category_name}_staging",
-            'type': 'staging',
-            'icon': self.templates['staging']['icon'],
-            'room': room_name,
-            'category': category_name,
+            **self.task_base('staging', room_name, category_name, icon),
             'box_count': box_count,
+            'box_type': box_type,
+            'floor': room_floor,
             'staging_area': staging_area,
-            'description': f"Move {box_count} {box_type} boxes to {staging_area} staging area (Floor {room_floor}) - {room_name}: {category_name}",
+            'description': description,
             'assignee': 'Andie',
             'completed': False,
             'day': None,
             'order': 3
         }
         tasks.append(staging_task)
-        verification_desc = self.templates['verification']['template'].format(
-            room=room_name,
-            category=category_name.lower()
-        )
-        if is_laundry:
-            verification_desc = f"Final sweep: {room_name} - verify only this week's {category_name.lower()} remain, all else packed"
 
+        icon, description = self.describe('verification', fields, is_laundry)
         verification_task = {
-            'id': f"{room_name}_{category_name}_verification",
-            'type': 'verification',
-            'icon': self.templates['verification']['icon'],
-            'room': room_name,
-            'category': category_name,
-            'description': verification_desc,
+            **self.task_base('verification', room_name, category_name, icon),
+            'description': description,
             'assignee': 'Brad',
             'completed': False,
             'day': None,
@@ -127,32 +170,114 @@ class TaskGenerator:
 
         return tasks
 
-    def assign_tasks_to_days(self, tasks, priority_order):
-        packing_days = ['2025-10-22', '2025-10-23', '2025-10-24']
-        day_labels = {
-            '2025-10-22': 'Tuesday, October 22',
-            '2025-10-23': 'Wednesday, October 23',
-            '2025-10-24': 'Thursday, October 24'
+    def generate_unpacking_tasks_for_category(self, room_name, category_name, category_data):
+        """Unload, place and unpack tasks for one category's boxes at the
+        destination. Tasks keep the origin room, which is what their boxes
+        are labelled with; `destination` is the room they end up in."""
+        box_count = category_data['boxes']
+        box_type = category_data['box_type']
+        is_heavy = category_data.get('heavy', False)
+        fields = {
+            'room': room_name,
+            'category': category_name,
+            'category_lower': category_name.lower(),
+            'floor': self.rooms[room_name]['floor'],
+            'box_count': box_count,
+            'box_type': box_type,
+            'destination': self.destination_room(room_name),
+            'unload_area': self.destination['unload_area']
         }
+        assignees = {
+            'unload': 'Andie',
+            'place': 'Andie',
+            'unpack': 'Andie' if is_heavy else 'Brad'
+        }
+
+        tasks = []
+        for order, task_type in enumerate(UNPACKING_TASK_TYPES, len(TASK_TYPES) + 1):
+            icon, description = self.describe(task_type, fields)
+            tasks.append({
+                **self.task_base(task_type, room_name, category_name, icon),
+                'box_count': box_count,
+                'box_type': box_type,
+                'box_prefix': self.box_prefixes[(room_name, category_name)],
+                'destination': fields['destination'],
+                'unload_area': fields['unload_area'],
+                'description': description,
+                'assignee': assignees[task_type],
+                'completed': False,
+                'day': None,
+                'order': order,
+                'heavy': is_heavy,
+                'fragile': category_data.get('fragile', False)
+            })
+        return tasks
+
+    def assign_tasks_to_days(self, tasks, priority_order, days=None):
+        """Spread rooms over `days` ((date, label) pairs, the packing days
+        by default) in priority order, all of a room's tasks on one day."""
+        days = days or PACKING_DAYS
 
-        rooms_per_day = max(1, len(priority_order) // len(packing_days))
+        rooms_per_day = max(1, len(priority_order) // len(days))
         day_index = 0
         room_count = 0
 
         for room_name, priority, floor in priority_order:
             room_tasks = [t for t in tasks if t['room'] == room_name]
             for task in room_tasks:
-                task['day'] = packing_days[day_index]
-                task['day_label'] = day_labels[packing_days[day_index]]
+                task['day'], task['day_label'] = days[day_index]
             room_count += 1
-            if room_count >= rooms_per_day and day_index < len(packing_days) - 1:
+            if room_count >= rooms_per_day and day_index < len(days) - 1:
                 day_index += 1
                 room_count = 0
 
         return tasks
 
-    def generate_all_tasks(self, calculation_results):
+    def apply_progress(self, tasks):
+        """Carry progress merged from the devices (merge_progress.py) into
+        the plan, with the time of each completion. Returns the devices it
+        includes, with their export times."""
+        progress = load_progress(self.data_dir)
+        if progress is None:
+            return {}
+
+        fields = {'c': 'completed', 'a': 'assignee'}
+        by_id = {task['id']: task for task in tasks}
+        for task_id, field, value, timestamp in progress['ops']:
+            # null (older pages) means the device put the field back to the plan's value
+            if value is not None and task_id in by_id:
+                by_id[task_id][fields[field]] = value
+                if field == 'c' and value:
+                    by_id[task_id]['completed_at'] = timestamp
+        return progress['devices']
+
+    def build_box_index(self, tasks):
+        """Maps each box ID prefix to what its boxes hold. Box numbers run
+        from 1 to `count`, so PREFIX-003 is found with one lookup."""
+        boxes = {}
+        for task in tasks:
+            if task['type'] != 'packing':
+                continue
+            boxes[task['box_prefix']] = {
+                'room': task['room'],
+                'category': task['category'],
+                'box_type': task['box_type'],
+                'count': task['box_count'],
+                'heavy': task['heavy'],
+                'fragile': task['fragile'],
+                'destination': self.destination_room(task['room']),
+                'day': task['day']
+            }
+        return boxes
+
+    def generate_all_tasks(self, calculation_results, unpacking=False):
+        """Packing tasks for every category; with `unpacking`, also the tasks
+        at the destination, scheduled on the unpacking days of
+        destination_config.json."""
+        if unpacking and self.destination is None:
+            raise ValueError("Unpacking needs data/destination_config.json")
         all_tasks = []
+        unpacking_tasks = []
 
         for room_name, room_data in calculation_results['room_totals'].items():
             for category_name, category_data in room_data['categories'].items():
@@ -160,31 +285,44 @@ class TaskGenerator:
                     room_name, category_name, category_data
                 )
                 all_tasks.extend(tasks)
+                if unpacking:
+                    unpacking_tasks.extend(self.generate_unpacking_tasks_for_category(
+                        room_name, category_name, category_data
+                    ))
 
         priority_order = calculation_results['priority_order']
         all_tasks = self.assign_tasks_to_days(all_tasks, priority_order)
+        if unpacking:
+            all_tasks.extend(self.assign_tasks_to_days(unpacking_tasks, priority_order, self.unpacking_days()))
+        synced = self.apply_progress(all_tasks)
         all_tasks.sort(key=lambda x: (x['day'] or '9999', x['room'], x['order']))
 
         return {
             'tasks': all_tasks,
             'totals': calculation_results['grand_totals'],
             'room_totals': calculation_results['room_totals'],
-            'task_counts': {
-                'collection': len([t for t in all_tasks if t['type'] == 'collection']),
-                'packing': len([t for t in all_tasks if t['type'] == 'packing']),
-                'staging': len([t for t in all_tasks if t['type'] == 'staging']),
-                'verification': len([t for t in all_tasks if t['type'] == 'verification']),
-                'total': len(all_tasks)
-            },
+            'task_counts': self.count_tasks(all_tasks, unpacking),
             'assignee_counts': {
                 'Andie': len([t for t in all_tasks if t['assignee'] == 'Andie']),
                 'Brad': len([t for t in all_tasks if t['assignee'] == 'Brad'])
             },
+            'boxes': self.build_box_index(all_tasks),
+            'synced': synced,
             'generated_at': datetime.now().isoformat()
         }
 
+    def count_tasks(self, tasks, unpacking=False):
+        task_types = TASK_TYPES + UNPACKING_TASK_TYPES if unpacking else TASK_TYPES
+        counts = {task_type: 0 for task_type in task_types}
+        for task in tasks:
+            counts[task['type']] += 1
+        counts['total'] = len(tasks)
+        return counts
+
     def save_tasks(self, task_data):
         output_path = os.path.join(self.data_dir, 'generated_tasks.json')
-        with open(output_path, 'w') as f:
-            json.dump(task_data, f, indent=2)
-        print(f"✅ Tasks saved to {output_path}")
+        # generated_at alone does not count as a change
+        if write_json_atomic(output_path, task_data):
+            print(f"✅ Tasks saved to {output_path}")
+        else:
+            print(f"✅ Tasks unchanged: {output_path}")
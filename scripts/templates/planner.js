@@ -0,0 +1,1122 @@
+const FLAG_HEAVY = 1;
+const FLAG_FRAGILE = 2;
+const FLAG_LAUNDRY = 4;
+const FLAG_COMPLETED = 8;
+
+const VIRTUAL_ROW_HEIGHT = 48;
+const VIRTUAL_VIEWPORT_HEIGHT = 480;
+const VIRTUAL_OVERSCAN = 8;
+
+const TASK_STATE_PREFIX = 'plannerTask:';
+const LEGACY_STATE_KEYS = { c: 'taskCompletions', a: 'taskAssignments' };
+const INDEXED_DB_THRESHOLD = 2000;
+const SAVE_DEBOUNCE_MS = 300;
+const SEARCH_RESULT_LIMIT = 50;
+const DEVICE_KEY = 'plannerDevice';
+const PROGRESS_LOG_FORMAT = 'moving-planner-progress';
+const PROGRESS_FIELDS = ['c', 'a'];
+// Plan value of each progress field on a decoded task
+const PLAN_FIELDS = { c: 'planCompleted', a: 'planAssignee' };
+
+const plan = JSON.parse(document.getElementById('task-data').textContent);
+const taskData = {
+    tasks: [],
+    days: plan.days.map(([date, label, chunk, taskCount, completed, rows], index) => ({
+        index: index,
+        date: date,
+        label: label,
+        chunk: chunk,
+        taskCount: taskCount,
+        completed: completed,
+        rows: rows || null,
+        tasks: null,
+        loading: null,
+        element: null,
+        content: null
+    })),
+    totals: plan.totals,
+    roomCount: plan.room_count,
+    totalTasks: plan.days.reduce((sum, entry) => sum + entry[3], 0)
+};
+const taskIndex = new Map();
+const roomStates = new WeakMap();
+// Saved state holds, per task id, only the fields that differ from the
+// generated plan: { c: completed, a: assignee }, plus when each field was
+// last changed here ({ ct, at }). The time is kept after a field returns
+// to its plan value, so that change still reaches the progress export.
+const savedState = new Map();
+const dirtyIds = new Set();
+let stateBackend = null;
+let saveTimer = 0;
+let completedCount = 0;
+let searchIndex = null;
+let searchLoading = null;
+let device = null;
+// Box ID prefix (e.g. KIT-DISH) -> [room, category, box type, flags,
+// destination room, box count, packing day or -1]
+const boxIndex = new Map(Object.entries(plan.boxes));
+
+// Mirrors expand_template() in plan_payload.py
+function expandTemplate(template, fields) {
+    return template.replace(/\{(\w+)\}/g, (match, name) => (name in fields ? String(fields[name]) : match));
+}
+
+// Mirrors template_fields(); `roomFields` is the room's [floor, staging
+// area, destination room index] from the payload
+function templateFields(task, roomFields) {
+    const fields = {
+        room: task.room,
+        category: task.category,
+        category_lower: task.category.toLowerCase()
+    };
+    if (task.box_count !== undefined) fields.box_count = task.box_count;
+    if (task.box_type !== undefined) fields.box_type = task.box_type;
+    if (roomFields) {
+        const [floor, stagingArea, destination] = roomFields;
+        if (floor !== null) fields.floor = floor;
+        if (stagingArea !== null) fields.staging_area = stagingArea;
+        if (destination !== null) fields.destination = plan.rooms[destination];
+    }
+    if (plan.unload_area >= 0) fields.unload_area = plan.rooms[plan.unload_area];
+    return fields;
+}
+
+function decodeTasks(rows, day) {
+    return rows.map(row => {
+        const [room, category, type, assignee, icon = -1,
+               boxCount = -1, boxType = -1, flags = 0, text = -1] = row;
+        const [typeName, defaultIcon, order, defaultTemplate, laundryVariant] = plan.types[type];
+        const laundry = (flags & FLAG_LAUNDRY) !== 0;
+        // Laundry tasks use the type's laundry variant, where it has one
+        const [typeIcon, template] = laundry && laundryVariant ? laundryVariant : [defaultIcon, defaultTemplate];
+
+        const task = {
+            id: `${plan.rooms[room]}_${plan.categories[category]}_${typeName}`,
+            type: typeName,
+            icon: icon >= 0 ? plan.icons[icon] : typeIcon,
+            room: plan.rooms[room],
+            category: plan.categories[category],
+            assignee: plan.assignees[assignee],
+            planAssignee: plan.assignees[assignee],
+            completed: (flags & FLAG_COMPLETED) !== 0,
+            planCompleted: (flags & FLAG_COMPLETED) !== 0,
+            day: day.date,
+            day_label: day.label,
+            dayIndex: day.index,
+            order: order,
+            heavy: (flags & FLAG_HEAVY) !== 0,
+            fragile: (flags & FLAG_FRAGILE) !== 0,
+            is_laundry: laundry
+        };
+        if (boxCount >= 0) task.box_count = boxCount;
+        if (boxType >= 0) task.box_type = plan.box_types[boxType];
+        task.description = text >= 0
+            ? plan.texts[text]
+            : expandTemplate(template, templateFields(task, plan.room_fields[room]));
+        return task;
+    });
+}
+
+function init() {
+    completedCount = taskData.days.reduce((sum, day) => sum + day.completed, 0);
+    taskData.days.filter(day => day.rows).forEach(day => {
+        day.tasks = decodeTasks(day.rows, day);
+    });
+    attachTaskHandlers();
+    attachSearch();
+    attachBoxLookup();
+    document.getElementById('exportProgress').addEventListener('click', exportProgress);
+    updateStats();
+    loadSavedState().then(displayTasks);
+}
+
+// Day, room and task markup is pre-rendered by generate_static.py; the page
+// only links it to the plan data and applies the state saved on this device.
+function displayTasks() {
+    document.querySelectorAll('#tasksContainer .day-tasks').forEach(element => {
+        const day = taskData.days[Number(element.dataset.day)];
+        day.element = element;
+        day.content = element.querySelector('.day-content');
+    });
+    if (taskData.days.length === 0) return;
+
+    taskData.days.filter(day => day.rows).forEach(hydrateDay);
+
+    // Only the current day is shown up front; the rest load on expand
+    const current = pickCurrentDay();
+    taskData.days.forEach(day => {
+        if (day !== current) day.element.classList.add('collapsed');
+    });
+    if (current.element.classList.contains('collapsed')) toggleDay(current);
+    updateTaskStats();
+}
+
+function attachTaskHandlers() {
+    const container = document.getElementById('tasksContainer');
+
+    container.addEventListener('change', event => {
+        const row = event.target.closest('.task-item');
+        if (!row) return;
+        if (event.target.type === 'checkbox') {
+            toggleTask(row.dataset.taskId);
+        } else if (event.target.tagName === 'SELECT') {
+            reassignTask(row.dataset.taskId, event.target.value);
+        }
+    });
+
+    container.addEventListener('click', event => {
+        const text = event.target.closest('.task-text');
+        if (text) {
+            text.parentElement.querySelector('input[type="checkbox"]').click();
+            return;
+        }
+        const roomHeader = event.target.closest('.room-header');
+        if (roomHeader) {
+            toggleRoom(roomHeader);
+            return;
+        }
+        const dayHeader = event.target.closest('.day-header-bar');
+        if (dayHeader) {
+            toggleDay(taskData.days[Number(dayHeader.parentElement.dataset.day)]);
+        }
+    });
+}
+
+function localDateString(date) {
+    const month = String(date.getMonth() + 1).padStart(2, '0');
+    const day = String(date.getDate()).padStart(2, '0');
+    return `${date.getFullYear()}-${month}-${day}`;
+}
+
+// Today, else the next scheduled day, else the last one. May differ from
+// the day pre-rendered by pick_lead_day() in page_markup.py.
+function pickCurrentDay() {
+    const today = localDateString(new Date());
+    const scheduled = taskData.days.filter(day => day.date);
+    return scheduled.find(day => day.date === today)
+        || scheduled.find(day => day.date > today)
+        || scheduled[scheduled.length - 1]
+        || taskData.days[0];
+}
+
+function toggleDay(day) {
+    const collapsed = day.element.classList.toggle('collapsed');
+    if (collapsed || day.tasks) return;
+
+    day.content.innerHTML = '<p class="day-status">Loading tasks...</p>';
+    loadDay(day).catch(() => {
+        day.content.innerHTML =
+            '<p class="day-status">Could not load tasks for this day. Collapse and expand to retry.</p>';
+    });
+}
+
+function fetchChunk(day) {
+    return fetch(day.chunk).then(response => {
+        if (!response.ok) throw new Error(`Failed to load ${day.chunk}`);
+        return response.json();
+    });
+}
+
+function loadDay(day) {
+    if (!day.loading) {
+        day.loading = fetchChunk(day)
+            .then(chunk => {
+                day.content.innerHTML = chunk.html;
+                day.tasks = decodeTasks(chunk.tasks, day);
+                hydrateDay(day);
+                updateTaskStats();
+            });
+        day.loading.catch(() => { day.loading = null; });
+    }
+    return day.loading;
+}
+
+function hydrateDay(day) {
+    taskData.tasks.push(...day.tasks);
+
+    const rooms = new Map();
+    day.content.querySelectorAll('.room-section').forEach(section => {
+        rooms.set(section.dataset.room, createRoomState(section));
+    });
+
+    const roomCategories = new Map();
+    day.tasks.forEach(task => {
+        const room = rooms.get(task.room);
+        room.tasks.push(task);
+        if (!roomCategories.has(room)) roomCategories.set(room, new Set());
+        roomCategories.get(room).add(task.category);
+        taskIndex.set(task.id, { task: task, room: room, element: null });
+    });
+    roomCategories.forEach((categories, room) => { room.categories = Array.from(categories); });
+
+    // The markup shows the generated plan, so only tasks with saved state
+    // that differs from it need their row touched
+    applySavedState(day).forEach(({ task, wasCompleted, wasAssignee }) => {
+        const entry = taskIndex.get(task.id);
+        if (task.completed !== wasCompleted) {
+            const delta = task.completed ? 1 : -1;
+            entry.room.completed += delta;
+            // Saved state of inline days is counted here rather than up front
+            if (day.rows) completedCount += delta;
+        }
+        if (entry.room.virtual) return;
+
+        const element = taskElement(entry);
+        element.classList.toggle('completed', task.completed);
+        element.querySelector('input[type="checkbox"]').checked = task.completed;
+        if (task.assignee !== wasAssignee) {
+            element.querySelector('select').value = task.assignee;
+            moveTaskElement(entry, wasAssignee);
+        }
+    });
+
+    rooms.forEach(updateRoomProgress);
+}
+
+function createRoomState(section) {
+    const roomState = {
+        section: section,
+        completed: Number(section.dataset.completed),
+        total: Number(section.dataset.total),
+        progressText: section.querySelector('.room-progress'),
+        columns: {},
+        groups: {},
+        categories: [],
+        tasks: [],
+        virtual: section.classList.contains('virtual') ? {} : null,
+        built: false
+    };
+    section.querySelectorAll('.person-column').forEach(column => {
+        roomState.columns[column.dataset.assignee] = column;
+        column.querySelectorAll('.category-group').forEach(group => {
+            roomState.groups[groupKey(column.dataset.assignee, group.dataset.category)] = group;
+        });
+    });
+    roomStates.set(section, roomState);
+    return roomState;
+}
+
+function taskElement(entry) {
+    if (!entry.element || !entry.element.isConnected) {
+        entry.element = entry.room.section.querySelector(
+            `.task-item[data-task-id="${CSS.escape(entry.task.id)}"]`);
+    }
+    return entry.element;
+}
+
+function groupKey(assignee, category) {
+    return `${assignee}\u0000${category}`;
+}
+
+// Same markup as render_category_group() in page_markup.py
+function createCategoryGroup(category) {
+    const group = document.createElement('div');
+    group.className = 'category-group';
+    group.dataset.category = category;
+
+    const header = document.createElement('div');
+    header.className = 'category-header';
+    header.textContent = category;
+
+    group.appendChild(header);
+    return group;
+}
+
+function updateRoomProgress(roomState) {
+    const { completed, total } = roomState;
+    const progress = total > 0 ? Math.round((completed / total) * 100) : 0;
+    roomState.progressText.textContent = `(${completed}/${total} - ${progress}%)`;
+}
+
+function moveTaskElement(entry, previousAssignee) {
+    const { task, room } = entry;
+    const element = taskElement(entry);
+    const key = groupKey(task.assignee, task.category);
+    let group = room.groups[key];
+
+    if (!group) {
+        group = createCategoryGroup(task.category);
+        room.groups[key] = group;
+        // Keep categories in the same order as the other column
+        const later = room.categories
+            .slice(room.categories.indexOf(task.category) + 1)
+            .map(category => room.groups[groupKey(task.assignee, category)])
+            .find(Boolean);
+        room.columns[task.assignee].insertBefore(group, later || null);
+    }
+
+    const next = Array.from(group.querySelectorAll('.task-item'))
+        .find(row => taskIndex.get(row.dataset.taskId).task.order > task.order);
+    group.insertBefore(element, next || null);
+
+    const oldKey = groupKey(previousAssignee, task.category);
+    const oldGroup = room.groups[oldKey];
+    if (oldGroup && !oldGroup.querySelector('.task-item')) {
+        oldGroup.remove();
+        delete room.groups[oldKey];
+    }
+}
+
+function toggleRoom(header) {
+    header.classList.toggle('active');
+    const content = header.nextElementSibling;
+    content.classList.toggle('active');
+
+    const room = roomStates.get(header.parentElement);
+    if (room && room.virtual && !room.built) buildVirtualRoom(room);
+}
+
+// Virtual rooms keep one windowed list per person column: a flat array of
+// category headers and tasks, of which only the rows near the visible part
+// of the column's viewport exist in the DOM.
+function buildVirtualRoom(room) {
+    Object.entries(room.columns).forEach(([assignee, column]) => {
+        const viewport = column.querySelector('.virtual-viewport');
+        const list = {
+            viewport: viewport,
+            spacer: viewport.querySelector('.virtual-spacer'),
+            items: [],
+            rendered: new Map(),
+            frame: 0
+        };
+        viewport.addEventListener('scroll', () => {
+            if (!list.frame) {
+                list.frame = requestAnimationFrame(() => {
+                    list.frame = 0;
+                    renderVirtualList(list);
+                });
+            }
+        });
+        room.virtual[assignee] = list;
+    });
+    room.built = true;
+    refreshVirtualRoom(room);
+}
+
+function refreshVirtualRoom(room) {
+    const buckets = new Map();
+    room.tasks.forEach(task => {
+        const key = groupKey(task.assignee, task.category);
+        if (!buckets.has(key)) buckets.set(key, []);
+        buckets.get(key).push(task);
+    });
+
+    Object.entries(room.virtual).forEach(([assignee, list]) => {
+        list.items = [];
+        room.categories.forEach(category => {
+            const tasks = buckets.get(groupKey(assignee, category));
+            if (!tasks) return;
+            list.items.push({ category: category });
+            tasks.sort((a, b) => (a.order || 0) - (b.order || 0));
+            tasks.forEach(task => list.items.push({ task: task }));
+        });
+
+        list.rendered.forEach(element => element.remove());
+        list.rendered.clear();
+        const height = list.items.length * VIRTUAL_ROW_HEIGHT;
+        list.spacer.style.height = `${height}px`;
+        list.viewport.style.height = `${Math.min(height, VIRTUAL_VIEWPORT_HEIGHT)}px`;
+        renderVirtualList(list);
+    });
+}
+
+function renderVirtualList(list) {
+    const { viewport, items, rendered } = list;
+    const first = Math.max(0, Math.floor(viewport.scrollTop / VIRTUAL_ROW_HEIGHT) - VIRTUAL_OVERSCAN);
+    const last = Math.min(items.length,
+        Math.ceil((viewport.scrollTop + viewport.clientHeight) / VIRTUAL_ROW_HEIGHT) + VIRTUAL_OVERSCAN);
+
+    rendered.forEach((element, index) => {
+        if (index < first || index >= last) {
+            element.remove();
+            rendered.delete(index);
+        }
+    });
+
+    for (let index = first; index < last; index++) {
+        if (rendered.has(index)) continue;
+        const item = items[index];
+        let element;
+        if (item.task) {
+            element = createTaskRow(item.task);
+            taskIndex.get(item.task.id).element = element;
+        } else {
+            element = document.createElement('div');
+            element.className = 'category-header';
+            element.textContent = item.category;
+        }
+        element.style.top = `${index * VIRTUAL_ROW_HEIGHT}px`;
+        viewport.appendChild(element);
+        rendered.set(index, element);
+    }
+}
+
+// Same markup as render_task() in page_markup.py
+function createTaskRow(task) {
+    const row = document.createElement('div');
+    row.className = 'task-item';
+    row.classList.toggle('completed', task.completed);
+    row.dataset.taskId = task.id;
+
+    const checkbox = document.createElement('input');
+    checkbox.type = 'checkbox';
+    checkbox.autocomplete = 'off';
+    checkbox.checked = task.completed;
+
+    const text = document.createElement('div');
+    text.className = 'task-text';
+    text.textContent = `${task.icon} ${task.description}`;
+
+    const select = document.createElement('select');
+    select.className = 'task-assignee-select';
+    select.autocomplete = 'off';
+    ['Andie', 'Brad'].forEach(person => select.add(new Option(person, person)));
+    select.value = task.assignee;
+
+    row.appendChild(checkbox);
+    row.appendChild(text);
+    row.appendChild(select);
+    return row;
+}
+
+function toggleTask(taskId) {
+    const entry = taskIndex.get(taskId);
+    if (!entry) return;
+
+    const { task, room } = entry;
+    task.completed = !task.completed;
+    setSavedField(task.id, 'c', task.completed, task.planCompleted);
+
+    const element = taskElement(entry);
+    if (element) {
+        element.classList.toggle('completed', task.completed);
+        element.querySelector('input[type="checkbox"]').checked = task.completed;
+    }
+
+    const delta = task.completed ? 1 : -1;
+    room.completed += delta;
+    completedCount += delta;
+    updateRoomProgress(room);
+    updateTaskStats();
+}
+
+function reassignTask(taskId, newAssignee) {
+    const entry = taskIndex.get(taskId);
+    if (!entry || entry.task.assignee === newAssignee) return;
+
+    const previousAssignee = entry.task.assignee;
+    entry.task.assignee = newAssignee;
+    setSavedField(entry.task.id, 'a', newAssignee, entry.task.planAssignee);
+
+    if (entry.room.virtual) {
+        refreshVirtualRoom(entry.room);
+    } else {
+        moveTaskElement(entry, previousAssignee);
+    }
+}
+
+function readLocalRecords() {
+    const entries = [];
+    for (let i = 0; i < localStorage.length; i++) {
+        const key = localStorage.key(i);
+        if (key.startsWith(TASK_STATE_PREFIX)) {
+            entries.push([key.slice(TASK_STATE_PREFIX.length), JSON.parse(localStorage.getItem(key))]);
+        }
+    }
+    return entries;
+}
+
+const localStorageBackend = {
+    load() {
+        return Promise.resolve(readLocalRecords());
+    },
+
+    write(changes) {
+        changes.forEach(([id, record]) => {
+            if (record) {
+                localStorage.setItem(TASK_STATE_PREFIX + id, JSON.stringify(record));
+            } else {
+                localStorage.removeItem(TASK_STATE_PREFIX + id);
+            }
+        });
+        return Promise.resolve();
+    }
+};
+
+// Used for large plans: one record per task, written in a single transaction
+const indexedDbBackend = {
+    db: null,
+
+    // Without `create`, fails instead of creating a database that isn't there
+    load(create = true) {
+        return new Promise((resolve, reject) => {
+            const request = indexedDB.open('moving-planner', 1);
+            request.onupgradeneeded = () => {
+                if (create) {
+                    request.result.createObjectStore('tasks');
+                } else {
+                    request.transaction.abort();
+                }
+            };
+            request.onsuccess = () => resolve(request.result);
+            request.onerror = () => reject(request.error);
+        }).then(db => {
+            this.db = db;
+            return new Promise((resolve, reject) => {
+                const transaction = db.transaction('tasks');
+                const store = transaction.objectStore('tasks');
+                const keys = store.getAllKeys();
+                const records = store.getAll();
+                transaction.oncomplete = () => resolve(keys.result.map((id, i) => [id, records.result[i]]));
+                transaction.onerror = () => reject(transaction.error);
+            });
+        });
+    },
+
+    write(changes) {
+        return new Promise((resolve, reject) => {
+            const transaction = this.db.transaction('tasks', 'readwrite');
+            const store = transaction.objectStore('tasks');
+            changes.forEach(([id, record]) => {
+                if (record) {
+                    store.put(record, id);
+                } else {
+                    store.delete(id);
+                }
+            });
+            transaction.oncomplete = () => resolve();
+            transaction.onerror = () => reject(transaction.error);
+        });
+    },
+
+    clear() {
+        return new Promise((resolve, reject) => {
+            const transaction = this.db.transaction('tasks', 'readwrite');
+            transaction.objectStore('tasks').clear();
+            transaction.oncomplete = () => resolve();
+            transaction.onerror = () => reject(transaction.error);
+        });
+    }
+};
+
+// Records left in IndexedDB by a larger plan, or none
+function readIndexedDbRecords() {
+    if (stateBackend !== localStorageBackend || !window.indexedDB) return Promise.resolve([]);
+    return indexedDbBackend.load(false).catch(() => []);
+}
+
+function loadSavedState() {
+    const useIndexedDb = taskData.totalTasks >= INDEXED_DB_THRESHOLD && window.indexedDB;
+    stateBackend = useIndexedDb ? indexedDbBackend : localStorageBackend;
+
+    return stateBackend.load()
+        .catch(() => {
+            stateBackend = localStorageBackend;
+            return stateBackend.load();
+        })
+        .then(entries => {
+            entries.forEach(([id, record]) => savedState.set(id, record));
+            return readIndexedDbRecords();
+        })
+        .then(indexedDbRecords => {
+            const legacy = Object.values(LEGACY_STATE_KEYS).some(key => localStorage.getItem(key) !== null);
+            const completions = Array.from(savedState.values()).some(record => record.c !== undefined);
+            return loadPlanAssignees(legacy || completions || indexedDbRecords.length > 0)
+                .then(planAssignees => [indexedDbRecords, planAssignees]);
+        })
+        .then(([indexedDbRecords, planAssignees]) => {
+            const legacyKeys = migrateLegacyState(indexedDbRecords, planAssignees);
+            pruneSyncedState();
+
+            // Days fetched later are counted up front: a saved completion always
+            // differs from the plan, so it moves the count by one. Pages that
+            // ship every day inline (the per-assignee and per-day pages) count
+            // as they hydrate and ignore state saved for tasks they don't show.
+            if (taskData.days.some(day => !day.rows)) {
+                const inlineIds = new Set();
+                taskData.days.filter(day => day.rows).forEach(day => {
+                    day.tasks.forEach(task => inlineIds.add(task.id));
+                });
+                savedState.forEach((record, id) => {
+                    if (record.c === undefined || inlineIds.has(id)) return;
+                    // Tasks dropped from the plan since the state was saved
+                    if (planAssignees && !planAssignees.has(id)) return;
+                    completedCount += record.c ? 1 : -1;
+                });
+            }
+
+            document.addEventListener('visibilitychange', () => {
+                if (document.visibilityState === 'hidden') flushSavedState();
+            });
+            window.addEventListener('pagehide', flushSavedState);
+
+            if (dirtyIds.size > 0 || indexedDbRecords.length > 0) {
+                return flushSavedState().then(() => {
+                    legacyKeys.forEach(key => localStorage.removeItem(key));
+                    if (indexedDbRecords.length > 0) return indexedDbBackend.clear();
+                });
+            }
+        });
+}
+
+// Task id -> plan assignee for every task in the plan: inline days know
+// theirs, the search index lists the rest. Null when that is not `needed`,
+// or when the index cannot be loaded.
+function loadPlanAssignees(needed) {
+    const assignees = new Map();
+    taskData.days.filter(day => day.rows).forEach(day => {
+        day.tasks.forEach(task => assignees.set(task.id, task.planAssignee));
+    });
+    if (taskData.days.every(day => day.rows)) return Promise.resolve(assignees);
+    if (!needed || !plan.search) return Promise.resolve(null);
+
+    return loadSearchIndex()
+        .then(() => {
+            searchIndex.docs.forEach((doc, i) => assignees.set(searchDocId(i), plan.assignees[doc[4]]));
+            return assignees;
+        })
+        .catch(() => null);
+}
+
+// Imports the old whole-map taskCompletions/taskAssignments keys, and the
+// records of the other backend: per-task localStorage records when the plan
+// has grown onto IndexedDB, `indexedDbRecords` when it is back on
+// localStorage. Legacy entries are only imported for tasks still in the
+// plan (`planAssignees`, when known), and assignees only where they differ
+// from it. Entries that turn out to match the plan are pruned as their day
+// loads.
+function migrateLegacyState(indexedDbRecords, planAssignees) {
+    const migratedKeys = [];
+    const importField = (id, field, value) => {
+        const record = savedState.get(id) || {};
+        if (record[field] !== undefined) return;
+        record[field] = value;
+        savedState.set(id, record);
+        dirtyIds.add(id);
+    };
+
+    Object.entries(LEGACY_STATE_KEYS).forEach(([field, key]) => {
+        const saved = localStorage.getItem(key);
+        if (saved === null) return;
+        // The old assignment map held every task: without the plan's
+        // assignees the real reassignments can't be told apart, so wait
+        if (field === 'a' && !planAssignees) return;
+        Object.entries(JSON.parse(saved)).forEach(([id, value]) => {
+            // Nothing was completed in plans of that era, so false is the plan value
+            if (!value) return;
+            if (planAssignees && !planAssignees.has(id)) return;
+            if (field === 'a' && value === planAssignees.get(id)) return;
+            importField(id, field, value);
+        });
+        migratedKeys.push(key);
+    });
+
+    if (stateBackend !== localStorageBackend) {
+        readLocalRecords().forEach(([id, record]) => {
+            Object.entries(record).forEach(([field, value]) => importField(id, field, value));
+            migratedKeys.push(TASK_STATE_PREFIX + id);
+        });
+    }
+    indexedDbRecords.forEach(([id, record]) => {
+        Object.entries(record).forEach(([field, value]) => importField(id, field, value));
+    });
+    return migratedKeys;
+}
+
+function setSavedField(id, field, value, planValue, time = Date.now()) {
+    const record = savedState.get(id) || {};
+    if (value === planValue) {
+        delete record[field];
+    } else {
+        record[field] = value;
+    }
+    if (time !== undefined) {
+        record[field + 't'] = time;
+    } else {
+        delete record[field + 't'];
+    }
+
+    if (Object.keys(record).length > 0) {
+        savedState.set(id, record);
+    } else {
+        savedState.delete(id);
+    }
+    dirtyIds.add(id);
+
+    // Coalesce bursts of clicks into one write
+    clearTimeout(saveTimer);
+    saveTimer = setTimeout(flushSavedState, SAVE_DEBOUNCE_MS);
+}
+
+function flushSavedState() {
+    clearTimeout(saveTimer);
+    if (dirtyIds.size === 0) return Promise.resolve();
+
+    const changes = Array.from(dirtyIds, id => [id, savedState.get(id) || null]);
+    dirtyIds.clear();
+    return stateBackend.write(changes);
+}
+
+function deviceId() {
+    if (!device) {
+        device = localStorage.getItem(DEVICE_KEY);
+        if (!device) {
+            device = Math.random().toString(36).slice(2, 10);
+            localStorage.setItem(DEVICE_KEY, device);
+        }
+    }
+    return device;
+}
+
+// Changes this device made before its last export are part of the plan once
+// merge_progress.py has merged that export; only later ones stay local.
+function pruneSyncedState() {
+    const syncedAt = plan.synced[deviceId()];
+    if (syncedAt === undefined) return;
+
+    savedState.forEach((record, id) => {
+        PROGRESS_FIELDS.forEach(field => {
+            if (!(field in record) && !(field + 't' in record)) return;
+            if ((record[field + 't'] || 0) > syncedAt) return;
+            delete record[field];
+            delete record[field + 't'];
+            dirtyIds.add(id);
+        });
+        if (Object.keys(record).length === 0) savedState.delete(id);
+    });
+}
+
+// Tasks by id, for the days that are loaded plus, with `all`, the rows of
+// the other days' chunks (decoded only, nothing is rendered)
+function planTasks(all) {
+    const tasks = new Map();
+    taskIndex.forEach((entry, id) => tasks.set(id, entry.task));
+    if (!all) return Promise.resolve(tasks);
+
+    return Promise.all(taskData.days.filter(day => !day.tasks).map(day => fetchChunk(day).then(chunk => {
+        decodeTasks(chunk.tasks, day).forEach(task => tasks.set(task.id, task));
+    }))).then(() => tasks);
+}
+
+// Downloads this device's changes as an operation log for merge_progress.py:
+// [task id, field, value, time]. A field changed and set back exports the
+// plan value the device shows, so it cannot lose to an older merged change.
+function exportProgress() {
+    const button = document.getElementById('exportProgress');
+    flushSavedState();
+    const setBack = Array.from(savedState.values()).some(record =>
+        PROGRESS_FIELDS.some(field => !(field in record) && field + 't' in record));
+
+    planTasks(setBack).then(tasks => {
+        const ops = [];
+        savedState.forEach((record, id) => {
+            PROGRESS_FIELDS.forEach(field => {
+                if (!(field in record) && !(field + 't' in record)) return;
+                let value = record[field];
+                if (value === undefined) {
+                    // Tasks no longer in the plan have no value to go back to
+                    if (!tasks.has(id)) return;
+                    value = tasks.get(id)[PLAN_FIELDS[field]];
+                }
+                // Changes imported from the old storage keys carry no time
+                ops.push([id, field, value, record[field + 't'] || 0]);
+            });
+        });
+        downloadProgressLog(ops);
+        button.textContent = 'Export progress';
+    }).catch(() => {
+        // A day's chunk could not be loaded, e.g. offline before it was cached
+        button.textContent = 'Export failed, try again';
+    });
+}
+
+function downloadProgressLog(ops) {
+    const log = {
+        format: PROGRESS_LOG_FORMAT,
+        version: 1,
+        device: deviceId(),
+        exported_at: Date.now(),
+        ops: ops
+    };
+    const link = document.createElement('a');
+    link.href = URL.createObjectURL(new Blob([JSON.stringify(log)], { type: 'application/json' }));
+    link.download = `progress-${log.device}-${localDateString(new Date())}.json`;
+    document.body.appendChild(link);
+    link.click();
+    link.remove();
+    setTimeout(() => URL.revokeObjectURL(link.href), 0);
+}
+
+// Returns the tasks whose saved state differs from the generated plan
+function applySavedState(day) {
+    const changed = [];
+    day.tasks.forEach(task => {
+        const record = savedState.get(task.id);
+        if (!record) return;
+
+        const wasCompleted = task.completed;
+        const wasAssignee = task.assignee;
+        const { c: completed, a: assignee } = record;
+
+        if (completed !== undefined) {
+            if (completed === task.planCompleted) {
+                // Saved before the plan caught up; it no longer differs
+                if (!day.rows) completedCount -= completed ? 1 : -1;
+                setSavedField(task.id, 'c', completed, task.planCompleted, record.ct);
+            }
+            task.completed = completed;
+        }
+        if (assignee !== undefined) {
+            if (assignee === task.planAssignee) {
+                setSavedField(task.id, 'a', assignee, task.planAssignee, record.at);
+            }
+            task.assignee = assignee;
+        }
+
+        if (task.completed !== wasCompleted || task.assignee !== wasAssignee) {
+            changed.push({ task: task, wasCompleted: wasCompleted, wasAssignee: wasAssignee });
+        }
+    });
+    return changed;
+}
+
+// Mirrors tokenize() in search_index.py
+function tokenize(text) {
+    return text.toLowerCase().match(/[\p{L}\p{N}_]+/gu) || [];
+}
+
+function attachSearch() {
+    if (!plan.search) return;
+    const input = document.getElementById('taskSearch');
+    const results = document.getElementById('searchResults');
+    document.getElementById('taskSearchBox').hidden = false;
+
+    // The index is only fetched once someone starts searching
+    input.addEventListener('focus', () => loadSearchIndex().catch(() => {}));
+    input.addEventListener('input', () => {
+        loadSearchIndex()
+            .then(() => showSearchResults(input.value))
+            .catch(() => {
+                results.innerHTML = '<p class="search-status">Could not load the search index.</p>';
+            });
+    });
+    results.addEventListener('click', event => {
+        const result = event.target.closest('.search-result');
+        if (result) {
+            const doc = Number(result.dataset.doc);
+            revealTask(taskData.days[searchIndex.docs[doc][0]], searchDocId(doc));
+        }
+    });
+}
+
+function loadSearchIndex() {
+    if (!searchLoading) {
+        searchLoading = fetch(plan.search)
+            .then(response => {
+                if (!response.ok) throw new Error(`Failed to load ${plan.search}`);
+                return response.json();
+            })
+            .then(index => { searchIndex = index; });
+        searchLoading.catch(() => { searchLoading = null; });
+    }
+    return searchLoading;
+}
+
+// Documents whose tokens start with every word of the query, in plan order
+function searchTasks(words) {
+    let matches = null;
+    for (const word of words) {
+        const docs = prefixDocs(word);
+        matches = matches ? matches.filter(doc => docs.has(doc)) : Array.from(docs).sort((a, b) => a - b);
+        if (matches.length === 0) break;
+    }
+    return matches;
+}
+
+function prefixDocs(prefix) {
+    const { tokens, postings } = searchIndex;
+    // Tokens are sorted, so the ones sharing a prefix form one run
+    let low = 0;
+    let high = tokens.length;
+    while (low < high) {
+        const middle = (low + high) >> 1;
+        if (tokens[middle] < prefix) low = middle + 1;
+        else high = middle;
+    }
+
+    const docs = new Set();
+    for (let i = low; i < tokens.length && tokens[i].startsWith(prefix); i++) {
+        let doc = 0;
+        postings[i].forEach(gap => {
+            doc += gap;
+            docs.add(doc);
+        });
+    }
+    return docs;
+}
+
+function searchDocId(doc) {
+    const [, room, category, type] = searchIndex.docs[doc];
+    return `${plan.rooms[room]}_${plan.categories[category]}_${plan.types[type][0]}`;
+}
+
+function showSearchResults(query) {
+    const results = document.getElementById('searchResults');
+    results.replaceChildren();
+    const words = tokenize(query);
+    if (words.length === 0) return;
+
+    const docs = searchTasks(words);
+    if (docs.length === 0) {
+        results.innerHTML = '<p class="search-status">No matching tasks.</p>';
+        return;
+    }
+
+    docs.slice(0, SEARCH_RESULT_LIMIT).forEach(doc => {
+        const [dayIndex, room, category, type] = searchIndex.docs[doc];
+        const [typeName, typeIcon] = plan.types[type];
+        // Days that are already loaded know the full description
+        const entry = taskIndex.get(searchDocId(doc));
+
+        const result = document.createElement('button');
+        result.type = 'button';
+        result.className = 'search-result';
+        result.dataset.doc = doc;
+        result.textContent = entry
+            ? `${entry.task.icon} ${entry.task.description}`
+            : `${typeIcon} ${plan.categories[category]} (${typeName})`;
+
+        const where = document.createElement('div');
+        where.className = 'search-where';
+        where.textContent = `${plan.rooms[room]} · ${taskData.days[dayIndex].label}`;
+        result.appendChild(where);
+        results.appendChild(result);
+    });
+
+    if (docs.length > SEARCH_RESULT_LIMIT) {
+        const more = document.createElement('p');
+        more.className = 'search-status';
+        more.textContent = `${docs.length - SEARCH_RESULT_LIMIT} more matches. Keep typing to narrow them down.`;
+        results.appendChild(more);
+    }
+}
+
+// Opens the task's day and room (loading the day if needed) and scrolls to it
+function revealTask(day, taskId) {
+    if (day.element.classList.contains('collapsed')) toggleDay(day);
+
+    (day.tasks ? Promise.resolve() : loadDay(day)).then(() => {
+        const entry = taskIndex.get(taskId);
+        if (!entry) return;
+
+        const header = entry.room.section.querySelector('.room-header');
+        if (!header.classList.contains('active')) toggleRoom(header);
+        if (entry.room.virtual) {
+            const list = entry.room.virtual[entry.task.assignee];
+            const index = list.items.findIndex(item => item.task === entry.task);
+            list.viewport.scrollTop = Math.max(0, (index + 0.5) * VIRTUAL_ROW_HEIGHT - VIRTUAL_VIEWPORT_HEIGHT / 2);
+            renderVirtualList(list);
+        }
+
+        const element = taskElement(entry);
+        scrollToRow(element, 5);
+        element.classList.add('search-hit');
+        setTimeout(() => element.classList.remove('search-hit'), 2000);
+    }).catch(() => {});
+}
+
+// Rooms rendered on the way in (content-visibility) only get their real
+// height once the frame lays out and can shift the row, so the scroll is
+// repeated for a few frames
+function scrollToRow(element, frames) {
+    element.scrollIntoView({ block: 'center' });
+    if (frames > 1) requestAnimationFrame(() => scrollToRow(element, frames - 1));
+}
+
+function attachBoxLookup() {
+    if (boxIndex.size === 0) return;
+    const input = document.getElementById('boxLookup');
+    const result = document.getElementById('boxResult');
+    document.getElementById('boxLookupBox').hidden = false;
+
+    // Scanners type the code and press Enter, which fires input as well
+    input.addEventListener('input', () => showBox(input.value));
+    result.addEventListener('click', event => {
+        const button = event.target.closest('[data-day]');
+        if (button) revealTask(taskData.days[Number(button.dataset.day)], button.dataset.task);
+    });
+}
+
+// Box IDs are PREFIX-NNN with NNN from 1 to the category's box count
+function findBox(value) {
+    const match = /^(.+)-(\d+)$/.exec(value.trim().toUpperCase());
+    if (!match) return null;
+    const entry = boxIndex.get(match[1]);
+    const number = Number(match[2]);
+    if (!entry || number < 1 || number > entry[5]) return null;
+    return { id: `${match[1]}-${match[2].padStart(3, '0')}`, number: number, entry: entry };
+}
+
+function showBox(value) {
+    const result = document.getElementById('boxResult');
+    result.replaceChildren();
+    if (value.trim() === '') return;
+
+    const box = findBox(value);
+    if (!box) {
+        result.innerHTML = '<p class="search-status">No box with that ID.</p>';
+        return;
+    }
+
+    const [room, category, boxType, flags, destination, count, day] = box.entry;
+    const handling = [(flags & FLAG_HEAVY) && 'heavy', (flags & FLAG_FRAGILE) && 'fragile'].filter(Boolean);
+    const title = document.createElement('div');
+    title.className = 'box-title';
+    title.textContent = `📦 ${box.id} · ${plan.rooms[room]} › ${plan.categories[category]}`;
+
+    const details = document.createElement('div');
+    details.className = 'search-where';
+    details.textContent = [`Box ${box.number} of ${count}`, plan.box_types[boxType]]
+        .concat(handling, [`goes to ${plan.rooms[destination]}`]).join(' · ');
+    result.append(title, details);
+
+    if (day >= 0) {
+        const show = document.createElement('button');
+        show.type = 'button';
+        show.className = 'search-result';
+        show.dataset.day = day;
+        show.dataset.task = `${plan.rooms[room]}_${plan.categories[category]}_packing`;
+        show.textContent = 'Show packing task';
+        result.appendChild(show);
+    }
+}
+
+function updateTaskStats() {
+    const completed = completedCount;
+    const total = taskData.totalTasks;
+    const percentage = total > 0 ? Math.round((completed / total) * 100) : 0;
+
+    document.getElementById('taskStats').textContent =
+        `${completed} of ${total} tasks completed (${percentage}%)`;
+    document.getElementById('taskProgress').style.width = `${percentage}%`;
+}
+
+function updateStats() {
+    const moveDate = new Date('2025-10-26');
+    const today = new Date();
+    const daysUntil = Math.ceil((moveDate - today) / (1000 * 60 * 60 * 24));
+    document.getElementById('daysUntilMove').textContent = daysUntil > 0 ? daysUntil : '0';
+
+    document.getElementById('totalTasks').textContent = taskData.totalTasks;
+    document.getElementById('totalRooms').textContent = taskData.roomCount;
+
+    const totalBoxes = Object.values(taskData.totals).reduce((sum, count) => sum + count, 0);
+    document.getElementById('totalBoxes').textContent = totalBoxes;
+}
+
+document.addEventListener('DOMContentLoaded', init);
+
+// Keeps the page and every day chunk available offline (see sw.js)
+if ('serviceWorker' in navigator) {
+    window.addEventListener('load', () => navigator.serviceWorker.register('sw.js'));
+}
@@ -0,0 +1,70 @@
+// Offline cache for the generated site. generate_static.py fills in the
+// precache manifest name, so this file only changes when an artifact does.
+const MANIFEST_URL = '$manifest_url';
+const PRECACHE = 'moving-planner-$cache_version';
+const PAGE_CACHE = 'moving-planner-pages';
+const PAGE_URL = new URL('./', self.location).href;
+
+self.addEventListener('install', event => {
+    event.waitUntil(
+        fetch(MANIFEST_URL)
+            .then(response => response.json())
+            .then(manifest => caches.open(PRECACHE)
+                .then(cache => cache.addAll(manifest.files))
+                // Refresh the pages too, so they never point at a previous build's assets
+                .then(() => caches.open(PAGE_CACHE))
+                .then(cache => cache.addAll([PAGE_URL].concat(manifest.pages.map(page => new URL(page, PAGE_URL).href))))
+            )
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil(
+        caches.keys()
+            .then(keys => Promise.all(keys
+                .filter(key => key !== PRECACHE && key !== PAGE_CACHE)
+                .map(key => caches.delete(key))))
+            .then(() => self.clients.claim())
+    );
+});
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (request.method !== 'GET' || new URL(request.url).origin !== self.location.origin) return;
+
+    if (request.mode === 'navigate') {
+        event.respondWith(staleWhileRevalidate(event));
+        return;
+    }
+
+    // Everything else is content-hashed, so a cached copy is always current
+    event.respondWith(caches.match(request).then(cached => cached || fetch(request)));
+});
+
+// The full plan is cached under the directory URL, whichever way it is opened
+function pageKey(url) {
+    const key = new URL(url);
+    key.search = '';
+    key.hash = '';
+    if (key.pathname.endsWith('/index.html')) key.pathname = key.pathname.slice(0, -'index.html'.length);
+    return key.href;
+}
+
+// Serves the cached page at once and stores a fresh copy for the next visit
+function staleWhileRevalidate(event) {
+    const key = pageKey(event.request.url);
+    const cache = caches.open(PAGE_CACHE);
+    const network = fetch(event.request).then(response => {
+        if (response.ok) {
+            const copy = response.clone();
+            cache.then(pageCache => pageCache.put(key, copy));
+        }
+        return response;
+    });
+    event.waitUntil(network.catch(() => null));
+
+    return cache
+        .then(pageCache => pageCache.match(key))
+        .then(cached => cached || network);
+}
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Engine Verification
+Checks a calculator or task generator against the reference engine, the
+frozen copies of MovingCalculator.calculate_all() and
+TaskGenerator.generate_all_tasks() in reference_engine.py, on randomized
+configs and inputs. By default the live MovingCalculator and TaskGenerator
+are checked.
+
+Each case is built from a seed: rooms on random floors and priorities
+(some staging-only), categories of every box type, and volumes that are
+zero, fractional, whole or missing. The candidate must reproduce the room
+and grand totals, the priority order, every task (fields, order and day)
+and the task counts exactly; only timestamps are ignored, and fields the
+reference does not have (added to the engines since) are not compared.
+The candidate generator is fed the reference calculation, so a mismatch
+points at one engine. Reference and candidate are timed on the same cases.
+
+Put faster engines in their own modules, e.g.
+
+    python3 verify_engine.py --calculator fast_calc:FastCalculator --cases 200
+"""
+
+import argparse
+import copy
+import importlib
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+REFERENCE_CALCULATOR = 'reference_engine:ReferenceCalculator'
+REFERENCE_GENERATOR = 'reference_engine:ReferenceTaskGenerator'
+LIVE_CALCULATOR = 'calculator:MovingCalculator'
+LIVE_GENERATOR = 'task_generator:TaskGenerator'
+BOX_TYPES = ['small', 'medium', 'large', 'wardrobe']
+# Names that exercise the laundry and staging-area rules
+ROOM_NAMES = ['Bedroom', 'In-Law Bedroom', 'Garage', 'Kitchen', 'Office', 'Lounge', 'Grow Room']
+CATEGORY_NAMES = ['Clothes', 'Linens & Towels', 'Bedding', 'Books', 'Dishes', 'Tools', 'Decor', 'Electronics']
+VOLATILE_KEYS = ('timestamp', 'generated_at')
+
+
+def load_engine(spec):
+    module_name, _, class_name = spec.partition(':')
+    if not class_name:
+        raise ValueError(f"Engine must be given as module:Class, got '{spec}'")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def random_config(rng, max_rooms):
+    box_sizes = {box_type: round(rng.uniform(0.5, 10), 2) for box_type in BOX_TYPES}
+    formulas = {
+        'box_sizes': box_sizes,
+        'buffer_percentage': rng.choice([0, 0.05, 0.08, 0.125, 0.3]),
+        'packing_efficiency': {box_type: round(rng.uniform(0.5, 1), 3) for box_type in BOX_TYPES}
+    }
+
+    rooms = {}
+    for index in range(rng.randint(1, max_rooms)):
+        name = ROOM_NAMES[index] if index < len(ROOM_NAMES) else f"Room {index}"
+        staging_only = rng.random() < 0.1
+        room = {
+            'floor': rng.randint(0, 3),
+            'priority': rng.randint(0, 9),
+            'categories': []
+        }
+        if staging_only:
+            room['staging_only'] = True
+        for category in rng.sample(CATEGORY_NAMES, rng.randint(0, len(CATEGORY_NAMES))):
+            entry = {'name': category, 'box_type': rng.choice(BOX_TYPES)}
+            if rng.random() < 0.3:
+                entry['heavy'] = True
+            if rng.random() < 0.3:
+                entry['fragile'] = rng.random() < 0.5
+            room['categories'].append(entry)
+        if rng.random() < 0.2:
+            del room['priority']
+        rooms[name] = room
+    return rooms, formulas
+
+
+def random_inputs(rng, rooms):
+    inputs = {}
+    for room_name, room in rooms.items():
+        for category in room['categories']:
+            roll = rng.random()
+            if roll < 0.15:
+                continue
+            if roll < 0.3:
+                volume = 0
+            elif roll < 0.65:
+                volume = round(rng.uniform(0.01, 60), rng.randint(1, 3))
+            else:
+                volume = rng.randint(1, 60)
+            inputs[f"{room_name}_{category['name']}"] = volume
+    return inputs
+
+
+def write_case(data_dir, rooms, formulas, templates):
+    for filename, data in [('rooms_config.json', rooms),
+                           ('calculation_formulas.json', formulas),
+                           ('task_templates.json', templates)]:
+        with open(os.path.join(data_dir, filename), 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+
+def normalize(result):
+    """Drop timestamps and turn tuples into lists, as a JSON round trip would."""
+    result = {key: value for key, value in result.items() if key not in VOLATILE_KEYS}
+    return json.loads(json.dumps(result))
+
+
+def first_difference(expected, actual, path='$'):
+    if type(expected) is not type(actual):
+        return f"{path}: expected {expected!r}, got {actual!r}"
+    if isinstance(expected, dict):
+        # Keys the reference lacks are newer fields, not differences
+        missing = sorted(expected.keys() - actual.keys())
+        if missing:
+            return f"{path}: missing keys {missing}"
+        for key in expected:
+            difference = first_difference(expected[key], actual[key], f"{path}.{key}")
+            if difference:
+                return difference
+        return None
+    if isinstance(expected, list):
+        for index, (left, right) in enumerate(zip(expected, actual)):
+            difference = first_difference(left, right, f"{path}[{index}]")
+            if difference:
+                return difference
+        if len(expected) != len(actual):
+            return f"{path}: expected {len(expected)} items, got {len(actual)}"
+        return None
+    if expected != actual:
+        return f"{path}: expected {expected!r}, got {actual!r}"
+    return None
+
+
+def timed(function, argument):
+    argument = copy.deepcopy(argument)
+    start = time.perf_counter()
+    result = function(argument)
+    return result, time.perf_counter() - start
+
+
+def run_pair(reference, candidate, argument, reference_first):
+    """Run both engines on their own copy of `argument`, alternating which
+    goes first so neither always gets the warm caches."""
+    if reference_first:
+        expected = timed(reference, argument)
+        actual = timed(candidate, argument)
+    else:
+        actual = timed(candidate, argument)
+        expected = timed(reference, argument)
+    return expected, actual
+
+
+class EngineVerifier:
+    def __init__(self, calculator, generator, max_rooms=12):
+        self.data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
+        self.reference_calculator = load_engine(REFERENCE_CALCULATOR)
+        self.reference_generator = load_engine(REFERENCE_GENERATOR)
+        self.calculator = load_engine(calculator)
+        self.generator = load_engine(generator)
+        self.max_rooms = max_rooms
+        self.timings = {'calculator': [0.0, 0.0], 'generator': [0.0, 0.0]}
+        with open(os.path.join(self.data_dir, 'task_templates.json'), 'r') as f:
+            self.templates = json.load(f)
+
+    def check_case(self, seed):
+        """Returns None when the candidate matches, else a description of
+        the first difference."""
+        rng = random.Random(seed)
+        rooms, formulas = random_config(rng, self.max_rooms)
+        inputs = random_inputs(rng, rooms)
+
+        with tempfile.TemporaryDirectory() as case_dir:
+            write_case(case_dir, rooms, formulas, self.templates)
+            reference_first = seed % 2 == 0
+            (expected, reference_time), (actual, candidate_time) = run_pair(
+                self.reference_calculator(case_dir).calculate_all,
+                self.calculator(case_dir).calculate_all,
+                inputs, reference_first)
+            self.timings['calculator'][0] += reference_time
+            self.timings['calculator'][1] += candidate_time
+            difference = first_difference(normalize(expected), normalize(actual))
+            if difference:
+                return f"calculate_all {difference}"
+
+            (expected_plan, reference_time), (actual_plan, candidate_time) = run_pair(
+                self.reference_generator(case_dir).generate_all_tasks,
+                self.generator(case_dir).generate_all_tasks,
+                expected, reference_first)
+            self.timings['generator'][0] += reference_time
+            self.timings['generator'][1] += candidate_time
+            difference = first_difference(normalize(expected_plan), normalize(actual_plan))
+            if difference:
+                return f"generate_all_tasks {difference}"
+        return None
+
+    def print_speedup(self):
+        for engine, (reference, candidate) in self.timings.items():
+            speedup = reference / candidate if candidate else float('inf')
+            print(f"⏱️  {engine}: reference {reference * 1000:.1f}ms,"
+                  f" candidate {candidate * 1000:.1f}ms ({speedup:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check alternative engines against the reference implementations.")
+    parser.add_argument('--calculator', default=LIVE_CALCULATOR, help="candidate calculator as module:Class")
+    parser.add_argument('--generator', default=LIVE_GENERATOR, help="candidate task generator as module:Class")
+    parser.add_argument('--cases', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first case")
+    parser.add_argument('--max-rooms', type=int, default=12)
+    args = parser.parse_args()
+
+    verifier = EngineVerifier(args.calculator, args.generator, args.max_rooms)
+    print(f"🔧 Checking {args.calculator} and {args.generator} on {args.cases} cases...")
+    for seed in range(args.seed, args.seed + args.cases):
+        difference = verifier.check_case(seed)
+        if difference:
+            print(f"❌ Case {seed}: {difference}")
+            print(f"   Reproduce with: --seed {seed} --cases 1")
+            sys.exit(1)
+
+    print(f"✅ All {args.cases} cases match the reference")
+    verifier.print_speedup()
+
+
+if __name__ == "__main__":
+    main()